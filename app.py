@@ -1,11 +1,10 @@
 import os
 import asyncio
-import tempfile
 import time
 import json
-from flask import Flask, request, render_template, redirect, url_for, send_file, jsonify, session
-from werkzeug.utils import secure_filename
 import threading
+from flask import Flask, request, render_template, redirect, url_for, send_file, jsonify, session, Response, stream_with_context
+from werkzeug.utils import secure_filename
 from datetime import datetime
 from flask import send_file
 from news_summary import generate_news_summary, generate_voice_optimized_text
@@ -16,8 +15,16 @@ from flask import request, jsonify
 from dotenv import load_dotenv
 
 # Import from our modules
-from tts import generate_simple_tts
+from tts import (
+    QUALITIES, TTS_TEMP_DIR, audio_cache, cached_tts, generate_tts_from_text, prepare_script, render_cache_key,
+    render_to_cache, stream_tts, synthesis_cache
+)
 from gnews_client import GNewsClient
+from worker_pool import WorkerPool
+from background_loop import BackgroundLoop
+from job_store import create_job_store
+from storage_janitor import StorageJanitor
+from job_events import JobEventHub, format_event, stage_durations
 
 # Import the downloader modules at the top of your app.py file
 import uuid
@@ -38,17 +45,66 @@ app.config['GEMINI_API_KEY'] = os.getenv("GEMINI_API_KEY")
 # Configure upload folder
 UPLOAD_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'uploads')
 OUTPUT_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'outputs')
+# Summary renders, kept apart from the sample audio committed under static/audio
+AUDIO_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'audio', 'summaries')
 ALLOWED_EXTENSIONS = {'txt'}
+MAX_BATCH_URLS = 20  # cap for /api/news/content/batch
 
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 os.makedirs(OUTPUT_FOLDER, exist_ok=True)
+os.makedirs(AUDIO_FOLDER, exist_ok=True)
 
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['OUTPUT_FOLDER'] = OUTPUT_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16 MB max upload size
 
-# Dictionary to store job statuses
-jobs = {}
+# Job records, shared by all gunicorn workers (JOB_STORE=memory keeps them per process, for tests)
+job_store = create_job_store()
+DASHBOARD_PAGE_SIZE = 20
+
+# Request threads per gunicorn worker; the Procfile and render.yaml pass the same WEB_THREADS to --threads
+WEB_THREADS = int(os.getenv("WEB_THREADS", 64))
+SSE_RESERVED_THREADS = 16  # threads event streams can never take, left for ordinary requests
+
+# Job progress pushed over Server-Sent Events; each open stream holds a request thread, so the cap stays
+# below the gunicorn thread count, and streams close after SSE_MAX_SECONDS (browsers reconnect on their own)
+job_events = JobEventHub(
+    job_store,
+    poll_interval=float(os.getenv("SSE_POLL_INTERVAL", 1.0)),
+    max_connections=min(int(os.getenv("SSE_MAX_CONNECTIONS", 48)), max(WEB_THREADS - SSE_RESERVED_THREADS, 1)),
+)
+SSE_HEARTBEAT = 15      # seconds between keepalive comments
+SSE_MAX_SECONDS = 300   # lifetime of one stream
+SSE_RETRY_MS = 3000     # browser reconnect delay
+
+# Shared event loop for all async work (TTS synthesis, streaming, background renders)
+background_loop = BackgroundLoop(name="async-loop")
+
+# TTS jobs run on a fixed pool of workers; beyond TTS_QUEUE_SIZE waiting jobs, /upload answers 503
+tts_pool = WorkerPool(
+    workers=int(os.getenv("TTS_WORKERS", 2)),
+    max_queue=int(os.getenv("TTS_QUEUE_SIZE", 20)),
+    initial_estimate=float(os.getenv("TTS_JOB_ESTIMATE", 20)),
+    name="tts-worker",
+    loop=background_loop,
+)
+
+# Streams from /api/news/summary-audio/stream synthesizing at once; more are answered with 503
+stream_slots = threading.BoundedSemaphore(int(os.getenv("TTS_MAX_STREAMS", 4)))
+
+# Generated files in uploads/, outputs/, static/audio/summaries and the TTS scratch dir are deleted once older
+# than JANITOR_MAX_AGE, or oldest first once they exceed JANITOR_MAX_BYTES; files of unexpired jobs are kept
+storage_janitor = StorageJanitor(
+    [UPLOAD_FOLDER, OUTPUT_FOLDER, AUDIO_FOLDER, TTS_TEMP_DIR],
+    max_age=float(os.getenv("JANITOR_MAX_AGE", 24 * 3600)),
+    max_bytes=int(os.getenv("JANITOR_MAX_BYTES", 1024 * 1024 * 1024)),
+    min_age=float(os.getenv("JANITOR_MIN_AGE", 600)),
+    protected=job_store.job_outputs,
+    protected_dirs=[cache.directory for cache in (audio_cache, synthesis_cache) if cache],
+)
+JANITOR_INTERVAL = float(os.getenv("JANITOR_INTERVAL", 600))  # seconds between runs; 0 disables the janitor
+if JANITOR_INTERVAL > 0:
+    storage_janitor.start(JANITOR_INTERVAL)
 
 # Define available voices with language grouping
 AVAILABLE_VOICES = [
@@ -98,23 +154,79 @@ def allowed_file(filename):
 def generate_unique_id():
     return f"{int(time.time())}_{os.urandom(4).hex()}"
 
-# Custom function to run async tasks in the background
-def run_async_task(coroutine, job_id):
-    async def wrapper():
-        try:
-            jobs[job_id]['status'] = 'processing'
-            result = await coroutine
-            jobs[job_id]['status'] = 'completed'
-            jobs[job_id]['result'] = result
-        except Exception as e:
-            jobs[job_id]['status'] = 'failed'
-            jobs[job_id]['error'] = str(e)
-            print(f"Error in job {job_id}: {str(e)}")
-    
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    loop.run_until_complete(wrapper())
-    loop.close()
+def record_job(job_id, **fields):
+    """Update a job record and push the change to its event streams in this process"""
+    job_store.update(job_id, **fields)
+    job_events.publish(job_id)
+
+# Runs a TTS job (on the shared event loop, for a worker pool thread) and records its stages and outcome
+async def run_async_task(job_id, job, text):
+    cache_info = dict(job['cache'])
+    stages = list(job['stages'])
+
+    async def report_stage(stage, **fields):
+        stages.append([stage, time.time()])
+        await asyncio.to_thread(record_job, job_id, stage=stage, stages=stages, **fields)
+
+    try:
+        await asyncio.to_thread(record_job, job_id, status='processing')
+        result = await generate_tts_from_text(
+            text, job['output_file'], job['voice_id'], job['speed'], job['depth'], cache_info, job['quality'],
+            on_stage=report_stage
+        )
+        await report_stage('completed', status='completed', result=result, cache=cache_info)
+    except Exception as e:
+        await report_stage('failed', status='failed', error=str(e), cache=cache_info)
+        print(f"Error in job {job_id}: {str(e)}")
+        raise
+
+def submit_tts_job(job_id, job, text):
+    """
+    Record a TTS job, then complete it from the audio cache or queue it on the worker pool
+
+    The record is written once, before the cache is consulted: a cache hit links
+    the output into place sharing the entry's inode, so it looks as old as the
+    original render, and only the job record keeps the storage janitor away from it.
+
+    Returns:
+        str: "cached" if completed from the audio cache, "queued" if queued;
+        None if the queue is full (the job record is dropped)
+    """
+    job.update(stage='queued', stages=[['queued', job['start_time']]])
+    job_store.create(job_id, job)
+
+    if complete_from_cache(job_id, job, text):
+        return "cached"
+    if tts_pool.submit(job_id, lambda: run_async_task(job_id, job, text)):
+        return "queued"
+    job_store.delete(job_id)
+    app.logger.warning(f"TTS queue full, rejected job {job_id}")
+    return None
+
+def complete_from_cache(job_id, job, text):
+    """
+    Complete a recorded job from the audio cache if it was rendered before
+
+    Returns:
+        str: Output path on a cache hit (the job is marked completed); None on a miss (the record is untouched)
+    """
+    cached_output = cached_tts(
+        text, job['output_file'], job['voice_id'], job['speed'], job['depth'], job['cache'], job['quality']
+    )
+    if cached_output:
+        record_job(job_id, status='completed', result=cached_output, cache=job['cache'], stage='completed',
+                   stages=job['stages'] + [['completed', time.time()]])
+    return cached_output
+
+def queue_full_response():
+    response = jsonify({'error': 'The voice generator is busy, please try again shortly'})
+    response.headers['Retry-After'] = str(tts_pool.retry_after())
+    return response, 503
+
+def get_quality(data):
+    """Voice quality requested in form or JSON data ("enhanced" unless "raw" is asked for)"""
+    quality = str(data.get('quality') or 'enhanced').strip().lower()
+    return quality if quality in QUALITIES else 'enhanced'
 
 # Routes
 @app.route('/')
@@ -133,6 +245,7 @@ def upload_file():
     voice_id = request.form.get('voice', 'en-US-JennyNeural')
     speed = float(request.form.get('speed', 1.0))
     depth = int(request.form.get('depth', 1))
+    quality = get_quality(request.form)
     
     # Get title for the file if provided
     title = request.form.get('title', '')
@@ -151,12 +264,6 @@ def upload_file():
         if not text_content:
             return render_template('error.html', message="No text provided. Please enter some text to convert to speech.")
         
-        # Save the text to a temporary file
-        script_filename = f"text_input_{job_id}.txt"
-        script_path = os.path.join(app.config['UPLOAD_FOLDER'], script_filename)
-        
-        with open(script_path, 'w', encoding='utf-8') as f:
-            f.write(text_content)
     
     # Handle file upload
     else:
@@ -171,10 +278,12 @@ def upload_file():
         if not script_file or not allowed_file(script_file.filename):
             return jsonify({'error': 'Invalid file format. Please upload a .txt file for scripts'}), 400
         
-        # Save the uploaded file
+        # Read the uploaded script into memory; synthesis takes the text directly
         script_filename = secure_filename(script_file.filename)
-        script_path = os.path.join(app.config['UPLOAD_FOLDER'], script_filename)
-        script_file.save(script_path)
+        try:
+            text_content = script_file.read().decode('utf-8')
+        except UnicodeDecodeError:
+            return jsonify({'error': 'Script file must be UTF-8 text'}), 400
         
         # If no title was provided, use the filename (without extension) as title
         if not title and script_filename:
@@ -191,30 +300,23 @@ def upload_file():
     output_path = os.path.join(app.config['OUTPUT_FOLDER'], output_filename)
     
     # Store title and other values in job info for reference
-    jobs[job_id] = {
+    job = {
         'status': 'pending',
-        'script_file': script_path,
         'output_file': output_path,
         'start_time': time.time(),
         'input_type': input_method,
         'voice_id': voice_id,
         'speed': speed,
         'depth': depth,
+        'quality': quality,
         'title': title,
-        'filename': output_filename
+        'filename': output_filename,
+        'cache': {}  # per-stage cache hits: output, synthesis
     }
     
-    # Start the processing task in a background thread
-    process_task = generate_simple_tts(
-        script_path, output_path, voice_id, speed, depth
-    )
-    
-    thread = threading.Thread(
-        target=run_async_task,
-        args=(process_task, job_id)
-    )
-    thread.daemon = True
-    thread.start()
+    # Already rendered with these settings: completed at once, no synthesis needed
+    if not submit_tts_job(job_id, job, text_content):
+        return queue_full_response()
     
     # Store job ID in session
     if 'jobs' not in session:
@@ -228,40 +330,119 @@ def upload_file():
 
 @app.route('/status/<job_id>')
 def job_status(job_id):
-    if job_id not in jobs:
+    job = job_store.get(job_id)
+    if job is None:
         return render_template('error.html', message="Job not found.")
     
-    job = jobs[job_id]
     # Pass the AVAILABLE_VOICES list to the template
     return render_template('status.html', job_id=job_id, job=job, voices=AVAILABLE_VOICES)
 
 @app.route('/api/status/<job_id>')
 def api_job_status(job_id):
-    if job_id not in jobs:
+    job = job_store.get(job_id)
+    if job is None:
         return jsonify({'error': 'Job not found'}), 404
     
-    job = jobs[job_id].copy()
     # Calculate elapsed time
     elapsed = time.time() - job['start_time']
     job['elapsed_time'] = elapsed
+
+    # Queue position (0 once running) and estimated wait while the job is in the worker pool
+    queue_status = tts_pool.status(job_id)
+    if queue_status:
+        job.update(queue_status)
     
     return jsonify(job)
 
+@app.route('/api/status/<job_id>/events')
+def job_status_events(job_id):
+    """
+    Server-Sent Events stream of a job's stages (queued, synthesizing, post-processing, exporting,
+    completed/failed), each with the time spent in the earlier stages, ending with a "done" event
+    """
+    job = job_store.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+
+    subscription = job_events.subscribe(job_id, job)
+    if subscription is None:
+        # Too many open streams: the client falls back to polling /api/status/<job_id>
+        response = jsonify({'error': 'Too many open event streams', 'status_url': url_for('api_job_status', job_id=job_id)})
+        response.headers['Retry-After'] = str(SSE_RETRY_MS // 1000)
+        return response, 503
+
+    try:
+        sent = int(request.headers.get('Last-Event-ID', 0))  # stages already delivered before a reconnect
+    except ValueError:
+        sent = 0
+
+    def generate():
+        nonlocal sent
+        with subscription:
+            yield f"retry: {SSE_RETRY_MS}\n\n"
+            record, deadline = job, time.time() + SSE_MAX_SECONDS
+            while True:
+                if record is None:
+                    yield format_event('done', {'job_id': job_id, 'status': 'expired'})
+                    return
+                stages = record.get('stages') or [[record.get('stage', record['status']), record['start_time']]]
+                for index in range(sent, len(stages)):
+                    stage, started = stages[index]
+                    event = {
+                        'job_id': job_id,
+                        'stage': stage,
+                        'status': record['status'],
+                        'at': started,
+                        'elapsed': round(started - record['start_time'], 3),
+                        'durations': stage_durations(stages[:index + 1]),
+                    }
+                    if stage == 'queued':
+                        event.update(tts_pool.status(job_id) or {})
+                    yield format_event('stage', event, event_id=index + 1)
+                sent = len(stages)
+
+                if record['status'] in ('completed', 'failed'):
+                    yield format_event('done', {
+                        'job_id': job_id,
+                        'status': record['status'],
+                        'elapsed': round(stages[-1][1] - record['start_time'], 3),
+                        'durations': stage_durations(stages),
+                        'audio_url': (record.get('audio_url') or url_for('stream_audio', job_id=job_id)
+                                      if record['status'] == 'completed' else None),
+                        'error': record.get('error'),
+                    })
+                    return
+                if time.time() > deadline:
+                    return  # the browser reconnects with Last-Event-ID
+
+                changed, record = subscription.wait(SSE_HEARTBEAT)
+                if not changed:
+                    yield ": keepalive\n\n"
+
+    response = Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-store", "X-Accel-Buffering": "no"},
+    )
+    response.call_on_close(subscription.close)  # also when the client leaves before the first event
+    return response
+
 @app.route('/download/<job_id>')
 def download_file(job_id):
-    if job_id not in jobs or jobs[job_id]['status'] != 'completed':
+    job = job_store.get(job_id)
+    if job is None or job['status'] != 'completed':
         return render_template('error.html', message="File not available for download.")
     
-    output_file = jobs[job_id]['result']
+    output_file = job['result']
     # Get the custom filename from the job info
-    filename = jobs[job_id].get('filename', f"voiceover_{job_id}.mp3")
+    filename = job.get('filename', f"voiceover_{job_id}.mp3")
     
     return send_file(output_file, as_attachment=True, download_name=filename)
 
 @app.route('/stream-audio/<job_id>')
 def stream_audio(job_id):
-    # Get the job data from your jobs dictionary
-    job = jobs.get(job_id)
+    # Get the job data from the job store
+    job = job_store.get(job_id)
     
     if not job:
         return "Job not found", 404
@@ -288,14 +469,21 @@ def stream_audio(job_id):
 @app.route('/dashboard')
 def dashboard():
     user_jobs = session.get('jobs', [])
-    user_job_data = {}
-    
-    for job_id in user_jobs:
-        if job_id in jobs:
-            user_job_data[job_id] = jobs[job_id]
+    page = max(request.args.get('page', 1, type=int), 1)
+    per_page = min(max(request.args.get('per_page', DASHBOARD_PAGE_SIZE, type=int), 1), 100)
+
+    # Newest first, one page at a time
+    rows, total = job_store.list(user_jobs, limit=per_page, offset=(page - 1) * per_page)
+    user_job_data = dict(rows)
+    pagination = {
+        'page': page,
+        'per_page': per_page,
+        'total': total,
+        'pages': max((total + per_page - 1) // per_page, 1),
+    }
     
     # Pass the AVAILABLE_VOICES list to the template
-    return render_template('dashboard.html', jobs=user_job_data, voices=AVAILABLE_VOICES)
+    return render_template('dashboard.html', jobs=user_job_data, pagination=pagination, voices=AVAILABLE_VOICES)
 
 # Error handlers
 @app.errorhandler(404)
@@ -376,6 +564,18 @@ def get_news():
         app.logger.error(f"Error fetching news: {str(e)}")
         return jsonify({"error": str(e), "articles": []}), 500
 
+@app.route('/api/news/metrics')
+def get_news_metrics():
+    """API endpoint exposing GNewsClient, audio cache and TTS queue metrics"""
+    metrics = gnews_client.get_metrics()
+    metrics["audio_cache"] = audio_cache.stats() if audio_cache else None
+    metrics["synthesis_cache"] = synthesis_cache.stats() if synthesis_cache else None
+    metrics["tts_queue"] = tts_pool.stats()
+    metrics["job_store"] = job_store.stats()
+    metrics["storage"] = storage_janitor.stats()
+    metrics["job_events"] = job_events.stats()
+    return jsonify(metrics)
+
 @app.route('/api/news/content')
 def get_article_content():
     """API endpoint to fetch and extract content from a news article"""
@@ -388,14 +588,7 @@ def get_article_content():
     try:
         # Use our GNewsClient to fetch article content
         result = gnews_client.fetch_article_content(url)
-        
-        # Add a fallback content if extraction failed but we didn't get an exception
-        if not result.get('content') or len(result.get('content', '').strip()) < 100:
-            app.logger.warning(f"Content extraction returned minimal/no content for {url}")
-            result['extraction_error'] = "Could not extract sufficient content from this article"
-            result['content'] = result.get('content', '') or "This article's content couldn't be extracted automatically. Please try visiting the original article."
-        
-        return jsonify(result)
+        return jsonify(add_content_fallback(url, result))
     except Exception as e:
         app.logger.error(f"Error fetching article content: {str(e)}")
         return jsonify({
@@ -404,6 +597,54 @@ def get_article_content():
             "url": url
         }), 200  # Return 200 to handle the error on the client side
 
+def add_content_fallback(url, result):
+    """Add a fallback content if extraction failed but we didn't get an exception"""
+    if not result.get('content') or len(result.get('content', '').strip()) < 100:
+        app.logger.warning(f"Content extraction returned minimal/no content for {url}")
+        result['extraction_error'] = "Could not extract sufficient content from this article"
+        result['content'] = result.get('content', '') or "This article's content couldn't be extracted automatically. Please try visiting the original article."
+    return result
+
+@app.route('/api/news/content/batch', methods=['POST'])
+def get_articles_content_batch():
+    """
+    API endpoint to fetch and extract several articles concurrently
+    
+    Expects JSON {"urls": [...], "timeout": optional overall seconds, "url_timeout": optional
+    per-URL seconds, "stream": optional bool}. With "stream" the response is NDJSON with one
+    line per article, written as soon as each one completes; otherwise a single JSON object
+    is returned once everything finished or the overall deadline passed.
+    """
+    data = request.json or {}
+    urls = [u for u in data.get('urls', []) if isinstance(u, str) and u.strip()]
+    
+    if not urls:
+        return jsonify({"error": "No URLs provided"}), 400
+    if len(urls) > MAX_BATCH_URLS:
+        return jsonify({"error": f"At most {MAX_BATCH_URLS} URLs per batch"}), 400
+    
+    try:
+        timeout = float(data['timeout']) if data.get('timeout') else None
+        url_timeout = float(data['url_timeout']) if data.get('url_timeout') else None
+    except (TypeError, ValueError):
+        return jsonify({"error": "Invalid timeout"}), 400
+    
+    results = gnews_client.iter_articles_content(urls, url_timeout=url_timeout, timeout=timeout)
+    
+    if data.get('stream'):
+        def generate():
+            for url, result in results:
+                yield json.dumps(add_content_fallback(url, result)) + "\n"
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+    
+    start = time.time()
+    by_url = {url: add_content_fallback(url, result) for url, result in results}
+    return jsonify({
+        "articles": [by_url[url] for url in dict.fromkeys(urls)],
+        "timed_out": [url for url, result in by_url.items() if result.get('timed_out')],
+        "elapsed_time": time.time() - start
+    })
+
 
 
 @app.route('/api/news/summary', methods=['POST'])
@@ -522,50 +763,107 @@ def summary_audio():
     voice_id = data.get("voice_id", "en-CA-LiamNeural")
     speed = float(data.get("speed", 1.0))
     depth = int(data.get("depth", 1))
+    quality = get_quality(data)
 
     if not text.strip():
         return jsonify({"error": "No text provided"}), 400
 
     try:
-        # Write text to a temp file
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".txt", mode='w', encoding='utf-8') as temp:
-            temp.write(text)
-            script_path = temp.name
-
-        # Output file path
-        output_filename = f"{int(time.time())}_{voice_id}.mp3"
-        output_audio = os.path.join("static/audio", output_filename)
-
-        # Generate audio
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        loop.run_until_complete(generate_simple_tts(script_path, output_audio, voice_id, speed, depth))
-
-        return jsonify({"audio_url": f"/static/audio/{output_filename}"})
+        # Output file path (the job id keeps concurrent requests for one voice apart)
+        job_id = generate_unique_id()
+        output_filename = f"{job_id}_{voice_id}.mp3"
+        output_audio = os.path.join(AUDIO_FOLDER, output_filename)
+        audio_url = f"/static/audio/summaries/{output_filename}"
+
+        job = {
+            'status': 'pending',
+            'output_file': output_audio,
+            'audio_url': audio_url,  # served once status is 'completed'
+            'start_time': time.time(),
+            'input_type': 'summary',
+            'voice_id': voice_id,
+            'speed': speed,
+            'depth': depth,
+            'quality': quality,
+            'title': data.get("title", ""),
+            'filename': output_filename,
+            'cache': {}
+        }
+        # Render on the worker pool; the client polls /api/status/<job_id> for audio_url
+        outcome = submit_tts_job(job_id, job, text)
+        if outcome is None:
+            return queue_full_response()
+        if outcome == "cached":
+            return jsonify({"audio_url": audio_url, "cached": True, "cache": job['cache']})
+
+        status_url = url_for('api_job_status', job_id=job_id)
+        response = jsonify({"job_id": job_id, "status": "pending", "status_url": status_url,
+                            **(tts_pool.status(job_id) or {})})
+        response.headers['Location'] = status_url
+        return response, 202
 
     except Exception as e:
         app.logger.error(f"TTS error: {e}")
         return jsonify({"error": str(e)}), 500
 
 
-# Optional: Add a cleanup function to remove old temp filesssssssssssssssssssssss
-def cleanup_old_files():
-    """Clean up old temporary files (older than 1 hour)"""
-    import time
-    current_time = time.time()
-    cutoff_time = current_time - 3600  # 1 hour ago
-    
-    for folder in [app.config['UPLOAD_FOLDER'], app.config['OUTPUT_FOLDER']]:
+@app.route('/api/news/summary-audio/stream', methods=['GET', 'POST'])
+def summary_audio_stream():
+    """
+    Stream summary audio as edge-tts produces it (chunked transfer encoding)
+
+    Accepts the same fields as /api/news/summary-audio, as JSON or query/form
+    parameters. A finished render in the audio cache is sent as a file;
+    otherwise the raw synthesis is streamed and the full render (with depth
+    effects) is written to the cache in the background.
+    """
+    data = request.get_json(silent=True) or request.values
+    text = prepare_script(data.get("content", ""))
+    voice_id = data.get("voice_id", "en-CA-LiamNeural")
+    speed = float(data.get("speed", 1.0))
+    depth = int(data.get("depth", 1))
+    quality = get_quality(data)
+
+    if not text:
+        return jsonify({"error": "No text provided"}), 400
+
+    if audio_cache:
+        cached = audio_cache.get(render_cache_key(text, voice_id, speed, depth, quality))
+        if cached:
+            return send_file(cached, mimetype="audio/mpeg", conditional=True)
+
+    # Each stream holds an edge-tts synthesis; past the cap, clients get 503 and can use /summary-audio
+    if not stream_slots.acquire(blocking=False):
+        response = jsonify({'error': 'Too many audio streams, please try again shortly'})
+        response.headers['Retry-After'] = str(tts_pool.retry_after())
+        return response, 503
+
+    def finish():
+        # The full render (depth effects, cache write) waits its turn on the TTS worker pool
+        render_id = f"render_{generate_unique_id()}"
+        if not tts_pool.submit(render_id, lambda: render_to_cache(text, voice_id, speed, depth, quality)):
+            app.logger.warning(f"TTS queue full, skipped background render {render_id}")
+
+    try:
+        chunks = stream_tts(text, voice_id, speed, on_complete=finish, on_finish=stream_slots.release,
+                            submit=background_loop.submit)
+    except Exception:
+        stream_slots.release()
+        raise
+
+    def generate():
         try:
-            for filename in os.listdir(folder):
-                file_path = os.path.join(folder, filename)
-                if os.path.isfile(file_path):
-                    file_mtime = os.path.getmtime(file_path)
-                    if file_mtime < cutoff_time:
-                        os.remove(file_path)
-                        app.logger.info(f"Cleaned up old file: {file_path}")
+            yield from chunks
         except Exception as e:
-            app.logger.error(f"Error during cleanup: {e}")
+            # Headers are already sent: log and cut the response short so the client sees an error
+            app.logger.error(f"Audio stream failed: {e}")
+            raise
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="audio/mpeg",
+        headers={"Cache-Control": "no-store", "X-Accel-Buffering": "no"},
+    )
 
 
 @app.route('/api/news/translate', methods=['POST'])
@@ -606,7 +904,5 @@ def translate_text():
     
 
 
-# Call cleanup periodically (you can set this up with a scheduler)
-# cleanup_old_files()
 if __name__ == '__main__':
     app.run(debug=True)
\ No newline at end of file
@@ -0,0 +1,324 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query parameters that only track the click and never change the article
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid",
+    "ocid", "cmpid", "cmp", "ito", "ref", "ref_src", "smid", "taid",
+}
+
+# Columns added after the first release, created on open if an older file lacks them
+MIGRATED_COLUMNS = {
+    "etag": "TEXT",
+    "last_modified": "TEXT",
+    "validated_at": "REAL",
+    "raw_bytes": "INTEGER",
+    "truncation_reason": "TEXT",
+}
+
+# HTTP statuses that say "try again later" rather than "this page is broken"
+TRANSIENT_STATUSES = {408, 425, 429}
+
+# A cached extraction plus what's needed to revalidate it with a conditional GET
+CachedArticle = namedtuple("CachedArticle", ["result", "etag", "last_modified", "validated_at", "raw_bytes"])
+
+
+def normalize_url(url):
+    """
+    Normalize an article URL so trivially different links share a cache entry
+
+    Lowercases the scheme and host, drops default ports, fragments and
+    tracking parameters (utm_*, fbclid, ...), and sorts the remaining query.
+
+    Args:
+        url (str): Article URL
+
+    Returns:
+        str: Normalized URL
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and not (scheme == "http" and parts.port == 80) and not (scheme == "https" and parts.port == 443):
+        host = f"{host}:{parts.port}"
+    query = [
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    ]
+    return urlunsplit((scheme, host, parts.path or "/", urlencode(sorted(query)), ""))
+
+
+class ArticleCache:
+    """
+    Persistent cache of extracted article content backed by a SQLite file.
+
+    The file is opened in WAL mode so every gunicorn worker can share it.
+    Successful extractions never expire and are evicted least recently used
+    first once the stored text exceeds `max_bytes`. Permanent failures (a
+    4xx, or a page with no extractable text) are kept for `negative_ttl`
+    seconds so broken sites are not hammered. Transient ones (network
+    errors, timeouts, 5xx, 429) are kept only for `transient_ttl` seconds.
+    The page's ETag/Last-Modified validators are stored alongside, so an
+    entry can be revalidated with a conditional GET instead of re-downloaded.
+    """
+
+    # Only write last_access back when it is older than this, to keep reads cheap
+    TOUCH_INTERVAL = 60
+
+    # Recount the shared file's size at least every this many writes, to see other workers' writes
+    RECOUNT_EVERY = 200
+
+    # Eviction frees space down to this fraction of max_bytes, so a full cache isn't recounted on every write
+    LOW_WATER = 0.9
+
+    def __init__(self, path, max_bytes=200 * 1024 * 1024, negative_ttl=300, transient_ttl=15):
+        """
+        Args:
+            path (str): SQLite file location (created if missing)
+            max_bytes (int): Total size budget for stored title + content
+            negative_ttl (float): Seconds a permanent failure stays cached
+            transient_ttl (float): Seconds a transient failure stays cached (0 to not cache them)
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.negative_ttl = negative_ttl
+        self.transient_ttl = transient_ttl
+        self._estimated_bytes = None  # this process's running total, None until first counted
+        self._writes_since_recount = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._counters = {
+            "hits": 0,
+            "negative_hits": 0,
+            "misses": 0,
+            "writes": 0,
+            "evictions": 0,
+            "errors": 0,
+        }
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._create_schema()
+
+    def _connect(self):
+        """The calling thread's connection, opened on first use"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _create_schema(self):
+        conn = self._connect()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS articles (
+                url_key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                title TEXT,
+                content TEXT,
+                extraction_time TEXT,
+                error_field TEXT,
+                error TEXT,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                expires_at REAL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_articles_last_access ON articles(last_access)")
+        existing = {row[1] for row in conn.execute("PRAGMA table_info(articles)")}
+        for column, column_type in MIGRATED_COLUMNS.items():
+            if column not in existing:
+                try:
+                    conn.execute(f"ALTER TABLE articles ADD COLUMN {column} {column_type}")
+                except sqlite3.OperationalError:
+                    pass  # another worker added it first
+
+    def _count(self, name):
+        with self._lock:
+            self._counters[name] += 1
+
+    def get(self, url_key):
+        """
+        Look up a cached extraction
+
+        Args:
+            url_key (str): Normalized article URL
+
+        Returns:
+            dict: The cached result, or None on a miss or expired negative entry
+        """
+        entry = self.lookup(url_key)
+        return entry.result if entry else None
+
+    def lookup(self, url_key):
+        """
+        Look up a cached extraction together with its HTTP validators
+
+        Args:
+            url_key (str): Normalized article URL
+
+        Returns:
+            CachedArticle: The entry, or None on a miss or expired negative entry
+        """
+        now = time.time()
+        try:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT url, title, content, extraction_time, error_field, error, last_access, expires_at, "
+                "etag, last_modified, COALESCE(validated_at, created_at), COALESCE(raw_bytes, 0), truncation_reason "
+                "FROM articles WHERE url_key = ?",
+                (url_key,),
+            ).fetchone()
+            if row is None or (row[7] is not None and row[7] <= now):
+                self._count("misses")
+                return None
+            if now - row[6] > self.TOUCH_INTERVAL:
+                conn.execute("UPDATE articles SET last_access = ? WHERE url_key = ?", (now, url_key))
+        except sqlite3.Error as e:
+            print(f"Article cache read failed: {e}")
+            self._count("errors")
+            return None
+
+        (url, title, content, extraction_time, error_field, error, _, _,
+         etag, last_modified, validated_at, raw_bytes, truncation_reason) = row
+        result = {"title": title, "content": content, "url": url}
+        if truncation_reason:
+            result.update(truncated=True, truncation_reason=truncation_reason)
+        if error_field:
+            result[error_field] = error
+            self._count("negative_hits")
+        else:
+            result["extraction_time"] = extraction_time
+            self._count("hits")
+        return CachedArticle(result, etag, last_modified, validated_at, raw_bytes)
+
+    def mark_validated(self, url_key):
+        """Record that the origin confirmed the entry is unchanged (a 304), restarting its revalidation clock"""
+        now = time.time()
+        try:
+            self._connect().execute(
+                "UPDATE articles SET validated_at = ?, last_access = ? WHERE url_key = ?", (now, now, url_key)
+            )
+        except sqlite3.Error as e:
+            print(f"Article cache write failed: {e}")
+            self._count("errors")
+
+    def _failure_ttl(self, result, error_field):
+        """Seconds to keep a failed extraction: negative_ttl if permanent, transient_ttl otherwise"""
+        if error_field == "extraction_error":
+            return self.negative_ttl  # the page downloaded fine and has nothing to extract
+        status = result.get("status_code")
+        if status and 400 <= status < 500 and status not in TRANSIENT_STATUSES:
+            return self.negative_ttl
+        return self.transient_ttl
+
+    def put(self, url_key, result, validators=None):
+        """
+        Store an extraction result, then evict LRU entries past the byte budget
+
+        The file's size is only recounted when this process's running total
+        passes `max_bytes`, or every RECOUNT_EVERY writes.
+
+        Args:
+            url_key (str): Normalized article URL
+            result (dict): Output of GNewsClient._fetch_article_content
+            validators (dict): Optional "etag", "last_modified" and "size" (bytes downloaded) of the page
+        """
+        validators = validators or {}
+        now = time.time()
+        error_field = next((f for f in ("error", "extraction_error") if f in result), None)
+        expires_at = None
+        if error_field:
+            ttl = self._failure_ttl(result, error_field)
+            if ttl <= 0:
+                return
+            expires_at = now + ttl
+        title = result.get("title") or ""
+        content = result.get("content") or ""
+        size = len(title.encode("utf-8")) + len(content.encode("utf-8"))
+        try:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO articles "
+                    "(url_key, url, title, content, extraction_time, error_field, error, size, created_at, last_access, "
+                    "expires_at, etag, last_modified, validated_at, raw_bytes, truncation_reason) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (url_key, result.get("url", url_key), title, content, result.get("extraction_time"),
+                     error_field, result.get(error_field) if error_field else None,
+                     size, now, now, expires_at, validators.get("etag"), validators.get("last_modified"),
+                     now, validators.get("size"), result.get("truncation_reason")),
+                )
+                evicted = self._evict(conn, now) if self._due_for_eviction(size) else 0
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        except sqlite3.Error as e:
+            print(f"Article cache write failed: {e}")
+            self._count("errors")
+            return
+        with self._lock:
+            self._counters["writes"] += 1
+            self._counters["evictions"] += evicted
+
+    def _due_for_eviction(self, size):
+        """
+        Add a write to the running total and say whether it is time to recount
+
+        The total only grows between recounts (a replaced entry counts twice),
+        so it never underestimates this process's own writes.
+        """
+        with self._lock:
+            self._writes_since_recount += 1
+            if self._estimated_bytes is None or self._writes_since_recount >= self.RECOUNT_EVERY:
+                return True
+            self._estimated_bytes += size
+            return self._estimated_bytes > self.max_bytes
+
+    def _evict(self, conn, now):
+        """Drop expired negative entries, then LRU entries down to LOW_WATER once over max_bytes; resets the running total"""
+        evicted = conn.execute(
+            "DELETE FROM articles WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,)
+        ).rowcount
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM articles").fetchone()[0]
+        victims = []
+        if total > self.max_bytes:
+            target = self.max_bytes * self.LOW_WATER
+            for url_key, entry_size in conn.execute("SELECT url_key, size FROM articles ORDER BY last_access"):
+                if total <= target:
+                    break
+                victims.append((url_key,))
+                total -= entry_size
+            conn.executemany("DELETE FROM articles WHERE url_key = ?", victims)
+        with self._lock:
+            self._estimated_bytes = total
+            self._writes_since_recount = 0
+        return evicted + len(victims)
+
+    def stats(self):
+        """
+        Snapshot of this process's counters plus the shared file's size
+
+        Returns:
+            dict: hits, negative_hits, misses, writes, evictions, errors, entries and bytes
+        """
+        with self._lock:
+            stats = dict(self._counters)
+        try:
+            entries, total = self._connect().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM articles"
+            ).fetchone()
+            stats["entries"] = entries
+            stats["bytes"] = total
+        except sqlite3.Error as e:
+            print(f"Article cache stats failed: {e}")
+        return stats
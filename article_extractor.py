@@ -0,0 +1,341 @@
+"""
+Single-pass article content extractor.
+
+Walks the parsed DOM once, memoizing the text of every paragraph and
+accumulating per-container statistics (total text, link text). Each
+paragraph credits its parent in full and its grandparent by half, based on
+its length, so the container that directly holds the article body scores
+highest. That score is then weighted by link density, text density and
+class/id hints, and the best container wins -- no repeated
+soup.select()/find_all() passes and no repeated get_text() calls.
+"""
+
+import os
+import re
+from collections import namedtuple
+
+from bs4 import BeautifulSoup, CData, NavigableString, Tag
+
+# Subtrees that never hold article text
+SKIP_TAGS = {
+    "script", "style", "noscript", "svg", "template", "iframe",
+    "form", "button", "select", "nav", "aside", "footer",
+}
+
+POSITIVE_HINTS = re.compile(
+    r"article|body|content|entry|main|post|story|text|news|rich-text", re.IGNORECASE
+)
+NEGATIVE_HINTS = re.compile(
+    r"comment|footer|header|menu|nav|related|share|sidebar|social|promo|advert|sponsor|"
+    r"subscribe|newsletter|cookie|popup|modal|widget|breadcrumb|recommend|trending",
+    re.IGNORECASE,
+)
+
+MIN_CONTENT_LENGTH = 100      # below this the extraction is considered failed
+MIN_FALLBACK_PARAGRAPH = 40   # paragraph length kept by the whole-page fallback
+MIN_SCORED_PARAGRAPH = 25     # shorter paragraphs (bylines, captions) don't vote
+MAX_PARAGRAPH_LINK_DENSITY = 0.8
+
+Extraction = namedtuple("Extraction", ["content", "node", "strategy"])
+
+# BeautifulSoup tree builders in order of preference: C-backed first
+PARSER_BACKENDS = ("lxml", "html.parser")
+
+# Comments and raw-text subtrees that never carry article text, dropped before tree construction.
+# Comments go first so a commented-out <script> can't swallow the markup after it. Self-closing
+# openers ("<script ... />") are left alone, or the match would run on to the next closing tag.
+# <svg> can nest and self-close, so it is left to the DOM walk (SKIP_TAGS).
+STRIP_PATTERN = re.compile(
+    r"<!--.*?-->|<(script|style|noscript)\b[^>]*(?<!/)>.*?</\1\s*>",
+    re.IGNORECASE | re.DOTALL,
+)
+
+# Class names and ids that are safe to put in a selector unescaped
+SELECTOR_TOKEN = re.compile(r"^[A-Za-z_][A-Za-z0-9_-]*$")
+GENERATED_TOKEN = re.compile(r"\d{3,}|(?=[0-9a-f]*\d)[0-9a-f]{6,}$")  # ids/classes that change per page or per build
+
+_parser_cache = {}
+
+
+def available_parsers():
+    """
+    List the parser backends usable in this environment
+
+    Returns:
+        list: Backend names, fastest first
+    """
+    if "available" not in _parser_cache:
+        available = []
+        for name in PARSER_BACKENDS:
+            if name == "html.parser":
+                available.append(name)
+                continue
+            try:
+                __import__(name)
+                available.append(name)
+            except ImportError:
+                pass
+        _parser_cache["available"] = available
+    return _parser_cache["available"]
+
+
+def get_parser(name=None):
+    """
+    Resolve a parser backend name
+
+    Args:
+        name (str): "lxml", "html.parser" or "auto"; defaults to the HTML_PARSER
+            environment variable, then "auto" (the fastest installed backend)
+
+    Returns:
+        str: A backend name accepted by BeautifulSoup
+    """
+    name = (name or os.getenv("HTML_PARSER") or "auto").strip().lower()
+    available = available_parsers()
+    if name in available:
+        return name
+    warned = _parser_cache.setdefault("warned", set())
+    if name != "auto" and name not in warned:
+        warned.add(name)
+        print(f"HTML parser '{name}' is not available, using {available[0]}")
+    return available[0]
+
+
+get_parser()  # report a bad HTML_PARSER setting once, at import
+
+
+def strip_non_content(html):
+    """Remove comments and script/style/noscript subtrees from raw HTML"""
+    return STRIP_PATTERN.sub("", html)
+
+
+def parse_html(html, parser=None, strip=True):
+    """
+    Build a BeautifulSoup tree with the configured backend
+
+    Args:
+        html (str): Raw HTML
+        parser (str): Backend name (see get_parser)
+        strip (bool): Drop non-content subtrees before building the tree
+
+    Returns:
+        BeautifulSoup: Parsed document
+    """
+    if strip:
+        html = strip_non_content(html)
+    return BeautifulSoup(html, get_parser(parser))
+
+
+class _Frame:
+    """Running statistics for one open element during the walk"""
+
+    __slots__ = ("node", "score", "text_len", "link_len", "p_start", "parts")
+
+    def __init__(self, node, p_start, collect):
+        self.node = node
+        self.score = 0.0
+        self.text_len = 0
+        self.link_len = 0
+        self.p_start = p_start
+        self.parts = [] if collect else None
+
+
+def _walk(root):
+    """
+    Walk the tree once, collecting paragraphs and container statistics
+
+    Paragraphs are stored in document order, so the paragraphs inside any
+    container form a contiguous slice [p_start, p_end).
+
+    Returns:
+        tuple: (paragraphs, candidates) where paragraphs is a list of
+        (text, link_len) and candidates a list of
+        (node, score, text_len, link_len, p_start, p_end)
+    """
+    paragraphs = []
+    candidates = []
+    frames = [_Frame(root, 0, False)]
+    stack = [iter(root.children)]
+    in_link = 0
+    open_paragraph = None  # innermost <p> frame collecting text
+
+    while stack:
+        child = next(stack[-1], None)
+
+        if child is None:
+            stack.pop()
+            frame = frames.pop()
+            name = frame.node.name
+            if name == "a":
+                in_link -= 1
+            if frame.parts is not None:
+                text = "".join(frame.parts).strip()
+                open_paragraph = next((f for f in reversed(frames) if f.parts is not None), None)
+                if text:
+                    paragraphs.append((text, frame.link_len))
+                    if len(text) >= MIN_SCORED_PARAGRAPH and _keep_paragraph(text, frame.link_len):
+                        points = 1 + min(len(text) / 100, 3)
+                        if frames:
+                            frames[-1].score += points
+                        if len(frames) > 1:
+                            frames[-2].score += points / 2
+            p_end = len(paragraphs)
+            if frame.score and name != "p":
+                candidates.append((frame.node, frame.score, frame.text_len, frame.link_len, frame.p_start, p_end))
+            if frames:
+                parent = frames[-1]
+                parent.text_len += frame.text_len
+                parent.link_len += frame.link_len
+            continue
+
+        if isinstance(child, Tag):
+            if child.name in SKIP_TAGS:
+                continue
+            frame = _Frame(child, len(paragraphs), child.name == "p")
+            if frame.parts is not None:
+                open_paragraph = frame
+            if child.name == "a":
+                in_link += 1
+            frames.append(frame)
+            stack.append(iter(child.children))
+        elif type(child) in (NavigableString, CData):
+            length = len(child.strip())
+            frame = frames[-1]
+            frame.text_len += length
+            if in_link:
+                frame.link_len += length
+            if open_paragraph is not None:
+                open_paragraph.parts.append(str(child))
+
+    return paragraphs, candidates
+
+
+def _hint_multiplier(node):
+    """Boost containers whose tag/class/id looks like an article, penalize boilerplate"""
+    multiplier = 1.0
+    if node.name in ("article", "main"):
+        multiplier *= 1.25
+    attrs = getattr(node, "attrs", None) or {}
+    hints = " ".join(attrs.get("class", [])) + " " + (attrs.get("id") or "")
+    if hints.strip():
+        if POSITIVE_HINTS.search(hints):
+            multiplier *= 1.25
+        if NEGATIVE_HINTS.search(hints):
+            multiplier *= 0.5
+    return multiplier
+
+
+def _keep_paragraph(text, link_len):
+    return link_len / len(text) <= MAX_PARAGRAPH_LINK_DENSITY
+
+
+def extract_article(soup):
+    """
+    Pick the best article container in a single pass over the DOM
+
+    Args:
+        soup (BeautifulSoup): Parsed HTML
+
+    Returns:
+        Extraction: content (str), node (the chosen container or None) and
+        strategy ("scored", "all-paragraphs" or "none")
+    """
+    paragraphs, candidates = _walk(soup)
+
+    # Prefix sums of paragraph text, so each container's share is O(1)
+    p_prefix = [0]
+    for text, _ in paragraphs:
+        p_prefix.append(p_prefix[-1] + len(text))
+
+    best = None
+    best_score = 0.0
+    for node, score, text_len, link_len, p_start, p_end in candidates:
+        if not text_len:
+            continue
+        density = min((p_prefix[p_end] - p_prefix[p_start]) / text_len, 1.0)
+        link_density = link_len / text_len
+        score *= (1 - link_density) * (0.5 + 0.5 * density) * _hint_multiplier(node)
+        if score > best_score:
+            best, best_score = (node, p_start, p_end), score
+
+    if best is not None:
+        node, p_start, p_end = best
+        content = "\n\n".join(
+            text for text, link_len in paragraphs[p_start:p_end] if _keep_paragraph(text, link_len)
+        )
+        if len(content) >= MIN_CONTENT_LENGTH:
+            return Extraction(content, node, "scored")
+
+    # Fallback: every substantial paragraph on the page
+    content = "\n\n".join(text for text, _ in paragraphs if len(text) > MIN_FALLBACK_PARAGRAPH)
+    if content:
+        return Extraction(content, None, "all-paragraphs")
+    return Extraction("", None, "none")
+
+
+def extract_with_selector(soup, selector):
+    """
+    Extract the paragraphs of the container matched by a known selector
+
+    Used for domains whose article container was learned earlier: one
+    targeted select instead of scoring the whole page.
+
+    Args:
+        soup (BeautifulSoup): Parsed HTML
+        selector (str): CSS selector of the article container
+
+    Returns:
+        Extraction: strategy "rule", or "none" when the selector found too little text
+    """
+    try:
+        node = soup.select_one(selector)
+    except Exception as e:
+        print(f"Invalid extraction rule {selector!r}: {e}")
+        node = None
+    if node is not None:
+        paragraphs, _ = _walk(node)
+        content = "\n\n".join(text for text, link_len in paragraphs if _keep_paragraph(text, link_len))
+        if len(content) >= MIN_CONTENT_LENGTH:
+            return Extraction(content, node, "rule")
+    return Extraction("", None, "none")
+
+
+def _stable_tokens(values):
+    return [v for v in values if SELECTOR_TOKEN.match(v) and not GENERATED_TOKEN.search(v)]
+
+
+def selector_for(node, soup):
+    """
+    Build a CSS selector that finds node again on pages with the same layout
+
+    Prefers a stable id, then the tag plus up to two stable classes, then a
+    bare article/main tag. The selector is only returned if it selects this
+    very node first.
+
+    Args:
+        node (Tag): Container chosen by extract_article
+        soup (BeautifulSoup): Document the node belongs to
+
+    Returns:
+        str: CSS selector, or None if no stable one exists
+    """
+    if node is None or not getattr(node, "name", None) or node.name == "[document]":
+        return None
+
+    candidates = []
+    ids = _stable_tokens([node.get("id") or ""])
+    if ids:
+        candidates.append(f"{node.name}#{ids[0]}")
+    classes = _stable_tokens(node.get("class") or [])
+    if classes:
+        candidates.append(node.name + "".join(f".{c}" for c in classes[:2]))
+    if node.name in ("article", "main"):
+        candidates.append(node.name)
+
+    for selector in candidates:
+        try:
+            if soup.select_one(selector) is node:
+                return selector
+        except Exception:
+            continue
+    return None
@@ -0,0 +1,337 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unicodedata
+
+# Bump when the synthesis pipeline changes in a way that alters the audio, to retire old entries
+AUDIO_CACHE_VERSION = 3
+
+# Temp files older than this are leftovers of a crashed writer
+STALE_PART_AGE = 3600
+
+# Suffix of the empty sidecar file whose mtime records an entry's last use
+USED_SUFFIX = ".used"
+
+
+def normalize_text(text):
+    """
+    Canonical form of a script for cache keys: NFC, whitespace collapsed, trimmed
+
+    Args:
+        text (str): Script text
+
+    Returns:
+        str: Normalized text
+    """
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def audio_cache_key(text, voice_id, speed, depth, output_format="mp3-192k"):
+    """
+    Content address of a rendered script
+
+    Args:
+        text (str): Script text (normalized here)
+        voice_id (str): Edge-TTS voice ID
+        speed (float): Speed factor
+        depth (int): Depth effect level
+        output_format (str): Container and bitrate of the exported file
+
+    Returns:
+        str: Hex SHA-256 digest
+    """
+    payload = json.dumps(
+        [AUDIO_CACHE_VERSION, normalize_text(text), voice_id, float(speed), int(depth), output_format],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def synthesis_cache_key(text, voice_id, mode="single"):
+    """
+    Content address of the raw edge-tts synthesis of a script, before any effects
+
+    Args:
+        text (str): Script text (normalized here)
+        voice_id (str): Edge-TTS voice ID
+        mode (str): "single" for one edge-tts call, or "chunked:<max_chars>" for
+                    stitched chunks, which sound different (see tts.synthesis_mode)
+
+    Returns:
+        str: Hex SHA-256 digest
+    """
+    payload = json.dumps([AUDIO_CACHE_VERSION, "synthesis", mode, normalize_text(text), voice_id], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _atomic_copy(src, dest):
+    """Copy src to dest through a temp file in dest's directory, so readers never see a partial file"""
+    directory = os.path.dirname(os.path.abspath(dest))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as out, open(src, "rb") as source:
+            shutil.copyfileobj(source, out)
+        os.replace(tmp_path, dest)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _atomic_link(src, dest):
+    """
+    Place src at dest as a hard link (no data copied), falling back to a copy
+
+    Rendered files are never modified in place, so sharing the inode between
+    the cache entry and an output file is safe; deleting either one leaves the
+    other intact.
+    """
+    directory = os.path.dirname(os.path.abspath(dest))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = os.path.join(directory, f".{os.path.basename(dest)}.{os.getpid()}.{threading.get_ident()}.part")
+    try:
+        os.link(src, tmp_path)
+        os.replace(tmp_path, dest)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        _atomic_copy(src, dest)  # cross-device or no hard link support
+
+
+def _atomic_write(data, dest):
+    """Write bytes to dest through a temp file in dest's directory"""
+    directory = os.path.dirname(os.path.abspath(dest))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            out.write(data)
+        os.replace(tmp_path, dest)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class AudioCache:
+    """
+    Content-addressed cache of TTS audio files on disk.
+
+    Files are named by a content key (audio_cache_key for finished renders,
+    synthesis_cache_key for raw edge-tts output), so the same work is done
+    once. Writes go through a temp file
+    and os.replace, so concurrent writers of one key never leave a corrupt
+    file. Storing and serving a render hard-links the file where the
+    filesystem allows, so neither copies the audio data. Hits touch an empty
+    sidecar file rather than the entry itself, whose inode is shared with every
+    output linked to it; once the directory exceeds `max_bytes` the least
+    recently used entries are deleted.
+    """
+
+    def __init__(self, directory, max_bytes=500 * 1024 * 1024, extension=".mp3"):
+        """
+        Args:
+            directory (str): Cache directory (created if missing)
+            max_bytes (int): Total size budget of the cached files
+            extension (str): File extension of cached renders
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.extension = extension
+        self._lock = threading.Lock()
+        self._counters = {
+            "hits": 0,
+            "misses": 0,
+            "writes": 0,
+            "evictions": 0,
+            "errors": 0,
+        }
+        os.makedirs(directory, exist_ok=True)
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self._counters[name] += amount
+
+    def path_for(self, key):
+        return os.path.join(self.directory, key + self.extension)
+
+    def get(self, key):
+        """
+        Look up a cached render
+
+        Args:
+            key (str): audio_cache_key of the render
+
+        Returns:
+            str: Path of the cached file, or None on a miss
+        """
+        path = self.path_for(key)
+        try:
+            if os.path.getsize(path) > 0:
+                self._mark_used(path)
+                self._count("hits")
+                return path
+        except OSError:
+            pass
+        self._count("misses")
+        return None
+
+    def copy_to(self, key, dest):
+        """
+        Materialize a cached render at dest
+
+        Args:
+            key (str): audio_cache_key of the render
+            dest (str): Output path
+
+        Returns:
+            str: dest on a hit, None on a miss
+        """
+        path = self.get(key)
+        if path is None:
+            return None
+        try:
+            _atomic_link(path, dest)
+        except OSError as e:
+            print(f"Audio cache copy failed: {e}")
+            self._count("errors")
+            return None
+        return dest
+
+    def get_bytes(self, key):
+        """
+        Read a cached file into memory
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            bytes: File contents, or None on a miss
+        """
+        path = self.get(key)
+        if path is None:
+            return None
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except OSError as e:
+            print(f"Audio cache read failed: {e}")
+            self._count("errors")
+            return None
+
+    def put(self, key, src):
+        """
+        Store a finished render, then evict least recently used files past max_bytes
+
+        Args:
+            key (str): audio_cache_key of the render
+            src (str): Path of the rendered file (left in place)
+        """
+        try:
+            _atomic_link(src, self.path_for(key))
+        except OSError as e:
+            print(f"Audio cache write failed: {e}")
+            self._count("errors")
+            return
+        self._count("writes")
+        self._evict()
+
+    def put_bytes(self, key, data):
+        """
+        Store in-memory audio, then evict least recently used files past max_bytes
+
+        Args:
+            key (str): Cache key
+            data (bytes): Audio file contents
+        """
+        try:
+            _atomic_write(data, self.path_for(key))
+        except OSError as e:
+            print(f"Audio cache write failed: {e}")
+            self._count("errors")
+            return
+        self._count("writes")
+        self._evict()
+
+    def _mark_used(self, path):
+        """Record a use of the entry at path in its sidecar (the entry's own mtime is shared with linked outputs)"""
+        used = path + USED_SUFFIX
+        try:
+            os.utime(used)
+        except FileNotFoundError:
+            open(used, "a").close()
+
+    def _evict(self):
+        now = time.time()
+        entries = {}  # path -> [last use, size]
+        used = {}     # entry path -> sidecar mtime
+        total = 0
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                if entry.name.endswith(".part"):
+                    if now - stat.st_mtime > STALE_PART_AGE:
+                        self._remove(entry.path)
+                    continue
+                if entry.name.endswith(USED_SUFFIX):
+                    used[entry.path[:-len(USED_SUFFIX)]] = stat.st_mtime
+                elif entry.name.endswith(self.extension):
+                    entries[entry.path] = [stat.st_mtime, stat.st_size]
+                    total += stat.st_size
+        for path, last_used in used.items():
+            if path in entries:
+                entries[path][0] = max(entries[path][0], last_used)
+            elif now - last_used > STALE_PART_AGE:
+                self._remove(path + USED_SUFFIX)  # its entry is gone
+        if total <= self.max_bytes:
+            return
+        for path, (_, size) in sorted(entries.items(), key=lambda item: item[1][0]):
+            if total <= self.max_bytes:
+                break
+            if self._remove(path):
+                self._remove(path + USED_SUFFIX)
+                total -= size
+                self._count("evictions")
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
+
+    def stats(self):
+        """
+        Snapshot of the cache counters plus the directory's size
+
+        Returns:
+            dict: hits, misses, writes, evictions, errors, entries and bytes
+        """
+        with self._lock:
+            stats = dict(self._counters)
+        entries = total = 0
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if entry.name.endswith(self.extension):
+                        entries += 1
+                        total += entry.stat().st_size
+        except OSError as e:
+            print(f"Audio cache stats failed: {e}")
+        stats["entries"] = entries
+        stats["bytes"] = total
+        return stats
@@ -0,0 +1,300 @@
+"""
+Vectorized NumPy versions of the pydub effects used by the TTS pipeline.
+
+Audio is held as a float64 array of shape (frames, channels) scaled so that
+1.0 is full scale. Each function mirrors the pydub effect of the same name
+closely enough that the two outputs differ by a fraction of a dB (see
+benchmarks/bench_numpy_dsp.py), but runs over whole arrays instead of
+per-sample or per-millisecond Python loops.
+"""
+
+import numpy as np
+
+# Largest geometric growth allowed inside one block of the IIR filter, to keep float64 exact enough
+_IIR_MAX_GROWTH = 1e120
+
+
+def db_to_gain(db):
+    return 10 ** (db / 20)
+
+
+def from_segment(segment):
+    """
+    Decode an AudioSegment into a float array
+
+    Args:
+        segment (AudioSegment): Source audio
+
+    Returns:
+        numpy.ndarray: Samples, shape (frames, channels), full scale = 1.0
+    """
+    samples = np.array(segment.get_array_of_samples(), dtype=np.float64)
+    return samples.reshape(-1, segment.channels) / segment.max_possible_amplitude
+
+
+def to_segment(samples, like):
+    """
+    Encode a float array back into an AudioSegment with the format of `like`
+
+    Args:
+        samples (numpy.ndarray): Samples, shape (frames, channels)
+        like (AudioSegment): Segment whose frame rate, width and channels to use
+
+    Returns:
+        AudioSegment: Clipped and quantized audio
+    """
+    limit = like.max_possible_amplitude
+    dtype = {1: np.int8, 2: np.int16, 4: np.int32}[like.sample_width]
+    data = np.clip(np.round(samples * limit), -limit, limit - 1).astype(dtype)
+    return like._spawn(data.tobytes())
+
+
+def ms_to_frames(ms, frame_rate):
+    return int(round(ms * frame_rate / 1000))
+
+
+def low_pass(samples, cutoff, frame_rate):
+    """
+    One-pole RC low-pass filter, as pydub.effects.low_pass_filter
+
+    The recurrence y[n] = y[n-1] + a * (x[n] - y[n-1]) is solved in closed
+    form per block, so the Python loop runs once per block, not per sample.
+
+    Args:
+        samples (numpy.ndarray): Samples, shape (frames, channels)
+        cutoff (float): Cutoff frequency in Hz
+        frame_rate (int): Sample rate
+
+    Returns:
+        numpy.ndarray: Filtered samples
+    """
+    if not len(samples):
+        return samples.copy()
+    rc = 1.0 / (cutoff * 2 * np.pi)
+    dt = 1.0 / frame_rate
+    alpha = dt / (rc + dt)
+    decay = 1.0 - alpha
+    if decay <= 0:
+        return samples.copy()
+
+    block = int(min(4096, max(1, np.log(_IIR_MAX_GROWTH) / -np.log(decay)))) if decay < 1 else 4096
+    powers = decay ** np.arange(1, block + 1)         # decay^(n+1)
+    inverse = decay ** -np.arange(0, block)           # decay^-k
+    output = np.empty_like(samples)
+    state = samples[0].copy()  # pydub seeds the filter with the first sample
+    for start in range(0, len(samples), block):
+        x = samples[start:start + block]
+        n = len(x)
+        weighted = np.cumsum(x * inverse[:n, None], axis=0)
+        y = powers[:n, None] * state + alpha * (powers[:n, None] / decay) * weighted
+        output[start:start + n] = y
+        state = y[-1]
+    output[0] = samples[0]
+    return output
+
+
+def fade(samples, frame_rate, fade_in_ms=0, fade_out_ms=0):
+    """Linear-amplitude fade in/out from -120 dB, as AudioSegment.fade_in/fade_out"""
+    output = samples.copy()
+    floor = db_to_gain(-120)
+    if fade_in_ms:
+        n = min(ms_to_frames(fade_in_ms, frame_rate), len(output))
+        output[:n] *= (floor + (1 - floor) * np.arange(n) / n)[:, None]
+    if fade_out_ms:
+        n = min(ms_to_frames(fade_out_ms, frame_rate), len(output))
+        if n:
+            output[-n:] *= (1 + (floor - 1) * np.arange(n) / n)[:, None]
+    return output
+
+
+def normalize(samples, headroom=0.1):
+    """Scale so the peak sits `headroom` dB below full scale, as pydub.effects.normalize"""
+    peak = np.abs(samples).max() if len(samples) else 0.0
+    if peak == 0:
+        return samples
+    return samples * (db_to_gain(-headroom) / peak)
+
+
+def _window_rms(samples, window):
+    """RMS over the `window` frames before each frame (all channels), like AudioSegment.rms of a slice"""
+    power = np.concatenate(([0.0], np.cumsum((samples ** 2).mean(axis=1))))
+    ends = np.arange(len(samples))
+    starts = np.maximum(ends - window, 0)
+    counts = ends - starts
+    totals = power[ends] - power[starts]
+    return np.sqrt(np.divide(totals, counts, out=np.zeros_like(totals), where=counts > 0))
+
+
+def compress_dynamic_range(samples, frame_rate, threshold=-20.0, ratio=4.0, attack=5.0, release=50.0):
+    """
+    Downward compressor driven by an RMS envelope, as pydub.effects.compress_dynamic_range
+
+    The envelope and the target attenuation are computed for every frame at
+    once. The attack/release slew of the attenuation is stepped once per
+    millisecond and interpolated between steps.
+
+    Args:
+        samples (numpy.ndarray): Samples, shape (frames, channels)
+        frame_rate (int): Sample rate
+        threshold (float): Threshold in dBFS
+        ratio (float): Compression ratio
+        attack (float): Attack in ms
+        release (float): Release in ms
+
+    Returns:
+        numpy.ndarray: Compressed samples
+    """
+    if not len(samples):
+        return samples
+    thresh_rms = db_to_gain(threshold)
+    rms = _window_rms(samples, ms_to_frames(attack, frame_rate))
+    over_db = np.zeros_like(rms)
+    loud = rms > thresh_rms
+    over_db[loud] = 20 * np.log10(rms[loud] / thresh_rms)
+    target = (1 - 1.0 / ratio) * over_db
+
+    step = max(1, ms_to_frames(1, frame_rate))
+    attack_steps = max(attack * frame_rate / 1000 / step, 1e-9)
+    release_steps = max(release * frame_rate / 1000 / step, 1e-9)
+    positions = np.arange(0, len(samples), step)
+    step_loud = loud[positions]
+    step_target = target[positions]
+    attenuation = np.empty(len(positions))
+    current = 0.0
+    for i, (is_loud, goal) in enumerate(zip(step_loud.tolist(), step_target.tolist())):
+        if is_loud and current <= goal:
+            current = min(current + goal / attack_steps, goal)
+        else:
+            current = max(current - goal / release_steps, 0.0)
+        attenuation[i] = current
+
+    gain_db = np.interp(np.arange(len(samples)), positions, attenuation)
+    return samples * db_to_gain(-gain_db)[:, None]
+
+
+def detect_silence(samples, frame_rate, min_silence_len=1000, silence_thresh=-16):
+    """
+    Silent ranges in ms, as pydub.silence.detect_silence with seek_step=1
+
+    Args:
+        samples (numpy.ndarray): Samples, shape (frames, channels)
+        frame_rate (int): Sample rate
+        min_silence_len (int): Minimum silence length in ms
+        silence_thresh (float): dBFS at or below which a window is silent
+
+    Returns:
+        list: [start_ms, end_ms] pairs
+    """
+    ms_frames = frame_rate / 1000
+    length_ms = int(round(len(samples) / ms_frames))
+    if length_ms < min_silence_len:
+        return []
+    bounds = np.round(np.arange(length_ms + 1) * ms_frames).astype(np.int64)
+    bounds[-1] = len(samples)
+    power = np.concatenate(([0.0], np.cumsum((samples ** 2).mean(axis=1))))
+    starts = np.arange(0, length_ms - min_silence_len + 1)
+    totals = power[bounds[starts + min_silence_len]] - power[bounds[starts]]
+    counts = bounds[starts + min_silence_len] - bounds[starts]
+    rms = np.sqrt(totals / np.maximum(counts, 1))
+    silent = starts[rms <= db_to_gain(silence_thresh)]
+    if not len(silent):
+        return []
+    # Starts further apart than one window begin a new range; closer ones overlap and merge
+    breaks = np.nonzero(np.diff(silent) > min_silence_len)[0]
+    range_starts = np.concatenate(([silent[0]], silent[breaks + 1]))
+    range_ends = np.concatenate((silent[breaks], [silent[-1]])) + min_silence_len
+    return [[int(s), int(e)] for s, e in zip(range_starts, range_ends)]
+
+
+def strip_silence(samples, frame_rate, silence_len=1000, silence_thresh=-16, padding=100):
+    """
+    Remove silences longer than silence_len, keeping `padding` ms around speech, as AudioSegment.strip_silence
+
+    Args:
+        samples (numpy.ndarray): Samples, shape (frames, channels)
+        frame_rate (int): Sample rate
+        silence_len (int): Minimum silence length in ms
+        silence_thresh (float): dBFS at or below which audio is silent
+        padding (int): Silence kept on each side of speech, in ms; pieces are crossfaded over half of it
+
+    Returns:
+        numpy.ndarray: Samples with long silences removed
+    """
+    length_ms = int(round(len(samples) * 1000 / frame_rate))
+    silences = detect_silence(samples, frame_rate, silence_len, silence_thresh)
+
+    # detect_nonsilent: the gaps between silent ranges
+    speech, previous_end = [], 0
+    for start, end in silences:
+        speech.append([previous_end, start])
+        previous_end = end
+    if not silences:
+        speech = [[0, length_ms]]
+    elif previous_end != length_ms:
+        speech.append([previous_end, length_ms])
+    if speech and speech[0] == [0, 0]:
+        speech.pop(0)
+    if not speech:
+        return samples[:0]
+
+    # split_on_silence: pad each speech range, meeting halfway where the padding overlaps
+    ranges = [[start - padding, end + padding] for start, end in speech]
+    for current, following in zip(ranges, ranges[1:]):
+        if following[0] < current[1]:
+            current[1] = (current[1] + following[0]) // 2
+            following[0] = current[1]
+    pieces = [samples[ms_to_frames(max(s, 0), frame_rate):ms_to_frames(min(e, length_ms), frame_rate)]
+              for s, e in ranges]
+
+    # Rejoin with a linear crossfade of half the padding
+    crossfade = ms_to_frames(padding / 2, frame_rate)
+    floor = db_to_gain(-120)
+    fade_out = (1 + (floor - 1) * np.arange(crossfade) / max(crossfade, 1))[:, None]
+    fade_in = (floor + (1 - floor) * np.arange(crossfade) / max(crossfade, 1))[:, None]
+    output = [pieces[0]]
+    for piece in pieces[1:]:
+        tail = output[-1]
+        n = min(crossfade, len(tail), len(piece))
+        if n == 0:
+            output.append(piece)
+            continue
+        blended = np.clip(tail[-n:] * fade_out[-n:] + piece[:n] * fade_in[:n], -1.0, 1.0)
+        output[-1] = tail[:-n]
+        output.extend([blended, piece[n:]])
+    return np.concatenate(output)
+
+
+def process_segment(audio, depth_settings=None, fade_ms=0, compressor=None,
+                    silence_len=200, silence_thresh=-40, padding=100, lead_in_ms=300):
+    """
+    Run the post-processing chain on one decoded array
+
+    Args:
+        audio (AudioSegment): Decoded speech (already speed-adjusted)
+        depth_settings (tuple): (low-pass cutoff Hz, bass boost dB), or None for no depth effect
+        fade_ms (int): Fade in/out length applied with the depth effect
+        compressor (dict): compress_dynamic_range keyword arguments
+        silence_len (int): strip_silence minimum silence in ms
+        silence_thresh (float): strip_silence threshold in dBFS
+        padding (int): strip_silence padding in ms
+        lead_in_ms (int): Silence prepended to the result
+
+    Returns:
+        AudioSegment: Processed audio in the input's format
+    """
+    rate = audio.frame_rate
+    samples = from_segment(audio)
+
+    if depth_settings:
+        cutoff, bass_boost = depth_settings
+        samples = low_pass(samples, cutoff, rate)
+        if bass_boost > 0:
+            bass = low_pass(samples, 300, rate) * db_to_gain(bass_boost)
+            samples = np.clip(samples + bass, -1.0, 1.0)
+        samples = fade(samples, rate, fade_ms, fade_ms)
+
+    samples = normalize(samples)
+    samples = compress_dynamic_range(samples, rate, **(compressor or {}))
+    samples = strip_silence(samples, rate, silence_len, silence_thresh, padding)
+    lead_in = np.zeros((ms_to_frames(lead_in_ms, rate), samples.shape[1]))
+    return to_segment(np.concatenate((lead_in, samples)), audio)
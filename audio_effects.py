@@ -0,0 +1,375 @@
+"""
+Post-processing engines for synthesized speech.
+
+Every engine applies the same chain to the raw edge-tts MP3 and writes the
+final 192k MP3:
+
+    speed change -> (depth > 1: low-pass, bass overlay, fades) -> normalize
+    -> dynamic range compression -> silence trimming -> 300 ms lead-in
+
+"pydub" runs the chain step by step on AudioSegment buffers. "ffmpeg"
+expresses it as one filtergraph, so the audio is decoded, filtered and
+encoded in a single ffmpeg process with no intermediate copies in Python.
+"numpy" decodes once and runs vectorized ports of the pydub effects
+(audio_dsp.py) on the sample array.
+
+process_passthrough is the "raw" quality path for renders without speed or
+depth changes: it only trims the edge silence and adds the lead-in, working
+on MP3 frames (mp3_frames.py), so the speech keeps edge-tts' own encoding.
+
+Input can be a file path or the raw MP3 bytes themselves; bytes are piped to
+ffmpeg, so a render that starts from in-memory synthesis touches the disk
+only to write its final file.
+"""
+
+import io
+import json
+import os
+import subprocess
+import tempfile
+
+from pydub import AudioSegment
+from pydub.effects import low_pass_filter, speedup, normalize, compress_dynamic_range
+from pydub.utils import get_prober_name
+
+import mp3_frames
+
+ENGINES = ("pydub", "ffmpeg", "numpy")
+OUTPUT_BITRATE = "192k"
+LEAD_IN_MS = 300
+
+# Shared by every engine so their output matches as closely as the filters allow
+COMPRESSOR = {"threshold": -20.0, "ratio": 4.0, "attack": 5.0, "release": 50.0}
+SILENCE_LEN_MS = 200
+SILENCE_THRESH = -40
+SILENCE_KEEP_MS = 100
+
+
+def depth_settings(depth):
+    """
+    Filter parameters of a depth level
+
+    Args:
+        depth (int): Depth effect level (1 = none)
+
+    Returns:
+        tuple: (low-pass cutoff Hz, bass boost dB), or None when depth <= 1
+    """
+    if depth <= 1:
+        return None
+    return 18000 - (depth * 3000), (depth - 1) * 3
+
+
+def get_engine(name=None):
+    """
+    Resolve a post-processing engine name
+
+    Args:
+        name (str): "pydub", "ffmpeg" or "numpy"; defaults to the AUDIO_ENGINE environment variable, then "pydub"
+
+    Returns:
+        str: An entry of ENGINES
+    """
+    name = (name or os.getenv("AUDIO_ENGINE") or "pydub").strip().lower()
+    if name not in ENGINES:
+        print(f"Audio engine '{name}' is not available, using pydub")
+        return "pydub"
+    return name
+
+
+def pydub_chain(audio, speed=1.0, depth=1):
+    """
+    Apply the post-processing chain with pydub, one buffer copy per step
+
+    Args:
+        audio (AudioSegment): Raw synthesized speech
+        speed (float): Speed factor (1.0 = normal)
+        depth (int): Depth effect level (1 = none, 2+ = more bass and filtering)
+
+    Returns:
+        AudioSegment: Processed audio
+    """
+    # Apply speed manually
+    if speed != 1.0:
+        print(f"Applying playback speed: {speed}")
+        audio = speedup(audio, playback_speed=speed)
+
+    # Apply depth effects
+    settings = depth_settings(depth)
+    if settings:
+        cutoff, bass_boost = settings
+        print(f"Applying low-pass filter at {cutoff}Hz")
+        audio = low_pass_filter(audio, cutoff)
+
+        if bass_boost > 0:
+            print(f"Boosting bass +{bass_boost}dB")
+            bass = audio.low_pass_filter(300) + bass_boost
+            audio = audio.overlay(bass)
+
+        fade = min(200, len(audio) // 20)
+        audio = audio.fade_in(fade).fade_out(fade)
+
+    # Enhance audio quality
+    print("Normalizing volume")
+    audio = normalize(audio)
+
+    print("Applying dynamic range compression")
+    audio = compress_dynamic_range(audio, **COMPRESSOR)
+
+    print("Trimming silence")
+    audio = audio.strip_silence(silence_len=SILENCE_LEN_MS, silence_thresh=SILENCE_THRESH, padding=SILENCE_KEEP_MS)
+
+    # Add 300ms padding at start
+    print(f"Adding {LEAD_IN_MS}ms silence at the beginning")
+    return AudioSegment.silent(duration=LEAD_IN_MS, frame_rate=audio.frame_rate) + audio
+
+
+def numpy_chain(audio, speed=1.0, depth=1):
+    """
+    Apply the post-processing chain with the vectorized effects of audio_dsp
+
+    The speed change still uses pydub's speedup, which works on 150 ms chunks
+    rather than per sample.
+
+    Args:
+        audio (AudioSegment): Raw synthesized speech
+        speed (float): Speed factor (1.0 = normal)
+        depth (int): Depth effect level (1 = none, 2+ = more bass and filtering)
+
+    Returns:
+        AudioSegment: Processed audio
+    """
+    import audio_dsp  # numpy is only needed when this engine is selected
+
+    if speed != 1.0:
+        print(f"Applying playback speed: {speed}")
+        audio = speedup(audio, playback_speed=speed)
+
+    settings = depth_settings(depth)
+    print(f"Running NumPy effect chain (depth settings: {settings})")
+    return audio_dsp.process_segment(
+        audio,
+        depth_settings=settings,
+        fade_ms=min(200, len(audio) // 20) if settings else 0,
+        compressor=COMPRESSOR,
+        silence_len=SILENCE_LEN_MS,
+        silence_thresh=SILENCE_THRESH,
+        padding=SILENCE_KEEP_MS,
+        lead_in_ms=LEAD_IN_MS,
+    )
+
+
+def decode(source):
+    """
+    Decode MP3 audio into an AudioSegment
+
+    Args:
+        source (str | bytes): File path or MP3 data (piped to ffmpeg, never written to disk)
+
+    Returns:
+        AudioSegment: Decoded audio
+    """
+    if isinstance(source, (bytes, bytearray)):
+        return AudioSegment.from_file(io.BytesIO(source), format="mp3")
+    return AudioSegment.from_file(source)
+
+
+def _run_ffmpeg(arguments, input_data, action):
+    command = [AudioSegment.converter, "-hide_banner", "-loglevel", "error", "-y"] + arguments
+    result = subprocess.run(command, input=input_data, capture_output=True)
+    if result.returncode != 0:
+        raise Exception(f"ffmpeg {action} failed: {result.stderr.decode(errors='replace').strip()}")
+    return result.stdout
+
+
+def _write_atomically(output_path, write):
+    """Call write(tmp_path) on a temp file next to output_path, then move it into place"""
+    directory = os.path.dirname(os.path.abspath(output_path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".part.mp3")
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def encode_mp3(audio, output_path=None, bitrate=OUTPUT_BITRATE):
+    """
+    Encode an AudioSegment to MP3 with one ffmpeg call fed from memory
+
+    Unlike AudioSegment.export, which stages a WAV copy and the encoded file in
+    temp files, the PCM samples go to ffmpeg over a pipe.
+
+    Args:
+        audio (AudioSegment): Audio to encode
+        output_path (str): Destination file, written once; None to get the bytes back instead
+        bitrate (str): MP3 bitrate
+
+    Returns:
+        bytes: The encoded MP3 when output_path is None, otherwise None
+    """
+    sample_format = {1: "u8", 2: "s16le", 4: "s32le"}[audio.sample_width]
+    arguments = [
+        "-f", sample_format, "-ar", str(audio.frame_rate), "-ac", str(audio.channels), "-i", "pipe:0",
+        "-c:a", "libmp3lame", "-b:a", bitrate, "-f", "mp3",
+    ]
+    if output_path is None:
+        return _run_ffmpeg(arguments + ["pipe:1"], audio.raw_data, "encode")
+    _write_atomically(output_path, lambda tmp_path: _run_ffmpeg(arguments + [tmp_path], audio.raw_data, "encode"))
+
+
+def _process_in_python(chain, source, output_path, speed, depth):
+    audio = chain(decode(source), speed, depth)
+    print(f"Exporting final audio to: {output_path}")
+    encode_mp3(audio, output_path)
+
+
+def process_pydub(source, output_path, speed=1.0, depth=1):
+    """Decode, run pydub_chain and export the final MP3 (see pydub_chain for the arguments)"""
+    _process_in_python(pydub_chain, source, output_path, speed, depth)
+
+
+def process_numpy(source, output_path, speed=1.0, depth=1):
+    """Decode, run numpy_chain and export the final MP3 (see numpy_chain for the arguments)"""
+    _process_in_python(numpy_chain, source, output_path, speed, depth)
+
+
+def process_passthrough(source, output_path):
+    """
+    Trim edge silence and prepend the lead-in without re-encoding (see mp3_frames.passthrough)
+
+    Args:
+        source (str | bytes): Raw synthesized audio, as a path or MP3 data
+        output_path (str): Final MP3 path
+    """
+    if not isinstance(source, (bytes, bytearray)):
+        with open(source, "rb") as f:
+            source = f.read()
+    print("Passing synthesized audio through (frame-level trim, no re-encode)")
+    audio = mp3_frames.passthrough(source, lead_in_ms=LEAD_IN_MS, keep_ms=SILENCE_KEEP_MS,
+                                   silence_thresh=SILENCE_THRESH)
+
+    def write(tmp_path):
+        with open(tmp_path, "wb") as f:
+            f.write(audio)
+
+    _write_atomically(output_path, write)
+
+
+def _probe(source):
+    """Duration (seconds) and sample rate of the first audio stream, via ffprobe"""
+    command = [
+        get_prober_name(), "-v", "error", "-select_streams", "a:0",
+        "-show_entries", "stream=sample_rate,bit_rate:format=duration", "-of", "json",
+    ]
+    in_memory = isinstance(source, (bytes, bytearray))
+    result = subprocess.run(command + ["-i", "pipe:0" if in_memory else source],
+                            input=source if in_memory else None, capture_output=True, check=True)
+    info = json.loads(result.stdout)
+    stream = info["streams"][0]
+    if "duration" in info.get("format", {}):
+        return float(info["format"]["duration"]), int(stream["sample_rate"])
+    # A pipe has no length to read the duration from; edge-tts MP3s are CBR, so size / bitrate is exact enough
+    return len(source) * 8 / int(stream["bit_rate"]), int(stream["sample_rate"])
+
+
+def _atempo_chain(speed):
+    """atempo accepts 0.5-2.0 per instance, so larger changes are chained"""
+    filters = []
+    while speed > 2.0:
+        filters.append("atempo=2.0")
+        speed /= 2.0
+    while speed < 0.5:
+        filters.append("atempo=0.5")
+        speed /= 0.5
+    filters.append(f"atempo={speed:.6g}")
+    return filters
+
+
+def build_filtergraph(speed, depth, duration, sample_rate):
+    """
+    The post-processing chain as an ffmpeg -filter_complex graph
+
+    Args:
+        speed (float): Speed factor
+        depth (int): Depth effect level
+        duration (float): Input duration in seconds (places the fade-out)
+        sample_rate (int): Input sample rate, restored after loudness normalization
+
+    Returns:
+        str: Filtergraph reading [0:a] and writing [out]
+    """
+    steps = ["[0:a]" + ",".join(_atempo_chain(speed) if speed != 1.0 else ["anull"])]
+
+    settings = depth_settings(depth)
+    if settings:
+        cutoff, bass_boost = settings
+        steps[-1] += f",lowpass=f={cutoff}"
+        if bass_boost > 0:
+            # Same as pydub's overlay: the signal plus its boosted <300 Hz band
+            steps[-1] += "[pre];[pre]asplit[dry][wet];"
+            steps.append(f"[wet]lowpass=f=300,volume={bass_boost}dB[bass];"
+                         f"[dry][bass]amix=inputs=2:normalize=0")
+        fade = min(0.2, duration / speed / 20)
+        steps[-1] += (f",afade=t=in:d={fade:.3f}"
+                      f",afade=t=out:st={max(duration / speed - fade, 0):.3f}:d={fade:.3f}")
+
+    steps[-1] += (
+        # Loudness normalization (resamples internally, so restore the input rate)
+        f",loudnorm=I=-16:TP=-1:LRA=11,aresample={sample_rate}"
+        f",acompressor=threshold={COMPRESSOR['threshold']}dB:ratio={COMPRESSOR['ratio']}"
+        f":attack={COMPRESSOR['attack']}:release={COMPRESSOR['release']}"
+        f",silenceremove=start_periods=1:start_threshold={SILENCE_THRESH}dB:start_silence={SILENCE_KEEP_MS / 1000}"
+        f":stop_periods=-1:stop_duration={SILENCE_LEN_MS / 1000}:stop_threshold={SILENCE_THRESH}dB"
+        f":stop_silence={SILENCE_KEEP_MS / 1000}"
+        f",adelay={LEAD_IN_MS}:all=1[out]"
+    )
+    return "".join(steps)
+
+
+def process_ffmpeg(source, output_path, speed=1.0, depth=1):
+    """
+    Apply the post-processing chain as one ffmpeg filtergraph (single decode/encode pass)
+
+    Args:
+        source (str | bytes): Raw synthesized audio, as a path or MP3 data
+        output_path (str): Final MP3 path
+        speed (float): Speed factor (1.0 = normal)
+        depth (int): Depth effect level (1 = none, 2+ = more bass and filtering)
+    """
+    duration, sample_rate = _probe(source)
+    graph = build_filtergraph(speed, depth, duration, sample_rate)
+    print(f"Running ffmpeg filtergraph: {graph}")
+    in_memory = isinstance(source, (bytes, bytearray))
+    arguments = (["-f", "mp3", "-i", "pipe:0"] if in_memory else ["-i", source]) + [
+        "-filter_complex", graph, "-map", "[out]", "-c:a", "libmp3lame", "-b:a", OUTPUT_BITRATE, "-f", "mp3",
+    ]
+    _write_atomically(output_path, lambda tmp_path: _run_ffmpeg(
+        arguments + [tmp_path], source if in_memory else None, "post-processing"
+    ))
+
+
+def postprocess(source, output_path, speed=1.0, depth=1, engine=None):
+    """
+    Turn raw synthesized speech into the final MP3 with the selected engine
+
+    Args:
+        source (str | bytes): Raw synthesized audio, as a path or MP3 data
+        output_path (str): Final MP3 path
+        speed (float): Speed factor (1.0 = normal)
+        depth (int): Depth effect level
+        engine (str): Engine name (see get_engine)
+    """
+    engine = get_engine(engine)
+    if engine == "ffmpeg":
+        process_ffmpeg(source, output_path, speed, depth)
+    elif engine == "numpy":
+        process_numpy(source, output_path, speed, depth)
+    else:
+        process_pydub(source, output_path, speed, depth)
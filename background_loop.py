@@ -0,0 +1,66 @@
+import asyncio
+import concurrent.futures
+import threading
+
+
+class BackgroundLoop:
+    """
+    One long-lived asyncio event loop running in a daemon thread.
+
+    Any thread can hand it a coroutine with submit() (returns a
+    concurrent.futures.Future) or run() (blocks for the result), so all of
+    the app's async work shares one loop instead of creating and tearing
+    down a loop per job or request. Coroutines that run here must not block:
+    CPU-heavy or blocking steps belong in asyncio.to_thread.
+    """
+
+    def __init__(self, name="event-loop"):
+        """
+        Args:
+            name (str): Name of the loop's thread
+        """
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run_forever, name=name, daemon=True)
+        self._thread.start()
+
+    def _run_forever(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, coroutine):
+        """
+        Schedule a coroutine on the loop from any thread
+
+        Args:
+            coroutine: Coroutine object to run
+
+        Returns:
+            concurrent.futures.Future: Resolves to the coroutine's result or exception
+        """
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+    def run(self, coroutine, timeout=None):
+        """
+        Run a coroutine on the loop and wait for its result
+
+        Args:
+            coroutine: Coroutine object to run
+            timeout (float): Seconds to wait before raising TimeoutError (the coroutine is cancelled)
+
+        Returns:
+            The coroutine's result (its exception is re-raised)
+        """
+        if threading.current_thread() is self._thread:
+            coroutine.close()
+            raise RuntimeError("BackgroundLoop.run() called from the loop's own thread; await the coroutine instead")
+        future = self.submit(coroutine)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+    def stop(self):
+        """Stop the loop and wait for its thread to exit"""
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
@@ -0,0 +1,82 @@
+"""
+Benchmark: pydub vs ffmpeg-filtergraph post-processing.
+
+Runs audio_effects.process_pydub and process_ffmpeg on every MP3 in
+static/audio, or the files given with --files, for each speed/depth
+combination. Each timing covers the whole engine call: decode, filter
+chain and the 192k MP3 encode. The report also prints output durations,
+so silence trimming and tempo changes can be compared.
+
+Requires ffmpeg/ffprobe on PATH, like the app itself.
+
+Usage:
+    python benchmarks/bench_audio_engines.py [--files a.mp3 b.mp3] [--limit 10]
+                                             [--settings 1.0:1 1.2:1 1.0:3]
+"""
+
+import argparse
+import glob
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from pydub.utils import mediainfo  # noqa: E402
+
+import audio_effects  # noqa: E402
+
+ENGINES = {
+    "pydub": audio_effects.process_pydub,
+    "ffmpeg": audio_effects.process_ffmpeg,
+}
+
+
+def duration(path):
+    return float(mediainfo(path)["duration"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", nargs="+", help="MP3 inputs (default: static/audio/*.mp3)")
+    parser.add_argument("--limit", type=int, default=10, help="max input files")
+    parser.add_argument("--settings", nargs="+", default=["1.0:1", "1.2:1", "1.0:3"],
+                        help="speed:depth combinations")
+    args = parser.parse_args()
+
+    files = args.files or sorted(glob.glob(os.path.join(ROOT, "static", "audio", "*.mp3")))
+    files = [f for f in files if os.path.getsize(f) > 0][:args.limit]
+    if not files:
+        parser.error("no input files")
+    total_audio = sum(duration(f) for f in files)
+    print(f"{len(files)} files, {total_audio:.0f} s of audio\n")
+    print(f"{'speed:depth':<12} {'engine':<8} {'total s':>8} {'x realtime':>11} {'out s':>8} {'speedup':>8}")
+
+    # Silence the per-step progress prints of the engines
+    with tempfile.TemporaryDirectory() as workdir, open(os.devnull, "w") as devnull:
+        for setting in args.settings:
+            speed, depth = float(setting.split(":")[0]), int(setting.split(":")[1])
+            baseline = None
+            for name, engine in ENGINES.items():
+                timings, out_duration = [], 0.0
+                for i, path in enumerate(files):
+                    output = os.path.join(workdir, f"{name}_{i}.mp3")
+                    stdout, sys.stdout = sys.stdout, devnull
+                    try:
+                        start = time.perf_counter()
+                        engine(path, output, speed, depth)
+                        timings.append(time.perf_counter() - start)
+                    finally:
+                        sys.stdout = stdout
+                    out_duration += duration(output)
+                total = sum(timings)
+                baseline = baseline or total
+                print(f"{setting:<12} {name:<8} {total:8.2f} {total_audio / total:10.0f}x "
+                      f"{out_duration:8.1f} {baseline / total:7.2f}x")
+            print(f"{'':<12} median per file: {statistics.median(timings) * 1000:.0f} ms (ffmpeg)")
+
+
+if __name__ == "__main__":
+    main()
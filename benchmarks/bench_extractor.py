@@ -0,0 +1,283 @@
+"""
+Benchmark: single-pass scoring extractor vs the old selector cascade.
+
+The baseline is the selector cascade GNewsClient used before (copied
+verbatim below) plus its whole-page paragraph fallback. Both run on the
+same parsed soup for every page in the corpus; the report shows parse-free
+extraction time per page and how the extracted text compares.
+
+Corpus: a directory of saved .html pages (--corpus). Use --save to download
+pages into it first. Without --corpus a synthetic corpus with known article
+text is generated, which also lets the script report recall/precision.
+
+Usage:
+    python benchmarks/bench_extractor.py --save https://example.com/story ... --corpus pages/
+    python benchmarks/bench_extractor.py --corpus pages/ [--repeat 5]
+    python benchmarks/bench_extractor.py [--pages 30]
+"""
+
+import argparse
+import glob
+import os
+import random
+import statistics
+import sys
+import time
+
+import requests
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from article_extractor import extract_article  # noqa: E402
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                  "(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+}
+
+
+def legacy_cascade(soup):
+    """
+    Try multiple approaches to extract the article content
+
+    Args:
+        soup (BeautifulSoup): Parsed HTML
+
+    Returns:
+        str: Extracted content
+    """
+    content = ""
+
+    # Strategy 1: Look for article body by common class names
+    article_selectors = [
+        'article', 
+        '.article-body', 
+        '.article-content',
+        '.story-body',
+        '.story-content', 
+        '.entry-content',
+        '.post-content',
+        '.content',
+        '.main-content',
+        '#article-body',
+        '.article__body',
+        '.article__content',
+        '.story__body',
+        '.story__content',
+        '.post__content',
+        '.news-article',
+        '.news-content',
+        '.page-content',
+        '.rich-text',
+        '.article-text',
+        '.article-main',
+        '.main-article',
+        '.article-body-content'
+    ]
+
+    for selector in article_selectors:
+        try:
+            if selector.startswith('.'):
+                elements = soup.select(selector)
+            elif selector.startswith('#'):
+                element = soup.select_one(selector)
+                elements = [element] if element else []
+            else:
+                elements = soup.find_all(selector)
+
+            if elements:
+                # Extract paragraphs from the first matching element
+                for element in elements:
+                    paragraphs = element.find_all('p')
+                    if paragraphs:
+                        content = '\n\n'.join([p.get_text().strip() for p in paragraphs if len(p.get_text().strip()) > 0])
+                        if len(content) > 200:  # If we got substantial content, use it
+                            return content
+        except Exception as e:
+            print(f"Error in selector {selector}: {e}")
+            continue
+
+    # Strategy 2: Look for main content area
+    main_selectors = ['main', '#main', '.main', 'article']
+    for selector in main_selectors:
+        try:
+            if selector.startswith('.') or selector.startswith('#'):
+                elements = soup.select(selector)
+            else:
+                elements = soup.find_all(selector)
+
+            for element in elements:
+                paragraphs = element.find_all('p')
+                if paragraphs:
+                    content = '\n\n'.join([p.get_text().strip() for p in paragraphs if len(p.get_text().strip()) > 0])
+                    if len(content) > 200:
+                        return content
+        except Exception:
+            continue
+
+    # Strategy 3: Find the div with the most paragraphs
+    paragraphs_by_parent = {}
+    for p in soup.find_all('p'):
+        parent = p.parent
+        if parent not in paragraphs_by_parent:
+            paragraphs_by_parent[parent] = []
+        paragraphs_by_parent[parent].append(p)
+
+    if paragraphs_by_parent:
+        # Sort parents by number of paragraphs
+        sorted_parents = sorted(paragraphs_by_parent.keys(), 
+                                key=lambda x: len(paragraphs_by_parent[x]), 
+                                reverse=True)
+
+        # Get the parent with the most paragraphs
+        main_parent = sorted_parents[0]
+        paragraphs = paragraphs_by_parent[main_parent]
+
+        # Extract text from these paragraphs
+        content = '\n\n'.join([p.get_text().strip() for p in paragraphs if len(p.get_text().strip()) > 0])
+
+    return content
+
+
+def legacy_extract(soup):
+    """The old fetch_article_content path: cascade, then the all-paragraphs fallback"""
+    content = legacy_cascade(soup)
+    if not content or len(content) < 100:
+        paragraphs = soup.find_all('p')
+        content = '\n\n'.join([p.get_text().strip() for p in paragraphs if len(p.get_text().strip()) > 40])
+    return content
+
+
+WORDS = ("the government said on tuesday that new measures would be introduced to support "
+         "local businesses affected by rising energy prices across the region analysts expect "
+         "markets to react cautiously as officials confirm details of the plan").split()
+
+
+def _sentence(rng, low=8, high=30):
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(low, high))).capitalize() + "."
+
+
+def synthetic_page(rng):
+    """
+    Build a news-like page: navigation, sidebar, scripts, comments and an article body
+
+    Returns:
+        tuple: (html, list of the article's paragraph texts)
+    """
+    article = [" ".join(_sentence(rng) for _ in range(rng.randint(2, 5))) for _ in range(rng.randint(6, 25))]
+    links = "".join(f'<li><a href="/s/{i}">{_sentence(rng, 3, 6)}</a></li>' for i in range(rng.randint(20, 60)))
+    teasers = "".join(f'<div class="teaser"><p>{_sentence(rng, 10, 18)}</p></div>' for _ in range(rng.randint(3, 10)))
+    comments = "".join(f'<div class="comment"><p>{_sentence(rng, 5, 25)}</p></div>' for _ in range(rng.randint(0, 15)))
+    script = "<script>" + "var x = {};" * rng.randint(200, 2000) + "</script>"
+    body_class = rng.choice(["article-body", "story__body", "c-entry", "txt", "rich-text"])
+    wrapped = "".join(
+        f"<div class='para-wrap'><p>{p}</p></div>" if rng.random() < 0.3 else f"<p>{p}</p>"
+        for p in article
+    )
+    html = (
+        f"<html><head><title>Story</title>{script}<style>.a{{color:red}}</style></head><body>"
+        f"<header><nav><ul>{links}</ul></nav></header>"
+        f"<div class='layout'><main><h1>Headline</h1>"
+        f"<div class='{body_class}'>{wrapped}<p><a href='/more'>Read more</a></p></div>"
+        f"<section class='related'>{teasers}</section>"
+        f"<section class='comments'>{comments}</section></main>"
+        f"<aside class='sidebar'><ul>{links}</ul></aside></div>"
+        f"{script}<footer><p>Copyright Example News. All rights reserved worldwide.</p></footer>"
+        f"</body></html>"
+    )
+    return html, article
+
+
+def load_corpus(directory):
+    pages = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.html"))):
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            pages.append((os.path.basename(path), f.read(), None))
+    return pages
+
+
+def save_pages(urls, directory):
+    os.makedirs(directory, exist_ok=True)
+    for i, url in enumerate(urls):
+        try:
+            response = requests.get(url, headers=HEADERS, timeout=15)
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            print(f"skip {url}: {e}")
+            continue
+        path = os.path.join(directory, f"page_{i:03d}.html")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(response.text)
+        print(f"saved {url} -> {path}")
+
+
+def _words(text):
+    return set(text.lower().split())
+
+
+def time_call(fn, soup, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(soup)
+        timings.append(time.perf_counter() - start)
+    return result, min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", help="directory of saved .html pages")
+    parser.add_argument("--save", nargs="+", metavar="URL", help="download pages into --corpus first")
+    parser.add_argument("--pages", type=int, default=30, help="synthetic pages when no corpus is given")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.save:
+        if not args.corpus:
+            parser.error("--save needs --corpus")
+        save_pages(args.save, args.corpus)
+
+    if args.corpus:
+        pages = load_corpus(args.corpus)
+    else:
+        rng = random.Random(42)
+        pages = [(f"synthetic_{i:03d}", *synthetic_page(rng)) for i in range(args.pages)]
+    if not pages:
+        parser.error("corpus is empty")
+
+    legacy_times, new_times = [], []
+    legacy_recall, new_recall, legacy_precision, new_precision, agreement = [], [], [], [], []
+    print(f"{'page':<22} {'legacy ms':>10} {'scored ms':>10} {'legacy chars':>13} {'scored chars':>13}")
+    for name, html, truth in pages:
+        soup = BeautifulSoup(html, "html.parser")
+        old, old_time = time_call(legacy_extract, soup, args.repeat)
+        new, new_time = time_call(lambda s: extract_article(s).content, soup, args.repeat)
+        legacy_times.append(old_time)
+        new_times.append(new_time)
+        print(f"{name[:22]:<22} {old_time * 1000:10.2f} {new_time * 1000:10.2f} {len(old):13d} {len(new):13d}")
+
+        if truth is not None:
+            expected = "\n\n".join(truth)
+            legacy_recall.append(sum(p in old for p in truth) / len(truth))
+            new_recall.append(sum(p in new for p in truth) / len(truth))
+            legacy_precision.append(len(expected) / len(old) if old and legacy_recall[-1] else 0.0)
+            new_precision.append(len(expected) / len(new) if new and new_recall[-1] else 0.0)
+        else:
+            old_words, new_words = _words(old), _words(new)
+            union = old_words | new_words
+            agreement.append(len(old_words & new_words) / len(union) if union else 1.0)
+
+    total_old, total_new = sum(legacy_times), sum(new_times)
+    print(f"\n{len(pages)} pages, best of {args.repeat} runs (extraction only, parse excluded)")
+    print(f"  legacy cascade : {total_old * 1000:9.1f} ms total, median {statistics.median(legacy_times) * 1000:.2f} ms/page")
+    print(f"  scored walk    : {total_new * 1000:9.1f} ms total, median {statistics.median(new_times) * 1000:.2f} ms/page")
+    print(f"  speedup        : {total_old / total_new:.2f}x")
+    if legacy_recall:
+        print(f"  paragraph recall    legacy {statistics.mean(legacy_recall):.3f}  scored {statistics.mean(new_recall):.3f}")
+        print(f"  precision (chars)   legacy {statistics.mean(legacy_precision):.3f}  scored {statistics.mean(new_precision):.3f}")
+    if agreement:
+        print(f"  word-set agreement with legacy (Jaccard): mean {statistics.mean(agreement):.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Benchmark: bare requests.get vs the pooled keep-alive session in gnews_client.
+
+Starts a local HTTP/1.1 stub server (optionally behind TLS with a throwaway
+self-signed certificate) and fires the same number of GETs through both
+paths, sequentially and from several threads. The server counts accepted
+connections, so the handshake savings show up directly next to the timings.
+
+Usage:
+    python benchmarks/bench_http_session.py [--requests 200] [--threads 8] [--tls]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import ssl
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gnews_client import PooledSession  # noqa: E402
+
+PAYLOAD = json.dumps({"totalArticles": 1, "articles": [{"title": "stub"}] * 10}).encode()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # allow keep-alive
+    disable_nagle_algorithm = True  # headers and body go out as separate writes
+
+    def setup(self):
+        # setup() runs once per accepted connection
+        with self.server.lock:
+            self.server.connections += 1
+        super().setup()
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(PAYLOAD)))
+        self.end_headers()
+        self.wfile.write(PAYLOAD)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_self_signed_cert(directory):
+    """Create a throwaway cert/key pair with the openssl CLI"""
+    cert = os.path.join(directory, "cert.pem")
+    key = os.path.join(directory, "key.pem")
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+         "-subj", "/CN=localhost", "-keyout", key, "-out", cert],
+        check=True, capture_output=True,
+    )
+    return cert, key
+
+
+def start_server(tls_dir=None):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.connections = 0
+    scheme = "http"
+    if tls_dir:
+        cert, key = make_self_signed_cert(tls_dir)
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(cert, key)
+        server.socket = context.wrap_socket(server.socket, server_side=True)
+        scheme = "https"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"{scheme}://127.0.0.1:{server.server_address[1]}/api/v4/top-headlines"
+
+
+def run(server, label, get, url, count, threads):
+    with server.lock:
+        server.connections = 0
+    start = time.perf_counter()
+    if threads <= 1:
+        for _ in range(count):
+            get(url).raise_for_status()
+    else:
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            for response in pool.map(lambda _: get(url), range(count)):
+                response.raise_for_status()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<34} {elapsed * 1000:9.1f} ms total  "
+          f"{elapsed / count * 1000:7.3f} ms/req  {server.connections:5d} connections")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--tls", action="store_true", help="serve over HTTPS to include TLS handshakes")
+    args = parser.parse_args()
+
+    tls_dir = None
+    if args.tls:
+        if not shutil.which("openssl"):
+            parser.error("--tls needs the openssl CLI")
+        tls_dir = tempfile.mkdtemp(prefix="bench_tls_")
+        warnings.filterwarnings("ignore", message="Unverified HTTPS request")
+
+    server, url = start_server(tls_dir)
+    pooled = PooledSession(pool_maxsize=args.threads)
+
+    def bare_get(u):
+        return requests.get(u, timeout=10, verify=not args.tls)
+
+    def pooled_get(u):
+        return pooled.get(u, verify=not args.tls)
+
+    print(f"{args.requests} GETs against {url}\n")
+    bare = run(server, "requests.get (sequential)", bare_get, url, args.requests, 1)
+    fast = run(server, "PooledSession.get (sequential)", pooled_get, url, args.requests, 1)
+    print(f"  speedup: {bare / fast:.2f}x\n")
+
+    bare = run(server, f"requests.get ({args.threads} threads)", bare_get, url, args.requests, args.threads)
+    fast = run(server, f"PooledSession.get ({args.threads} threads)", pooled_get, url, args.requests, args.threads)
+    print(f"  speedup: {bare / fast:.2f}x")
+
+    pooled.close()
+    server.shutdown()
+    if tls_dir:
+        shutil.rmtree(tls_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Equivalence check and throughput: NumPy DSP chain vs the pydub chain.
+
+Each input MP3 (static/audio by default) is decoded once. Then
+audio_effects.pydub_chain and audio_effects.numpy_chain run on the same
+AudioSegment for every speed/depth combination.
+
+Equivalence: the two outputs must have the same length within
+--max-length-diff ms. Their 20 ms RMS envelopes (in dBFS, floored at
+-60) must differ by at most --max-mean-db on average over windows where
+either output is audible. The script exits with status 1 if any case
+fails, so it can be used as a check.
+
+Throughput is reported as seconds of audio processed per CPU-second of
+this process (time.process_time). Decode and MP3 encode are excluded,
+since they are identical for both engines. A per-stage breakdown compares
+the two effects that dominate the pydub chain: compress_dynamic_range and
+strip_silence.
+
+Usage:
+    python benchmarks/bench_numpy_dsp.py [--files a.mp3 ...] [--limit 5]
+                                         [--settings 1.0:1 1.2:1 1.0:3]
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from pydub import AudioSegment  # noqa: E402
+from pydub.effects import compress_dynamic_range  # noqa: E402
+
+import audio_dsp  # noqa: E402
+import audio_effects  # noqa: E402
+
+WINDOW_MS = 20
+FLOOR_DB = -60
+
+
+def envelope_db(segment):
+    """20 ms RMS envelope in dBFS, floored"""
+    samples = audio_dsp.from_segment(segment)
+    window = audio_dsp.ms_to_frames(WINDOW_MS, segment.frame_rate)
+    count = len(samples) // window
+    power = (samples[:count * window] ** 2).mean(axis=1).reshape(count, window).mean(axis=1)
+    return np.maximum(10 * np.log10(np.maximum(power, 1e-12)), FLOOR_DB)
+
+
+def compare(reference, candidate):
+    """(length difference ms, mean |dB| difference, 95th percentile |dB| difference)"""
+    a, b = envelope_db(reference), envelope_db(candidate)
+    n = min(len(a), len(b))
+    a, b = a[:n], b[:n]
+    audible = (a > FLOOR_DB) | (b > FLOOR_DB)
+    diff = np.abs(a - b)[audible] if audible.any() else np.zeros(1)
+    return abs(len(reference) - len(candidate)), float(diff.mean()), float(np.percentile(diff, 95))
+
+
+def cpu_time(fn, *args):
+    start = time.process_time()
+    result = fn(*args)
+    return result, time.process_time() - start
+
+
+def quiet(fn, *args):
+    """Call fn with the engines' progress prints silenced"""
+    with open(os.devnull, "w") as devnull:
+        stdout, sys.stdout = sys.stdout, devnull
+        try:
+            return fn(*args)
+        finally:
+            sys.stdout = stdout
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", nargs="+", help="MP3 inputs (default: static/audio/*.mp3)")
+    parser.add_argument("--limit", type=int, default=5, help="max input files")
+    parser.add_argument("--settings", nargs="+", default=["1.0:1", "1.2:1", "1.0:3"], help="speed:depth combinations")
+    parser.add_argument("--max-length-diff", type=float, default=60, help="allowed length difference, ms")
+    parser.add_argument("--max-mean-db", type=float, default=1.0, help="allowed mean envelope difference, dB")
+    args = parser.parse_args()
+
+    files = args.files or sorted(glob.glob(os.path.join(ROOT, "static", "audio", "*.mp3")))
+    files = [f for f in files if os.path.getsize(f) > 0][:args.limit]
+    if not files:
+        parser.error("no input files")
+    inputs = [AudioSegment.from_file(f) for f in files]
+    total_audio = sum(len(seg) for seg in inputs) / 1000
+    print(f"{len(files)} files, {total_audio:.0f} s of audio\n")
+
+    print(f"{'speed:depth':<12} {'pydub cpu s':>11} {'numpy cpu s':>11} {'pydub x':>8} {'numpy x':>8} "
+          f"{'speedup':>8} {'len ms':>7} {'mean dB':>8} {'p95 dB':>7}  result")
+    failures = 0
+    for setting in args.settings:
+        speed, depth = float(setting.split(":")[0]), int(setting.split(":")[1])
+        pydub_cpu = numpy_cpu = 0.0
+        worst = (0.0, 0.0, 0.0)
+        passed = True
+        for segment in inputs:
+            reference, elapsed = quiet(cpu_time, audio_effects.pydub_chain, segment, speed, depth)
+            pydub_cpu += elapsed
+            candidate, elapsed = quiet(cpu_time, audio_effects.numpy_chain, segment, speed, depth)
+            numpy_cpu += elapsed
+            length_diff, mean_db, p95_db = compare(reference, candidate)
+            worst = tuple(max(w, v) for w, v in zip(worst, (length_diff, mean_db, p95_db)))
+            passed &= length_diff <= args.max_length_diff and mean_db <= args.max_mean_db
+        failures += not passed
+        print(f"{setting:<12} {pydub_cpu:11.2f} {numpy_cpu:11.2f} {total_audio / pydub_cpu:7.0f}x "
+              f"{total_audio / numpy_cpu:7.0f}x {pydub_cpu / numpy_cpu:7.1f}x {worst[0]:7.0f} {worst[1]:8.2f} "
+              f"{worst[2]:7.2f}  {'ok' if passed else 'FAIL'}")
+
+    print("\nper stage (seconds of audio per CPU-second, all files):")
+    stages = {
+        "compress_dynamic_range": (
+            lambda seg: compress_dynamic_range(seg, **audio_effects.COMPRESSOR),
+            lambda seg: audio_dsp.compress_dynamic_range(audio_dsp.from_segment(seg), seg.frame_rate,
+                                                         **audio_effects.COMPRESSOR),
+        ),
+        "strip_silence": (
+            lambda seg: seg.strip_silence(silence_len=audio_effects.SILENCE_LEN_MS,
+                                          silence_thresh=audio_effects.SILENCE_THRESH,
+                                          padding=audio_effects.SILENCE_KEEP_MS),
+            lambda seg: audio_dsp.strip_silence(audio_dsp.from_segment(seg), seg.frame_rate,
+                                                audio_effects.SILENCE_LEN_MS, audio_effects.SILENCE_THRESH,
+                                                audio_effects.SILENCE_KEEP_MS),
+        ),
+    }
+    for name, (pydub_fn, numpy_fn) in stages.items():
+        pydub_cpu = sum(cpu_time(pydub_fn, seg)[1] for seg in inputs)
+        numpy_cpu = sum(cpu_time(numpy_fn, seg)[1] for seg in inputs)
+        print(f"  {name:<24} pydub {total_audio / pydub_cpu:8.0f}x   numpy {total_audio / numpy_cpu:8.0f}x")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Micro-benchmark: HTML parser backends for article extraction.
+
+For every installed backend (lxml, html.parser) the corpus is parsed with
+and without the script/style/noscript/svg pre-strip. The report shows
+parse time and peak memory per page. Memory is the tracemalloc peak, so it
+counts the Python objects of the soup tree. It does not count the C
+buffers lxml allocates internally.
+
+Corpus: a directory of saved .html pages (--corpus, see bench_extractor.py
+--save), or a generated corpus of news pages padded with inline SVG icons, scripts
+and noscript ads.
+
+Usage:
+    python benchmarks/bench_parsers.py [--corpus pages/] [--pages 20] [--repeat 3]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from article_extractor import available_parsers, extract_article, parse_html  # noqa: E402
+from bench_extractor import load_corpus, synthetic_page  # noqa: E402
+
+
+def heavy_page(rng):
+    """A synthetic news page padded with the inline SVG icons, tracking scripts and noscript ads real pages carry"""
+    html, _ = synthetic_page(rng)
+    icon = "<svg viewBox='0 0 24 24'>" + "<path d='M12 2L2 7l10 5 10-5-10-5z'/>" * 12 + "</svg>"
+    script = "<script>window.dataLayer=window.dataLayer||[];" + "dataLayer.push({'e':'v'});" * 40 + "</script>"
+    ad = "<noscript><div class='ad'><img src='/px.gif'><iframe src='/ad'></iframe></div></noscript>"
+    padding = "".join(rng.choice((icon, script, ad)) for _ in range(rng.randint(150, 400)))
+    return html.replace("<body>", "<body>" + padding, 1)
+
+
+def measure(html, parser, strip, repeat):
+    """Best-of-N parse time plus the tracemalloc peak of one parse"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parse_html(html, parser=parser, strip=strip)
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    soup = parse_html(html, parser=parser, strip=strip)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(timings), peak, len(extract_article(soup).content)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", help="directory of saved .html pages")
+    parser.add_argument("--pages", type=int, default=20, help="synthetic pages when no corpus is given")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.corpus:
+        pages = [html for _, html, _ in load_corpus(args.corpus)]
+    else:
+        rng = random.Random(7)
+        pages = [heavy_page(rng) for _ in range(args.pages)]
+    if not pages:
+        parser.error("corpus is empty")
+
+    total_bytes = sum(len(html.encode("utf-8")) for html in pages)
+    print(f"{len(pages)} pages, {total_bytes / 1024:.0f} KiB of HTML, best of {args.repeat} runs\n")
+    print(f"{'backend':<13} {'pre-strip':<10} {'ms/page':>9} {'peak KiB/page':>14} {'chars':>9}")
+
+    baseline = None
+    for backend in available_parsers():
+        for strip in (False, True):
+            times, peaks, chars = [], [], 0
+            for html in pages:
+                elapsed, peak, extracted = measure(html, backend, strip, args.repeat)
+                times.append(elapsed)
+                peaks.append(peak)
+                chars += extracted
+            mean_ms = statistics.mean(times) * 1000
+            if backend == "html.parser" and not strip:
+                baseline = mean_ms
+            print(f"{backend:<13} {'yes' if strip else 'no':<10} {mean_ms:9.2f} "
+                  f"{statistics.mean(peaks) / 1024:14.0f} {chars:9d}")
+
+    if baseline:
+        print(f"\nbaseline is html.parser without pre-strip ({baseline:.2f} ms/page)")
+
+
+if __name__ == "__main__":
+    main()
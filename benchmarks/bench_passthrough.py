@@ -0,0 +1,79 @@
+"""
+Benchmark: frame-level passthrough vs the effects engines at speed 1.0, depth 1.
+
+Runs audio_effects.process_passthrough, process_ffmpeg and process_pydub
+on every MP3 in static/audio (or --files), starting from the file
+contents in memory. The report prints wall time per file and the
+resulting durations; passthrough only trims the edge silence, so its
+output keeps pauses inside the speech that strip_silence would shorten.
+
+Requires ffmpeg/ffprobe on PATH, like the app itself.
+
+Usage:
+    python benchmarks/bench_passthrough.py [--files a.mp3 b.mp3] [--limit 10]
+"""
+
+import argparse
+import glob
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from pydub.utils import mediainfo  # noqa: E402
+
+import audio_effects  # noqa: E402
+
+ENGINES = {
+    "passthrough": lambda data, output: audio_effects.process_passthrough(data, output),
+    "ffmpeg": lambda data, output: audio_effects.process_ffmpeg(data, output),
+    "pydub": lambda data, output: audio_effects.process_pydub(data, output),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", nargs="+", help="MP3 inputs (default: static/audio/*.mp3)")
+    parser.add_argument("--limit", type=int, default=10, help="max input files")
+    args = parser.parse_args()
+
+    files = args.files or sorted(glob.glob(os.path.join(ROOT, "static", "audio", "*.mp3")))
+    files = [f for f in files if os.path.getsize(f) > 0][:args.limit]
+    if not files:
+        parser.error("no input files")
+    inputs = []
+    for path in files:
+        with open(path, "rb") as f:
+            inputs.append(f.read())
+    total_audio = sum(float(mediainfo(f)["duration"]) for f in files)
+    print(f"{len(files)} files, {total_audio:.0f} s of audio\n")
+    print(f"{'engine':<12} {'median ms':>10} {'total s':>8} {'out s':>8} {'vs pydub':>9}")
+
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir, open(os.devnull, "w") as devnull:
+        for name, engine in ENGINES.items():
+            timings, out_duration = [], 0.0
+            for i, data in enumerate(inputs):
+                output = os.path.join(workdir, f"{name}_{i}.mp3")
+                stdout, sys.stdout = sys.stdout, devnull  # silence the engines' progress prints
+                try:
+                    start = time.perf_counter()
+                    engine(data, output)
+                    timings.append(time.perf_counter() - start)
+                finally:
+                    sys.stdout = stdout
+                out_duration += float(mediainfo(output)["duration"])
+            results[name] = (timings, out_duration)
+
+    baseline = sum(results["pydub"][0])
+    for name, (timings, out_duration) in results.items():
+        total = sum(timings)
+        print(f"{name:<12} {statistics.median(timings) * 1000:10.0f} {total:8.2f} {out_duration:8.1f} "
+              f"{baseline / total:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
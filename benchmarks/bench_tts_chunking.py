@@ -0,0 +1,117 @@
+"""
+Benchmark: single-call vs chunked concurrent edge-tts synthesis.
+
+Runs tts.synthesize_audio against a local fake backend, so no network
+or edge-tts service is involved. The fake mimics edge-tts timing: a fixed
+first-byte latency plus streaming at --rate characters per second. It
+writes a tone of the speaking duration of its text (about 15 characters
+per second). Stitching (decode, trim, concatenate, encode) runs for real,
+so its cost is included in the chunked timings.
+
+Requires ffmpeg/ffprobe on PATH, like the app itself.
+
+Usage:
+    python benchmarks/bench_tts_chunking.py [--words 3000] [--latency 0.4] [--rate 600]
+                                            [--chunk-chars 1500] [--concurrency 1 2 4 8]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pydub.generators import Sine  # noqa: E402
+
+from audio_effects import decode  # noqa: E402
+from tts import split_into_chunks, synthesize_audio  # noqa: E402
+
+SPOKEN_CHARS_PER_SECOND = 15
+
+WORDS = (
+    "government minister announced new policy economic growth market investors report "
+    "officials said week country region analysts expect increase decline council vote "
+    "energy prices climate agreement talks summit leaders security public health data"
+).split()
+
+
+def make_script(words, rng):
+    """News-like prose with sentences of 8-25 words"""
+    sentences = []
+    count = 0
+    while count < words:
+        length = rng.randint(8, 25)
+        sentence = " ".join(rng.choice(WORDS) for _ in range(length))
+        sentences.append(sentence.capitalize() + rng.choice([".", ".", ".", "?", "!"]))
+        count += length
+    return " ".join(sentences)
+
+
+class FakeCommunicateFactory:
+    """Builds Communicate-compatible classes with a given latency model"""
+
+    def __init__(self, latency, rate):
+        self.latency = latency
+        self.rate = rate
+        self.calls = 0
+        # One second of pre-encoded tone, repeated to the speaking duration of each text
+        with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as tmp:
+            path = tmp.name
+        Sine(220).to_audio_segment(duration=1000, volume=-12).set_frame_rate(24000).set_channels(1).export(
+            path, format="mp3", bitrate="48k", parameters=["-write_xing", "0", "-id3v2_version", "0"]
+        )
+        with open(path, "rb") as f:
+            self.second_of_audio = f.read()
+        os.remove(path)
+
+    def __call__(self, text, voice_id):
+        factory = self
+
+        class FakeCommunicate:
+            async def stream(self):
+                factory.calls += 1
+                await asyncio.sleep(factory.latency + len(text) / factory.rate)
+                seconds = max(1, round(len(text) / SPOKEN_CHARS_PER_SECOND))
+                yield {"type": "audio", "data": factory.second_of_audio * seconds}
+
+        return FakeCommunicate()
+
+
+def run(script, factory, max_chars, concurrency):
+    calls = factory.calls
+    start = time.perf_counter()
+    audio = asyncio.run(synthesize_audio(script, "fake-voice", communicate_cls=factory,
+                                         max_chars=max_chars, concurrency=concurrency))
+    elapsed = time.perf_counter() - start
+    return elapsed, factory.calls - calls, len(decode(audio)) / 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--words", type=int, default=3000)
+    parser.add_argument("--latency", type=float, default=0.4, help="fake first-byte latency per call, seconds")
+    parser.add_argument("--rate", type=float, default=600, help="fake synthesis speed, characters per second")
+    parser.add_argument("--chunk-chars", type=int, default=1500)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    script = make_script(args.words, random.Random(3))
+    factory = FakeCommunicateFactory(args.latency, args.rate)
+    planned = len(split_into_chunks(script, args.chunk_chars))
+    print(f"{args.words} words, {len(script)} chars, {planned} chunks of <= {args.chunk_chars} chars; "
+          f"fake backend {args.latency}s + {args.rate:.0f} chars/s\n")
+    print(f"{'mode':<22} {'chunks':>6} {'wall s':>8} {'audio s':>8} {'speedup':>8}")
+
+    single, _, audio = run(script, factory, 0, 1)
+    print(f"{'single call':<22} {1:6d} {single:8.2f} {audio:8.1f} {1:8.2f}x")
+    for concurrency in args.concurrency:
+        elapsed, chunks, audio = run(script, factory, args.chunk_chars, concurrency)
+        print(f"{f'chunked, {concurrency} at a time':<22} {chunks:6d} {elapsed:8.2f} {audio:8.1f} "
+              f"{single / elapsed:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+import atexit
+import json
+import os
+import tempfile
+import threading
+import time
+from urllib.parse import urlsplit
+
+
+def rule_domain(url):
+    """
+    Publisher domain used to key extraction rules
+
+    Args:
+        url (str): Article URL
+
+    Returns:
+        str: Lowercased host without a leading "www."
+    """
+    host = (urlsplit(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+class DomainRuleIndex:
+    """
+    Per-domain memory of which CSS selector located the article body.
+
+    Rules are learned from successful scored extractions and tried first on
+    later fetches from the same domain. Every hit raises a rule's confidence,
+    every miss halves it, and a rule that falls below `min_confidence` is
+    dropped until the domain is learned again. The index is persisted to a
+    JSON file; saves are debounced and merged with the file's current
+    contents so several gunicorn workers can share it. A dropped rule leaves
+    a tombstone behind, so the merge can't bring back a copy another worker
+    still has on disk; tombstones are forgotten after TOMBSTONE_TTL.
+    """
+
+    INITIAL_CONFIDENCE = 0.5
+    HIT_BOOST = 0.1
+    RELEARN_BOOST = 0.25
+    MISS_DECAY = 0.5
+    TOMBSTONE_TTL = 7 * 24 * 3600  # seconds a dropped rule is remembered as dropped
+
+    def __init__(self, path, min_confidence=0.3, save_interval=30):
+        """
+        Args:
+            path (str): JSON file holding the rules (created if missing)
+            min_confidence (float): Rules that fall below this are dropped
+            save_interval (float): Minimum seconds between writes of the file
+        """
+        self.path = path
+        self.min_confidence = min_confidence
+        self.save_interval = save_interval
+        self._lock = threading.Lock()
+        self._rules = self._load()
+        self._dirty = False
+        self._last_save = time.time()
+        self._counters = {
+            "lookups": 0,
+            "rule_hits": 0,
+            "rule_misses": 0,
+            "learned": 0,
+        }
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        atexit.register(self.save)
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                rules = json.load(f)
+            return rules if isinstance(rules, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            print(f"Could not load extraction rules from {self.path}: {e}")
+            return {}
+
+    def lookup(self, domain):
+        """
+        Selector to try first for a domain
+
+        Args:
+            domain (str): Publisher domain (see rule_domain)
+
+        Returns:
+            str: CSS selector, or None if there is no confident rule
+        """
+        with self._lock:
+            self._counters["lookups"] += 1
+            rule = self._rules.get(domain)
+            if rule and not rule.get("deleted") and rule["confidence"] >= self.min_confidence:
+                return rule["selector"]
+        return None
+
+    def record_hit(self, domain):
+        """The remembered selector produced a good extraction"""
+        with self._lock:
+            self._counters["rule_hits"] += 1
+            rule = self._rules.get(domain)
+            if rule and not rule.get("deleted"):
+                rule["hits"] += 1
+                rule["confidence"] = min(1.0, rule["confidence"] + self.HIT_BOOST)
+                rule["updated_at"] = time.time()
+                self._dirty = True
+        self._maybe_save()
+
+    def record_miss(self, domain):
+        """The remembered selector found nothing useful; decay its confidence"""
+        with self._lock:
+            self._counters["rule_misses"] += 1
+            rule = self._rules.get(domain)
+            if rule and not rule.get("deleted"):
+                rule["misses"] += 1
+                rule["confidence"] *= self.MISS_DECAY
+                rule["updated_at"] = time.time()
+                if rule["confidence"] < self.min_confidence:
+                    self._rules[domain] = {"deleted": True, "updated_at": rule["updated_at"]}
+                self._dirty = True
+        self._maybe_save()
+
+    def learn(self, domain, selector):
+        """
+        Remember the selector of a successful full extraction
+
+        Re-learning the current selector reinforces it; a different selector
+        replaces the rule.
+        """
+        if not domain or not selector:
+            return
+        with self._lock:
+            self._counters["learned"] += 1
+            rule = self._rules.get(domain)
+            if rule and rule.get("selector") == selector:
+                rule["confidence"] = min(1.0, rule["confidence"] + self.RELEARN_BOOST)
+            else:
+                rule = {
+                    "selector": selector,
+                    "confidence": self.INITIAL_CONFIDENCE,
+                    "hits": 0,
+                    "misses": 0,
+                }
+                self._rules[domain] = rule
+            rule["updated_at"] = time.time()
+            self._dirty = True
+        self._maybe_save()
+
+    def _maybe_save(self):
+        if self._dirty and time.time() - self._last_save >= self.save_interval:
+            self.save()
+
+    def save(self):
+        """Merge with the file on disk (newest rule or tombstone per domain wins) and write it atomically"""
+        with self._lock:
+            if not self._dirty:
+                return
+            merged = self._load()
+            for domain, rule in self._rules.items():
+                current = merged.get(domain)
+                if current is None or current.get("updated_at", 0) <= rule["updated_at"]:
+                    merged[domain] = rule
+            expired = time.time() - self.TOMBSTONE_TTL
+            merged = {
+                domain: rule for domain, rule in merged.items()
+                if not (rule.get("deleted") and rule.get("updated_at", 0) < expired)
+            }
+            try:
+                fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.path)), suffix=".tmp")
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(merged, f, indent=1, sort_keys=True)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                print(f"Could not save extraction rules to {self.path}: {e}")
+                return
+            self._rules = merged
+            self._dirty = False
+            self._last_save = time.time()
+
+    def stats(self):
+        """
+        Snapshot of rule usage
+
+        Returns:
+            dict: lookups, rule_hits, rule_misses, learned, hit_rate and domains
+        """
+        with self._lock:
+            stats = dict(self._counters)
+            stats["domains"] = sum(1 for rule in self._rules.values() if not rule.get("deleted"))
+        tried = stats["rule_hits"] + stats["rule_misses"]
+        stats["hit_rate"] = stats["rule_hits"] / tried if tried else 0.0
+        return stats
@@ -1,20 +1,640 @@
 import requests
 import os
+import codecs
+import json
+import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from article_cache import ArticleCache, normalize_url
+from article_extractor import MIN_CONTENT_LENGTH, extract_article, extract_with_selector, parse_html, selector_for
+from extraction_rules import DomainRuleIndex, rule_domain
+from news_cache import NOT_MODIFIED, TTLCache, Validated
+from news_quota import DailyQuota
 
 # Load environment variables
 load_dotenv()
 
+# Matched against the first bytes of a page that didn't declare a charset in its headers
+META_CHARSET_PATTERN = re.compile(rb"""<meta[^>]+charset=["']?([a-zA-Z0-9_\-:.]+)""", re.IGNORECASE)
+# A whole tag (only matched once its ">" has arrived) or the start of a comment
+TAG_PATTERN = re.compile(r"<!--|<(/?)([a-zA-Z][a-zA-Z0-9]*)([^>]*)>")
+# Ends of elements whose text is not markup
+RAW_TEXT_END = {
+    "script": re.compile(r"</script\s*>", re.IGNORECASE),
+    "style": re.compile(r"</style\s*>", re.IGNORECASE),
+}
+# The shapes selector_for produces: tag, tag#id or tag.class[.class]
+SIMPLE_SELECTOR_PATTERN = re.compile(r"^([a-zA-Z][a-zA-Z0-9]*)(?:#([\w-]+)|((?:\.[\w-]+)+))?$")
+CONTAINER_TAGS = ("article", "main")
+CHARSET_SNIFF_BYTES = 4096
+STREAM_CHUNK_SIZE = 16384
+MIN_CONTAINER_PARAGRAPHS = 3  # a closed container smaller than this is probably a teaser
+MAX_TAG_CARRY = 4096  # longest unfinished tag held over to the next chunk
+
+DEFAULT_ARTICLE_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'articles.sqlite3')
+DEFAULT_QUOTA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'gnews_quota.sqlite3')
+DEFAULT_EXTRACTION_RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'extraction_rules.json')
+
+
+def _env_int(name, default):
+    """Read an integer setting from the environment, falling back to default"""
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _env_float(name, default):
+    """Read a float setting from the environment, falling back to default"""
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _parse_host_pool_sizes(value):
+    """
+    Parse a "host=size,host=size" string into a dict
+
+    Args:
+        value (str): e.g. "gnews.io=20,www.bbc.com=4"
+
+    Returns:
+        dict: Host name -> pool size
+    """
+    sizes = {}
+    for item in (value or "").split(","):
+        host, _, size = item.partition("=")
+        host = host.strip().lower()
+        if host and size.strip().isdigit():
+            sizes[host] = int(size.strip())
+    return sizes
+
+
+class PooledSession:
+    """
+    Keep-alive HTTP session shared by the Flask request threads and the background job threads.
+
+    A requests.Session holds cookies and other mutable state, so each thread
+    gets its own lightweight Session. All of them mount the same HTTPAdapter
+    instances, which means they share one urllib3 connection pool per host
+    and reuse TCP/TLS connections instead of handshaking on every call.
+
+    Requests are retried by default. get(..., retry=False) goes through a
+    separate no-retry adapter instead, for callers such as article downloads
+    that run under their own deadline.
+    """
+
+    def __init__(self, pool_connections=10, pool_maxsize=10, host_pool_sizes=None,
+                 connect_timeout=3.05, read_timeout=10, max_retries=2, backoff_factor=0.3):
+        """
+        Args:
+            pool_connections (int): Number of per-host pools to keep around
+            pool_maxsize (int): Max keep-alive connections per host
+            host_pool_sizes (dict): Per-host overrides of pool_maxsize, e.g. {"gnews.io": 20}
+            connect_timeout (float): Seconds to wait for a connection
+            read_timeout (float): Seconds to wait between bytes from the server
+            max_retries (int): Retry budget per request (connect, read and 5xx errors)
+            backoff_factor (float): Exponential backoff base between retries, in seconds
+        """
+        self.timeout = (connect_timeout, read_timeout)
+        self._retry = Retry(
+            total=max_retries,
+            connect=max_retries,
+            read=max_retries,
+            status=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(500, 502, 503, 504),
+            allowed_methods=frozenset(["GET", "HEAD"]),
+            raise_on_status=False,
+        )
+        self._default_adapter = self._make_adapter(pool_connections, pool_maxsize)
+        self._host_adapters = {
+            host: self._make_adapter(1, size)
+            for host, size in (host_pool_sizes or {}).items()
+        }
+        self._no_retry_adapter = self._make_adapter(pool_connections, pool_maxsize, max_retries=0)
+        self._local = threading.local()
+
+    @classmethod
+    def from_env(cls):
+        """Build a session from HTTP_* environment variables"""
+        return cls(
+            pool_connections=_env_int("HTTP_POOL_CONNECTIONS", 10),
+            pool_maxsize=_env_int("HTTP_POOL_MAXSIZE", 10),
+            host_pool_sizes=_parse_host_pool_sizes(os.getenv("HTTP_POOL_HOST_SIZES", "")),
+            connect_timeout=_env_float("HTTP_CONNECT_TIMEOUT", 3.05),
+            read_timeout=_env_float("HTTP_READ_TIMEOUT", 10),
+            max_retries=_env_int("HTTP_MAX_RETRIES", 2),
+            backoff_factor=_env_float("HTTP_BACKOFF_FACTOR", 0.3),
+        )
+
+    def _make_adapter(self, pool_connections, pool_maxsize, max_retries=None):
+        return HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=self._retry if max_retries is None else max_retries,
+        )
+
+    @property
+    def session(self):
+        """The calling thread's Session, created on first use"""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.mount("https://", self._default_adapter)
+            session.mount("http://", self._default_adapter)
+            # Longer prefixes win, so host overrides take precedence
+            for host, adapter in self._host_adapters.items():
+                session.mount(f"https://{host}/", adapter)
+                session.mount(f"http://{host}/", adapter)
+            self._local.session = session
+        return session
+
+    @property
+    def no_retry_session(self):
+        """The calling thread's Session that never retries, created on first use"""
+        session = getattr(self._local, "no_retry_session", None)
+        if session is None:
+            session = requests.Session()
+            session.mount("https://", self._no_retry_adapter)
+            session.mount("http://", self._no_retry_adapter)
+            self._local.no_retry_session = session
+        return session
+
+    def get(self, url, retry=True, **kwargs):
+        """
+        Send a GET through the shared pool, applying the default timeouts
+
+        Args:
+            url (str): URL to fetch
+            retry (bool): Retry connect, read and 5xx errors; pass False when the caller enforces its own deadline
+            **kwargs: Passed on to requests.Session.get
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        session = self.session if retry else self.no_retry_session
+        return session.get(url, **kwargs)
+
+    def close(self):
+        """Close every pooled connection"""
+        self._default_adapter.close()
+        self._no_retry_adapter.close()
+        for adapter in self._host_adapters.values():
+            adapter.close()
+
+
+def _declared_charset(response):
+    """Charset parameter of the Content-Type header, if any"""
+    content_type = response.headers.get("Content-Type", "")
+    for param in content_type.split(";")[1:]:
+        key, _, value = param.strip().partition("=")
+        if key.lower() == "charset" and value:
+            return value.strip("\"' ")
+    return None
+
+
+def _make_decoder(charset):
+    try:
+        return codecs.getincrementaldecoder(charset)(errors="replace")
+    except (LookupError, TypeError):
+        return codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+
+def _attribute(attrs, name):
+    """Value of one attribute in the raw text of a start tag, or None"""
+    match = re.search(rf"""(?:^|\s){name}\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))""", attrs, re.IGNORECASE)
+    if match is None:
+        return None
+    return next(group for group in match.groups() if group is not None)
+
+
+class _ContainerWatch:
+    """
+    Spots the end of the article container in HTML that arrives in pieces.
+
+    With a learned selector (from the domain's extraction rule), only the
+    element it names counts. Without one, any top-level <article>/<main>
+    counts. Either way the container must hold MIN_CONTAINER_PARAGRAPHS
+    paragraphs of its own, so teaser cards and "related" boxes don't end the
+    download. Script, style and comment text is skipped, and a tag split
+    across chunks is only looked at once it is complete.
+    """
+
+    def __init__(self, selector=None):
+        match = SIMPLE_SELECTOR_PATTERN.match(selector or "")
+        if match:
+            tag, element_id, classes = match.groups()
+            self.target = (tag.lower(), element_id, (classes or "").split(".")[1:])
+        else:
+            self.target = None
+        self.carry = ""  # unfinished tag (or comment terminator) from the previous chunk
+        self.raw_tag = None  # inside <script>/<style>
+        self.in_comment = False
+        self.depth = 0  # open <article>/<main> elements
+        self.paragraphs = 0  # paragraphs in the current top-level container
+        self.open_targets = 0  # open elements with the target's tag name
+        self.target_level = None  # open_targets value of the element the selector matched
+        self.target_paragraphs = 0
+
+    def feed(self, text):
+        """
+        Scan the next piece of the page
+
+        Returns:
+            bool: True once the article container has closed
+        """
+        text = self.carry + text
+        self.carry = ""
+        pos = 0
+        while True:
+            if self.in_comment:
+                end = text.find("-->", pos)
+                if end < 0:
+                    self.carry = text[-2:]
+                    return False
+                pos, self.in_comment = end + 3, False
+            elif self.raw_tag:
+                end = RAW_TEXT_END[self.raw_tag].search(text, pos)
+                if end is None:
+                    break
+                pos, self.raw_tag = end.end(), None
+            else:
+                match = TAG_PATTERN.search(text, pos)
+                if match is None:
+                    break
+                pos = match.end()
+                if match.group(0) == "<!--":
+                    self.in_comment = True
+                elif self._tag(bool(match.group(1)), match.group(2).lower(), match.group(3)):
+                    return True
+        start = text.rfind("<", pos)
+        if start >= 0 and len(text) - start <= MAX_TAG_CARRY:
+            self.carry = text[start:]
+        return False
+
+    def _matches_target(self, attrs):
+        _, element_id, classes = self.target
+        if element_id:
+            return _attribute(attrs, "id") == element_id
+        present = (_attribute(attrs, "class") or "").split()
+        return all(name in present for name in classes)
+
+    def _tag(self, closing, name, attrs):
+        """Account for one tag; True if it closed the article container"""
+        if name in RAW_TEXT_END:
+            self.raw_tag = None if closing else name
+            return False
+        if name == "p" and not closing:
+            self.paragraphs += self.depth > 0
+            self.target_paragraphs += self.target_level is not None
+
+        if self.target is not None:
+            if name != self.target[0] or attrs.rstrip().endswith("/"):
+                return False
+            if not closing:
+                self.open_targets += 1
+                if self.target_level is None and self._matches_target(attrs):
+                    self.target_level, self.target_paragraphs = self.open_targets, 0
+                return False
+            if self.target_level == self.open_targets:
+                if self.target_paragraphs >= MIN_CONTAINER_PARAGRAPHS:
+                    return True
+                self.target_level = None  # too small to be the story; look for the next match
+            self.open_targets = max(self.open_targets - 1, 0)
+            return False
+
+        if name not in CONTAINER_TAGS:
+            return False
+        if not closing:
+            self.depth += 1
+            return False
+        self.depth = max(self.depth - 1, 0)
+        if self.depth:
+            return False
+        closed, self.paragraphs = self.paragraphs, 0
+        return closed >= MIN_CONTAINER_PARAGRAPHS
+
+
+def read_body_bounded(response, max_bytes, deadline, stop_at_container=True, selector=None):
+    """
+    Stream a response body with a byte budget and a deadline
+
+    The body is decoded incrementally with the declared charset (or one sniffed
+    from a <meta> tag). Reading stops at EOF, once max_bytes have arrived, once
+    the deadline passes, or, if stop_at_container is set, once the article
+    container has closed (see _ContainerWatch).
+
+    Args:
+        response (requests.Response): Response opened with stream=True
+        max_bytes (int): Maximum number of (decompressed) bytes to read
+        deadline (float): time.monotonic() value after which reading stops
+        stop_at_container (bool): Stop as soon as the article container has closed
+        selector (str): The domain's learned container selector, if any
+
+    Returns:
+        tuple: (text, bytes_read, truncation_reason) where truncation_reason is
+        None when the whole body was read, else "article_closed", "max_bytes" or "deadline"
+    """
+    raw = response.raw
+    read1 = getattr(raw, "read1", None)  # urllib3 >= 2: returns as soon as any data arrives
+    chunks = None if read1 else response.iter_content(STREAM_CHUNK_SIZE)
+
+    charset = _declared_charset(response)
+    decoder = _make_decoder(charset) if charset else None
+    pending = b""  # bytes held back until the charset is known
+    parts = []
+    bytes_read = 0
+    watch = _ContainerWatch(selector) if stop_at_container else None
+    reason = None
+
+    while True:
+        if time.monotonic() >= deadline:
+            reason = "deadline"
+            break
+        chunk = read1(STREAM_CHUNK_SIZE, decode_content=True) if read1 else next(chunks, b"")
+        if not chunk:
+            break
+        bytes_read += len(chunk)
+
+        if decoder is None:
+            pending += chunk
+            if len(pending) < CHARSET_SNIFF_BYTES:
+                continue
+            match = META_CHARSET_PATTERN.search(pending)
+            decoder = _make_decoder(match.group(1).decode("ascii") if match else "utf-8")
+            chunk, pending = pending, b""
+
+        text = decoder.decode(chunk)
+        parts.append(text)
+
+        if watch is not None and watch.feed(text):
+            reason = "article_closed"
+            break
+
+        if bytes_read >= max_bytes:
+            reason = "max_bytes"
+            break
+
+    if decoder is None:
+        match = META_CHARSET_PATTERN.search(pending)
+        decoder = _make_decoder(match.group(1).decode("ascii") if match else "utf-8")
+        parts.append(decoder.decode(pending))
+    parts.append(decoder.decode(b"", final=True))
+    return "".join(parts), bytes_read, reason
+
+
+class _InFlightCall:
+    """Result slot shared by every caller waiting on one upstream call"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent identical upstream calls.
+
+    The first caller for a key runs the function; callers arriving while it
+    is still in flight block until it finishes and share its result. If the
+    call raises, every waiter gets the same exception.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._counters = {
+            "calls": 0,
+            "executions": 0,
+            "coalesced": 0,
+            "errors": 0,
+        }
+
+    def do(self, key, fn):
+        """
+        Run fn() once per key at a time
+
+        Args:
+            key (hashable): Identifies identical calls
+            fn (callable): Zero-argument function doing the upstream work
+
+        Returns:
+            The result of fn(), shared with concurrent callers
+        """
+        with self._lock:
+            self._counters["calls"] += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _InFlightCall()
+                self._calls[key] = call
+                self._counters["executions"] += 1
+            else:
+                self._counters["coalesced"] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            with self._lock:
+                self._counters["errors"] += 1
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self):
+        """
+        Snapshot of the coalescing counters
+
+        Returns:
+            dict: calls, executions, coalesced, errors and in_flight
+        """
+        with self._lock:
+            stats = dict(self._counters)
+            stats["in_flight"] = len(self._calls)
+        return stats
+
+
 class GNewsClient:
     """Client for interacting with the GNews API"""
     
-    def __init__(self):
+    def __init__(self, http=None, results_cache=None, article_cache=None, extraction_rules=None, quota=None):
+        """
+        Args:
+            http (PooledSession): Optional session to share; one is built from the environment otherwise
+            results_cache (TTLCache): Optional cache for headline/search results; built from NEWS_CACHE_* otherwise
+            article_cache (ArticleCache): Optional persistent article cache; built from ARTICLE_CACHE_* otherwise
+            extraction_rules (DomainRuleIndex): Optional per-domain selector index; built from EXTRACTION_RULES_PATH otherwise
+            quota (DailyQuota): Optional GNews request budget; built from GNEWS_DAILY_QUOTA/GNEWS_QUOTA_* otherwise
+        """
         self.api_key = os.getenv('GNEWS_API_KEY')
         if not self.api_key:
             raise ValueError("GNEWS_API_KEY not found in environment variables")
         
         self.base_url = "https://gnews.io/api/v4"
+        self.http = http or PooledSession.from_env()
+        self.results_cache = results_cache or TTLCache(
+            ttl=_env_float("NEWS_CACHE_TTL", 300),
+            stale_ttl=_env_float("NEWS_CACHE_STALE_TTL", 3600),
+            max_entries=_env_int("NEWS_CACHE_MAX_ENTRIES", 256),
+        )
+        self.single_flight = SingleFlight()
+        self.quota = quota
+        if self.quota is None:
+            # Set GNEWS_DAILY_QUOTA to 0 to disable budget accounting
+            daily_limit = _env_int("GNEWS_DAILY_QUOTA", 100)
+            if daily_limit > 0:
+                self.quota = DailyQuota(
+                    os.getenv("GNEWS_QUOTA_PATH") or DEFAULT_QUOTA_PATH,
+                    daily_limit=daily_limit,
+                    burst=_env_int("GNEWS_QUOTA_BURST", 10),
+                    reserve=_env_int("GNEWS_QUOTA_RESERVE", 5),
+                )
+        self.article_cache = article_cache
+        if self.article_cache is None:
+            # Set ARTICLE_CACHE_PATH to an empty string to disable the cache
+            cache_path = os.getenv("ARTICLE_CACHE_PATH", DEFAULT_ARTICLE_CACHE_PATH)
+            if cache_path:
+                self.article_cache = ArticleCache(
+                    cache_path,
+                    max_bytes=_env_int("ARTICLE_CACHE_MAX_BYTES", 200 * 1024 * 1024),
+                    negative_ttl=_env_float("ARTICLE_CACHE_NEGATIVE_TTL", 300),
+                    transient_ttl=_env_float("ARTICLE_CACHE_TRANSIENT_TTL", 15),
+                )
+        self.extraction_rules = extraction_rules
+        if self.extraction_rules is None:
+            # Set EXTRACTION_RULES_PATH to an empty string to disable learned rules
+            rules_path = os.getenv("EXTRACTION_RULES_PATH", DEFAULT_EXTRACTION_RULES_PATH)
+            if rules_path:
+                self.extraction_rules = DomainRuleIndex(rules_path)
+        # Shared by every batch so the concurrency limit holds across requests
+        self.batch_executor = ThreadPoolExecutor(
+            max_workers=_env_int("ARTICLE_BATCH_CONCURRENCY", 8),
+            thread_name_prefix="article-fetch",
+        )
+        self.batch_url_timeout = _env_float("ARTICLE_BATCH_URL_TIMEOUT", 8)
+        self.batch_timeout = _env_float("ARTICLE_BATCH_TIMEOUT", 15)
+        self.article_max_bytes = _env_int("ARTICLE_MAX_BYTES", 2 * 1024 * 1024)
+        self.article_deadline = _env_float("ARTICLE_FETCH_DEADLINE", 15)
+        # Cached articles with validators older than this are revalidated with a conditional GET (0 disables)
+        self.article_revalidate_after = _env_float("ARTICLE_REVALIDATE_AFTER", 6 * 3600)
+        self._revalidation_lock = threading.Lock()
+        self._revalidation = {
+            "headlines_not_modified": 0,
+            "headlines_modified": 0,
+            "articles_not_modified": 0,
+            "articles_modified": 0,
+            "bytes_saved": 0,
+        }
+
+    def get_metrics(self):
+        """
+        Collect cache and upstream metrics for monitoring
+
+        Returns:
+            dict: Metrics grouped by component
+        """
+        return {
+            "results_cache": self.results_cache.stats(),
+            "single_flight": self.single_flight.stats(),
+            "quota": self.quota.stats() if self.quota else None,
+            "article_cache": self.article_cache.stats() if self.article_cache else None,
+            "extraction_rules": self.extraction_rules.stats() if self.extraction_rules else None,
+            "revalidation": self._revalidation_stats(),
+        }
+
+    def _revalidation_stats(self):
+        with self._revalidation_lock:
+            return dict(self._revalidation)
+
+    def _count_revalidation(self, kind, modified, bytes_saved=0):
+        """Record the outcome of a conditional GET (kind is "headlines" or "articles")"""
+        with self._revalidation_lock:
+            self._revalidation[f"{kind}_{'modified' if modified else 'not_modified'}"] += 1
+            self._revalidation["bytes_saved"] += bytes_saved or 0
+
+    @staticmethod
+    def _conditional_headers(validators):
+        """If-None-Match/If-Modified-Since headers for stored validators"""
+        headers = {}
+        if validators:
+            if validators.get("etag"):
+                headers["If-None-Match"] = validators["etag"]
+            if validators.get("last_modified"):
+                headers["If-Modified-Since"] = validators["last_modified"]
+        return headers
+
+    @staticmethod
+    def _response_validators(response, size):
+        """ETag/Last-Modified of a response plus its body size, or {} if it has neither"""
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return {}
+        return {"etag": etag, "last_modified": last_modified, "size": size}
+
+    def _get_json(self, endpoint, params, action, validators=None):
+        """
+        GET a GNews endpoint and decode the JSON body
+
+        Args:
+            endpoint (str): Full endpoint URL
+            params (dict): Query parameters
+            action (str): Description used in the error log
+            validators (dict): Validators of the cached response, to make the request conditional
+
+        Returns:
+            dict: JSON response (wrapped in Validated when the response carries validators),
+            NOT_MODIFIED on a 304, or {"articles": [], "error": ...} on failure
+        """
+        if self.quota and not self.quota.try_acquire():
+            print(f"Skipped {action}: GNews daily quota exhausted")
+            return {"articles": [], "error": "GNews daily request quota exhausted, try again later"}
+
+        try:
+            response = self.http.get(endpoint, params=params, headers=self._conditional_headers(validators))
+            if validators and response.status_code == 304:
+                self._count_revalidation("headlines", modified=False, bytes_saved=validators.get("size"))
+                return NOT_MODIFIED
+            response.raise_for_status()  # Raise exception for error status codes
+            if validators:
+                self._count_revalidation("headlines", modified=True)
+            data = response.json()
+            page_validators = self._response_validators(response, len(response.content))
+            return Validated(data, page_validators) if page_validators else data
+        except requests.exceptions.RequestException as e:
+            print(f"Error {action}: {e}")
+            return {"articles": [], "error": str(e)}
+
+    @staticmethod
+    def _flight_key(cache_key, validators):
+        """Single-flight key of a load: conditional revalidations never share a call with plain loads"""
+        return (cache_key, "conditional" if validators else "full")
+
+    def _quota_low(self):
+        """Whether to serve cached results as-is rather than spend GNews budget refreshing them"""
+        return bool(self.quota) and self.quota.is_low()
+
+    @staticmethod
+    def _is_cacheable(result):
+        """Only successful API responses are worth caching"""
+        return isinstance(result, dict) and "error" not in result
     
     def get_top_headlines(self, category=None, language="en", country="us", max_results=10, query=None):
         """
@@ -44,13 +664,16 @@ class GNewsClient:
         if query:
             params["q"] = query
         
-        try:
-            response = requests.get(endpoint, params=params)
-            response.raise_for_status()  # Raise exception for error status codes
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching top headlines: {e}")
-            return {"articles": [], "error": str(e)}
+        cache_key = ("top-headlines", category, language, country, max_results, query)
+        return self.results_cache.get_or_load(
+            cache_key,
+            lambda validators: self.single_flight.do(
+                self._flight_key(cache_key, validators),
+                lambda: self._get_json(endpoint, params, "fetching top headlines", validators),
+            ),
+            should_cache=self._is_cacheable,
+            prefer_stale=self._quota_low,  # only consulted for outdated entries
+        )
     
     def search_news(self, query, language="en", country="us", max_results=10, from_date=None, to_date=None):
         """
@@ -82,24 +705,187 @@ class GNewsClient:
         if to_date:
             params["to"] = to_date
         
-        try:
-            response = requests.get(endpoint, params=params)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            print(f"Error searching news: {e}")
-            return {"articles": [], "error": str(e)}
+        cache_key = ("search", query, language, country, max_results, from_date, to_date)
+        return self.results_cache.get_or_load(
+            cache_key,
+            lambda validators: self.single_flight.do(
+                self._flight_key(cache_key, validators),
+                lambda: self._get_json(endpoint, params, "searching news", validators),
+            ),
+            should_cache=self._is_cacheable,
+            prefer_stale=self._quota_low,  # only consulted for outdated entries
+        )
 
-    def fetch_article_content(self, url):
+    def fetch_article_content(self, url, timeout=None):
         """
         Fetch and extract content from a news article
         
+        Results are served from the persistent article cache when possible
+        (revalidated with a conditional GET once ARTICLE_REVALIDATE_AFTER has
+        passed), and concurrent requests for the same URL share a single
+        download and parse.
+        
         Args:
             url (str): URL of the article
+            timeout (float): Optional read timeout for the download, in seconds
             
         Returns:
             dict: Article content with title, text, and metadata
         """
+        url_key = normalize_url(url)
+        if self.article_cache:
+            entry = self.article_cache.lookup(url_key)
+            if entry is not None:
+                if not self._needs_revalidation(entry):
+                    return entry.result
+                result = self.single_flight.do(
+                    ("article", url_key), lambda: self._revalidate_article(url, url_key, entry, timeout)
+                )
+                return dict(result)
+
+        result = self.single_flight.do(
+            ("article", url_key), lambda: self._fetch_and_cache_article(url, url_key, timeout)
+        )
+        # Every waiter gets its own copy since callers annotate the result
+        return dict(result)
+
+    def iter_articles_content(self, urls, url_timeout=None, timeout=None):
+        """
+        Fetch and extract several articles concurrently, yielding each as it completes
+        
+        Concurrency is bounded by the shared batch executor. URLs that miss their
+        own deadline or the overall deadline are yielded as timed out; their
+        downloads finish in the background and still populate the caches.
+        
+        Args:
+            urls (list): Article URLs
+            url_timeout (float): Per-URL deadline in seconds (defaults to ARTICLE_BATCH_URL_TIMEOUT)
+            timeout (float): Overall deadline in seconds (defaults to ARTICLE_BATCH_TIMEOUT)
+            
+        Yields:
+            tuple: (url, result dict) in completion order
+        """
+        url_timeout = url_timeout or self.batch_url_timeout
+        deadline = time.monotonic() + (timeout or self.batch_timeout)
+        started = {}  # url -> monotonic time a worker picked it up
+
+        def run(url):
+            started[url] = time.monotonic()
+            return self.fetch_article_content(url, timeout=url_timeout)
+
+        pending = {self.batch_executor.submit(run, url): url for url in dict.fromkeys(urls)}
+
+        while pending:
+            now = time.monotonic()
+            if now >= deadline:
+                break
+
+            # Give up on fetches that overran their own deadline
+            for future, url in list(pending.items()):
+                if url in started and now - started[url] >= url_timeout and not future.done():
+                    del pending[future]
+                    yield url, self._batch_timeout_result(url, "Timed out waiting for the article")
+
+            # Sleep until the next completion, per-URL deadline or overall deadline
+            wake_at = min([deadline] + [started[url] + url_timeout for url in pending.values() if url in started])
+            done, _ = wait(pending, timeout=max(0, wake_at - now), return_when=FIRST_COMPLETED)
+            for future in done:
+                url = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {"title": "Content Extraction Failed", "content": "", "url": url, "error": str(e)}
+                yield url, result
+
+        for future, url in pending.items():
+            future.cancel()  # no-op for fetches that are already running
+            yield url, self._batch_timeout_result(url, "Timed out waiting for the batch deadline")
+
+    @staticmethod
+    def _batch_timeout_result(url, message):
+        """Placeholder result for a URL that missed its deadline"""
+        return {
+            "title": "Content Extraction Failed",
+            "content": "",
+            "url": url,
+            "error": message,
+            "timed_out": True,
+        }
+
+    def fetch_articles_content(self, urls, url_timeout=None, timeout=None):
+        """
+        Fetch and extract several articles concurrently
+        
+        Wall time is roughly that of the slowest article rather than the sum.
+        
+        Args:
+            urls (list): Article URLs
+            url_timeout (float): Per-URL deadline in seconds
+            timeout (float): Overall deadline in seconds
+            
+        Returns:
+            dict: Results keyed by URL (timed-out URLs carry "timed_out": True)
+        """
+        return dict(self.iter_articles_content(urls, url_timeout=url_timeout, timeout=timeout))
+
+    def _needs_revalidation(self, entry):
+        """Whether a cached article is due for a conditional GET"""
+        return (
+            self.article_revalidate_after > 0
+            and "extraction_time" in entry.result
+            and bool(entry.etag or entry.last_modified)
+            and time.time() - entry.validated_at >= self.article_revalidate_after
+        )
+
+    def _revalidate_article(self, url, url_key, entry, timeout=None):
+        """
+        Revalidate a cached article with If-None-Match/If-Modified-Since
+        
+        A 304 only restarts the entry's revalidation clock; a 200 is extracted
+        and replaces the entry. If the origin errors, the cached copy is kept.
+        """
+        validators = {"etag": entry.etag, "last_modified": entry.last_modified}
+        outcome = self._fetch_article_content(url, timeout, validators=validators)
+        if outcome is NOT_MODIFIED:
+            self.article_cache.mark_validated(url_key)
+            self._count_revalidation("articles", modified=False, bytes_saved=entry.raw_bytes)
+            return entry.result
+
+        result, _ = outcome
+        if "error" in result or "extraction_error" in result:
+            return entry.result
+        self._count_revalidation("articles", modified=True)
+        return self._cache_article(url_key, outcome)
+
+    def _fetch_and_cache_article(self, url, url_key, timeout=None):
+        """Extract an article and record the outcome (including failures) in the article cache"""
+        return self._cache_article(url_key, self._fetch_article_content(url, timeout))
+
+    def _cache_article(self, url_key, outcome):
+        """Store a Validated(result, validators) from _fetch_article_content and return the result"""
+        result, validators = outcome
+        # A download cut short by the clock may just have been unlucky; retry it next time
+        if self.article_cache and result.get("truncation_reason") != "deadline":
+            self.article_cache.put(url_key, result, validators)
+        return result
+
+    def _fetch_article_content(self, url, timeout=None, validators=None):
+        """
+        Download and extract an article, bypassing the coalescing layer
+        
+        The body is streamed under a byte budget and a deadline, and reading
+        stops once the article container has closed. Results of a download
+        cut short carry "truncated": True and a "truncation_reason".
+        
+        Args:
+            url (str): URL of the article
+            timeout (float): Optional deadline for the whole download, in seconds
+            validators (dict): Cached "etag"/"last_modified" to send as a conditional GET
+            
+        Returns:
+            Validated: The article dict (title, content, metadata) and the page's
+            validators ({} if none), or NOT_MODIFIED if a conditional GET got a 304
+        """
         try:
             # Set user agent and headers to avoid 406 errors
             headers = {
@@ -108,175 +894,120 @@ class GNewsClient:
                 'Accept-Language': 'en-US,en;q=0.5',
                 'Connection': 'keep-alive',
                 'Upgrade-Insecure-Requests': '1',
-                'Cache-Control': 'max-age=0'
+                'Cache-Control': 'max-age=0',
+                **self._conditional_headers(validators)
             }
             
-            # Make the request with proper headers
-            response = requests.get(url, headers=headers, timeout=10)
-            response.raise_for_status()
+            # The domain's learned container tells the download where the story ends
+            selector = self.extraction_rules.lookup(rule_domain(url)) if self.extraction_rules else None
+
+            # Make the request with proper headers, streaming the body
+            budget = min(timeout, self.article_deadline) if timeout else self.article_deadline
+            deadline = time.monotonic() + budget
+            request_timeout = (self.http.timeout[0], min(self.http.timeout[1], budget))
+            # No transport retries: they would run past the deadline before read_body_bounded could check it
+            with self.http.get(url, retry=False, headers=headers, timeout=request_timeout, stream=True) as response:
+                if validators and response.status_code == 304:
+                    return NOT_MODIFIED
+                response.raise_for_status()
+                content_type = response.headers.get('Content-Type', '').lower()
+                is_json = 'application/json' in content_type
+                body, bytes_read, truncation_reason = read_body_bounded(
+                    response, self.article_max_bytes, deadline, stop_at_container=not is_json, selector=selector
+                )
+                page_validators = self._response_validators(response, bytes_read)
             
-            # For development: print response details to debug
-            print(f"Response status: {response.status_code}")
-            print(f"Response headers: {response.headers}")
+            download_info = {}
+            if truncation_reason:
+                print(f"Stopped reading {url} after {bytes_read} bytes ({truncation_reason})")
+                download_info = {"truncated": True, "truncation_reason": truncation_reason}
             
             # Handle different content types
-            content_type = response.headers.get('Content-Type', '').lower()
-            if 'application/json' in content_type:
+            if is_json:
                 print("Received JSON content - extracting text from JSON")
                 # Handle JSON content (some sites return JSON)
-                json_data = response.json()
+                json_data = json.loads(body)
                 # Extract relevant parts (this is site-specific)
                 article_text = self._extract_text_from_json(json_data)
-                return {
+                return Validated({
                     "title": self._extract_title_from_json(json_data),
                     "content": article_text,
                     "url": url,
                     "extraction_time": datetime.now().isoformat()
-                }
+                }, page_validators)
             
-            # Very simple content extraction - this is a placeholder
-            # For production, use newspaper3k or a similar library
-            from bs4 import BeautifulSoup
-            soup = BeautifulSoup(response.text, 'html.parser')
+            # Parse with the fastest available backend, minus scripts/styles/svg
+            soup = parse_html(body)
             
             # Extract title
             title = soup.title.string if soup.title else "Unknown Title"
             
-            # Try multiple content extraction strategies
-            content = self._extract_content_with_multiple_strategies(soup)
-            
-            if not content or len(content) < 100:  # If content is too short, it's probably not the actual article
-                print(f"Content too short ({len(content)} chars), fallback to generic extraction")
-                # Fallback to a very generic approach - get all paragraphs from the page
-                paragraphs = soup.find_all('p')
-                content = '\n\n'.join([p.get_text().strip() for p in paragraphs if len(p.get_text().strip()) > 40])
+            extraction = self._extract_with_rules(soup, url, selector)
+            content = extraction.content
+            print(f"Extracted {len(content)} chars using the {extraction.strategy} strategy")
             
             # If all else fails, provide a useful message
-            if not content or len(content) < 100:
-                return {
+            if not content or len(content) < MIN_CONTENT_LENGTH:
+                return Validated({
                     "title": title,
                     "content": "This article's content couldn't be extracted automatically. Please visit the original article at " + url,
                     "url": url,
-                    "extraction_error": "Content extraction failed"
-                }
+                    "extraction_error": "Content extraction failed",
+                    **download_info
+                }, {})
             
-            return {
+            return Validated({
                 "title": title,
                 "content": content,
                 "url": url,
-                "extraction_time": datetime.now().isoformat()
-            }
+                "extraction_time": datetime.now().isoformat(),
+                **download_info
+            }, page_validators)
             
         except Exception as e:
             print(f"Error extracting article content: {e}")
-            return {
+            failure = {
                 "title": "Content Extraction Failed",
                 "content": f"Unable to extract content from {url}. Error: {str(e)}",
                 "url": url,
                 "error": str(e)
             }
+            # The article cache keeps 4xx failures far longer than network errors
+            if isinstance(e, requests.HTTPError) and e.response is not None:
+                failure["status_code"] = e.response.status_code
+            return Validated(failure, {})
     
-    def _extract_content_with_multiple_strategies(self, soup):
+    def _extract_with_rules(self, soup, url, selector=None):
         """
-        Try multiple approaches to extract the article content
+        Extract article text, trying the domain's learned selector first
+        
+        Falls back to scoring the whole page, and learns the winning
+        container's selector for next time.
         
         Args:
             soup (BeautifulSoup): Parsed HTML
+            url (str): Article URL (its domain keys the rule)
+            selector (str): The domain's rule, as looked up before the download
             
         Returns:
-            str: Extracted content
+            Extraction: content, container node and strategy name
         """
-        content = ""
-        
-        # Strategy 1: Look for article body by common class names
-        article_selectors = [
-            'article', 
-            '.article-body', 
-            '.article-content',
-            '.story-body',
-            '.story-content', 
-            '.entry-content',
-            '.post-content',
-            '.content',
-            '.main-content',
-            '#article-body',
-            '.article__body',
-            '.article__content',
-            '.story__body',
-            '.story__content',
-            '.post__content',
-            '.news-article',
-            '.news-content',
-            '.page-content',
-            '.rich-text',
-            '.article-text',
-            '.article-main',
-            '.main-article',
-            '.article-body-content'
-        ]
-        
-        for selector in article_selectors:
-            try:
-                if selector.startswith('.'):
-                    elements = soup.select(selector)
-                elif selector.startswith('#'):
-                    element = soup.select_one(selector)
-                    elements = [element] if element else []
-                else:
-                    elements = soup.find_all(selector)
-                
-                if elements:
-                    # Extract paragraphs from the first matching element
-                    for element in elements:
-                        paragraphs = element.find_all('p')
-                        if paragraphs:
-                            content = '\n\n'.join([p.get_text().strip() for p in paragraphs if len(p.get_text().strip()) > 0])
-                            if len(content) > 200:  # If we got substantial content, use it
-                                return content
-            except Exception as e:
-                print(f"Error in selector {selector}: {e}")
-                continue
-        
-        # Strategy 2: Look for main content area
-        main_selectors = ['main', '#main', '.main', 'article']
-        for selector in main_selectors:
-            try:
-                if selector.startswith('.') or selector.startswith('#'):
-                    elements = soup.select(selector)
-                else:
-                    elements = soup.find_all(selector)
-                
-                for element in elements:
-                    paragraphs = element.find_all('p')
-                    if paragraphs:
-                        content = '\n\n'.join([p.get_text().strip() for p in paragraphs if len(p.get_text().strip()) > 0])
-                        if len(content) > 200:
-                            return content
-            except Exception:
-                continue
-                
-        # Strategy 3: Find the div with the most paragraphs
-        paragraphs_by_parent = {}
-        for p in soup.find_all('p'):
-            parent = p.parent
-            if parent not in paragraphs_by_parent:
-                paragraphs_by_parent[parent] = []
-            paragraphs_by_parent[parent].append(p)
-        
-        if paragraphs_by_parent:
-            # Sort parents by number of paragraphs
-            sorted_parents = sorted(paragraphs_by_parent.keys(), 
-                                    key=lambda x: len(paragraphs_by_parent[x]), 
-                                    reverse=True)
-            
-            # Get the parent with the most paragraphs
-            main_parent = sorted_parents[0]
-            paragraphs = paragraphs_by_parent[main_parent]
-            
-            # Extract text from these paragraphs
-            content = '\n\n'.join([p.get_text().strip() for p in paragraphs if len(p.get_text().strip()) > 0])
-            
-        return content
+        if not self.extraction_rules:
+            return extract_article(soup)
+
+        domain = rule_domain(url)
+        if selector:
+            extraction = extract_with_selector(soup, selector)
+            if extraction.strategy == "rule":
+                self.extraction_rules.record_hit(domain)
+                return extraction
+            self.extraction_rules.record_miss(domain)
+
+        # Score candidate containers in a single pass over the tree
+        extraction = extract_article(soup)
+        if extraction.strategy == "scored":
+            self.extraction_rules.learn(domain, selector_for(extraction.node, soup))
+        return extraction
     
     def _extract_text_from_json(self, json_data):
         """
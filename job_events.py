@@ -0,0 +1,220 @@
+import json
+import threading
+import time
+
+
+def stage_durations(stages):
+    """
+    Seconds spent in each finished stage
+
+    Args:
+        stages (list): [[stage, started_at], ...] in order, as stored on a job record
+
+    Returns:
+        dict: stage -> seconds, for every stage but the current (last) one
+    """
+    return {stage: round(stages[i + 1][1] - started, 3) for i, (stage, started) in enumerate(stages[:-1])}
+
+
+def format_event(event, data, event_id=None):
+    """
+    Encode one Server-Sent Events message
+
+    Args:
+        event (str): Event name
+        data (dict): JSON-serializable payload
+        event_id (int): Optional id, sent back by the browser as Last-Event-ID on reconnect
+
+    Returns:
+        str: The message, terminated by a blank line
+    """
+    lines = [f"event: {event}"]
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"data: {json.dumps(data)}")
+    return "\n".join(lines) + "\n\n"
+
+
+class _Watch:
+    """Latest known record of one job and the connections waiting on it"""
+
+    def __init__(self, lock, record):
+        self.changed = threading.Condition(lock)
+        self.record = record
+        self.version = 0
+        self.subscribers = 0
+
+
+class Subscription:
+    """One event-stream connection's view of a job (use as a context manager)"""
+
+    def __init__(self, hub, job_id, watch):
+        self._hub = hub
+        self.job_id = job_id
+        self._watch = watch
+        self._version = watch.version
+        self._closed = False
+
+    def wait(self, timeout):
+        """
+        Block until the job record changes
+
+        Args:
+            timeout (float): Seconds to wait
+
+        Returns:
+            tuple: (changed, record); record is None once the job is gone
+        """
+        with self._watch.changed:
+            if self._watch.version == self._version:
+                self._watch.changed.wait(timeout)
+            changed = self._watch.version != self._version
+            self._version = self._watch.version
+            return changed, self._watch.record
+
+    def close(self):
+        """Release the connection slot (safe to call more than once)"""
+        if not self._closed:
+            self._closed = True
+            self._hub._unsubscribe(self.job_id)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class JobEventHub:
+    """
+    Fans job record changes out to the event-stream connections watching them.
+
+    Connections park on a condition variable and cost no work while a job
+    is unchanged. A single watcher thread reads every watched job with one
+    batched job-store query per `poll_interval`, which picks up changes made
+    by other gunicorn workers. Changes made in this process are pushed
+    immediately through publish(). At most `max_connections` connections
+    are open at once, and subscribe() refuses the rest.
+    """
+
+    # Largest batch of job ids read with one query
+    BATCH_SIZE = 500
+
+    def __init__(self, store, poll_interval=1.0, max_connections=48, name="job-events"):
+        """
+        Args:
+            store: Job store (SQLiteJobStore or MemoryJobStore)
+            poll_interval (float): Seconds between reads of the watched jobs
+            max_connections (int): Event-stream connections allowed at once
+            name (str): Name of the watcher thread
+        """
+        self.store = store
+        self.poll_interval = poll_interval
+        self.max_connections = max_connections
+        self.name = name
+        self._lock = threading.Lock()
+        self._watches = {}  # job_id -> _Watch
+        self._connections = 0
+        self._thread = None
+        self._counters = {
+            "opened": 0,
+            "rejected": 0,
+            "polls": 0,
+        }
+
+    def subscribe(self, job_id, record):
+        """
+        Open a connection's subscription to a job
+
+        Args:
+            job_id (str): Job identifier
+            record (dict): The job record as just read by the caller
+
+        Returns:
+            Subscription: or None if max_connections are already open
+        """
+        with self._lock:
+            if self._connections >= self.max_connections:
+                self._counters["rejected"] += 1
+                return None
+            self._connections += 1
+            self._counters["opened"] += 1
+            watch = self._watches.get(job_id)
+            if watch is None:
+                watch = self._watches[job_id] = _Watch(self._lock, record)
+            watch.subscribers += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._watch_jobs, name=self.name, daemon=True)
+                self._thread.start()
+            return Subscription(self, job_id, watch)
+
+    def _unsubscribe(self, job_id):
+        with self._lock:
+            self._connections -= 1
+            watch = self._watches[job_id]
+            watch.subscribers -= 1
+            if not watch.subscribers:
+                del self._watches[job_id]
+
+    def _apply(self, records, job_ids):
+        """Store fresh records for job_ids and wake the connections of those that changed (lock held)"""
+        if records is None:
+            return  # store unreadable; keep the last known records
+        for job_id in job_ids:
+            watch = self._watches.get(job_id)
+            record = records.get(job_id)
+            if watch is not None and record != watch.record:
+                watch.record = record
+                watch.version += 1
+                watch.changed.notify_all()
+
+    def publish(self, job_id):
+        """
+        Push a job's current record to its connections in this process
+
+        Call after updating the job store; does nothing if nobody watches the job.
+
+        Args:
+            job_id (str): Job identifier
+        """
+        with self._lock:
+            if job_id not in self._watches:
+                return
+        records = self.store.get_many([job_id])
+        with self._lock:
+            self._apply(records, [job_id])
+
+    def _watch_jobs(self):
+        while True:
+            with self._lock:
+                if not self._watches:
+                    self._thread = None
+                    return
+                job_ids = list(self._watches)
+            for start in range(0, len(job_ids), self.BATCH_SIZE):
+                batch = job_ids[start:start + self.BATCH_SIZE]
+                try:
+                    records = self.store.get_many(batch)
+                except Exception as e:
+                    print(f"Job event watcher read failed: {e}")
+                    records = None
+                with self._lock:
+                    self._apply(records, batch)
+                    self._counters["polls"] += 1
+            time.sleep(self.poll_interval)
+
+    def stats(self):
+        """
+        Snapshot of the open connections and counters
+
+        Returns:
+            dict: connections, max_connections, watched_jobs, opened, rejected, polls
+        """
+        with self._lock:
+            stats = dict(self._counters)
+            stats.update({
+                "connections": self._connections,
+                "max_connections": self.max_connections,
+                "watched_jobs": len(self._watches),
+            })
+        return stats
@@ -0,0 +1,361 @@
+import copy
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+# Default lifetime of a job record, in seconds
+DEFAULT_JOB_TTL = 24 * 3600
+
+# Record fields that hold paths of files a job serves
+OUTPUT_FIELDS = ("output_file", "result")
+
+
+def _output_paths(records):
+    return {record[field] for record in records for field in OUTPUT_FIELDS if isinstance(record.get(field), str)}
+
+
+class MemoryJobStore:
+    """
+    Job records in a dict, for tests and single-process development.
+
+    Same interface as SQLiteJobStore, but every process has its own copy, so
+    it must not be used behind more than one gunicorn worker.
+    """
+
+    def __init__(self, ttl=DEFAULT_JOB_TTL):
+        """
+        Args:
+            ttl (float): Seconds a job record is kept after it was created
+        """
+        self.ttl = ttl
+        self._jobs = OrderedDict()  # job_id -> (created_at, record), oldest first
+        self._lock = threading.Lock()
+
+    def _purge(self, now):
+        while self._jobs:
+            job_id, (created_at, _) = next(iter(self._jobs.items()))
+            if created_at > now - self.ttl:
+                break
+            del self._jobs[job_id]
+
+    def create(self, job_id, job):
+        with self._lock:
+            now = time.time()
+            self._purge(now)
+            self._jobs[job_id] = (job.get("start_time", now), copy.deepcopy(job))
+
+    def get(self, job_id):
+        with self._lock:
+            self._purge(time.time())
+            entry = self._jobs.get(job_id)
+            return copy.deepcopy(entry[1]) if entry else None
+
+    def get_many(self, job_ids):
+        with self._lock:
+            self._purge(time.time())
+            return {job_id: copy.deepcopy(self._jobs[job_id][1]) for job_id in job_ids if job_id in self._jobs}
+
+    def update(self, job_id, **fields):
+        with self._lock:
+            entry = self._jobs.get(job_id)
+            if entry is None:
+                return False
+            entry[1].update(copy.deepcopy(fields))
+            return True
+
+    def delete(self, job_id):
+        with self._lock:
+            self._jobs.pop(job_id, None)
+
+    def list(self, job_ids=None, limit=20, offset=0):
+        with self._lock:
+            self._purge(time.time())
+            selected = [
+                (job_id, created_at, record) for job_id, (created_at, record) in self._jobs.items()
+                if job_ids is None or job_id in job_ids
+            ]
+        selected.sort(key=lambda item: item[1], reverse=True)
+        page = [(job_id, copy.deepcopy(record)) for job_id, _, record in selected[offset:offset + limit]]
+        return page, len(selected)
+
+    def job_outputs(self):
+        with self._lock:
+            cutoff = time.time() - self.ttl
+            return _output_paths(record for created_at, record in self._jobs.values() if created_at > cutoff)
+
+    def stats(self):
+        with self._lock:
+            return {"backend": "memory", "jobs": len(self._jobs)}
+
+
+class SQLiteJobStore:
+    """
+    Job records shared by every gunicorn worker through a SQLite file.
+
+    The file is opened in WAL mode, so status polls read while jobs are
+    written. Records are JSON documents keyed by job id, with the creation
+    time indexed for the dashboard's newest-first pages and for expiry:
+    records older than `ttl` are invisible and are deleted during writes.
+    """
+
+    # Expired records are deleted at most this often (seconds)
+    PURGE_INTERVAL = 300
+
+    def __init__(self, path, ttl=DEFAULT_JOB_TTL):
+        """
+        Args:
+            path (str): SQLite file location (created if missing)
+            ttl (float): Seconds a job record is kept after it was created
+        """
+        self.path = path
+        self.ttl = ttl
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._last_purge = 0.0
+        self._counters = {
+            "created": 0,
+            "updated": 0,
+            "expired": 0,
+            "errors": 0,
+        }
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._create_schema()
+
+    def _connect(self):
+        """The calling thread's connection, opened on first use"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _create_schema(self):
+        conn = self._connect()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                data TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_created_at ON jobs(created_at)")
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self._counters[name] += amount
+
+    def _purge(self, conn, now):
+        """Delete expired records, at most once per PURGE_INTERVAL"""
+        with self._lock:
+            if now - self._last_purge < self.PURGE_INTERVAL:
+                return
+            self._last_purge = now
+        removed = conn.execute("DELETE FROM jobs WHERE created_at <= ?", (now - self.ttl,)).rowcount
+        self._count("expired", removed)
+
+    def create(self, job_id, job):
+        """
+        Store a new job record
+
+        Args:
+            job_id (str): Unique job identifier
+            job (dict): JSON-serializable record; "start_time" is used as the creation time
+        """
+        now = time.time()
+        try:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO jobs (job_id, status, data, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (job_id, job.get("status", "pending"), json.dumps(job), job.get("start_time", now), now),
+            )
+            self._purge(conn, now)
+        except sqlite3.Error as e:
+            print(f"Job store write failed: {e}")
+            self._count("errors")
+            raise
+        self._count("created")
+
+    def get(self, job_id):
+        """
+        Look up a job record
+
+        Args:
+            job_id (str): Job identifier
+
+        Returns:
+            dict: The record, or None if unknown or expired
+        """
+        try:
+            row = self._connect().execute(
+                "SELECT data FROM jobs WHERE job_id = ? AND created_at > ?", (job_id, time.time() - self.ttl)
+            ).fetchone()
+        except sqlite3.Error as e:
+            print(f"Job store read failed: {e}")
+            self._count("errors")
+            return None
+        return json.loads(row[0]) if row else None
+
+    def get_many(self, job_ids):
+        """
+        Look up several job records with one query
+
+        Args:
+            job_ids (list): Job identifiers (at most a few hundred)
+
+        Returns:
+            dict: job_id -> record, for the ids that exist and have not expired, or None if the store cannot be read
+        """
+        job_ids = list(job_ids)
+        if not job_ids:
+            return {}
+        try:
+            rows = self._connect().execute(
+                f"SELECT job_id, data FROM jobs WHERE job_id IN ({', '.join('?' * len(job_ids))}) AND created_at > ?",
+                job_ids + [time.time() - self.ttl],
+            ).fetchall()
+        except sqlite3.Error as e:
+            print(f"Job store read failed: {e}")
+            self._count("errors")
+            return None
+        return {job_id: json.loads(data) for job_id, data in rows}
+
+    def update(self, job_id, **fields):
+        """
+        Merge fields into a job record
+
+        Args:
+            job_id (str): Job identifier
+            **fields: Values to set (JSON-serializable)
+
+        Returns:
+            bool: False if the job does not exist
+        """
+        try:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute("SELECT data FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+                if row is not None:
+                    job = json.loads(row[0])
+                    job.update(fields)
+                    conn.execute(
+                        "UPDATE jobs SET status = ?, data = ?, updated_at = ? WHERE job_id = ?",
+                        (job.get("status", "pending"), json.dumps(job), time.time(), job_id),
+                    )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        except sqlite3.Error as e:
+            print(f"Job store write failed: {e}")
+            self._count("errors")
+            return False
+        if row is None:
+            return False
+        self._count("updated")
+        return True
+
+    def delete(self, job_id):
+        """Remove a job record"""
+        try:
+            self._connect().execute("DELETE FROM jobs WHERE job_id = ?", (job_id,))
+        except sqlite3.Error as e:
+            print(f"Job store write failed: {e}")
+            self._count("errors")
+
+    def list(self, job_ids=None, limit=20, offset=0):
+        """
+        One page of job records, newest first
+
+        Args:
+            job_ids (list): Only these jobs (e.g. the ones in the user's session); None for all
+            limit (int): Page size
+            offset (int): Records to skip
+
+        Returns:
+            tuple: ([(job_id, record), ...], total number of matching records)
+        """
+        where, params = "created_at > ?", [time.time() - self.ttl]
+        if job_ids is not None:
+            job_ids = list(job_ids)[-500:]  # keep under SQLite's bound-parameter limit
+            if not job_ids:
+                return [], 0
+            where += f" AND job_id IN ({', '.join('?' * len(job_ids))})"
+            params += job_ids
+        try:
+            conn = self._connect()
+            total = conn.execute(f"SELECT COUNT(*) FROM jobs WHERE {where}", params).fetchone()[0]
+            rows = conn.execute(
+                f"SELECT job_id, data FROM jobs WHERE {where} ORDER BY created_at DESC LIMIT ? OFFSET ?",
+                params + [limit, offset],
+            ).fetchall()
+        except sqlite3.Error as e:
+            print(f"Job store read failed: {e}")
+            self._count("errors")
+            return [], 0
+        return [(job_id, json.loads(data)) for job_id, data in rows], total
+
+    def job_outputs(self):
+        """
+        Files referenced by unexpired job records, whatever their status
+
+        Completed jobs stay downloadable until their record expires, so their
+        outputs count as much as those of queued or rendering jobs.
+
+        Returns:
+            set: Output paths; raises sqlite3.Error if the store cannot be read
+        """
+        rows = self._connect().execute(
+            "SELECT data FROM jobs WHERE created_at > ?", (time.time() - self.ttl,)
+        ).fetchall()
+        return _output_paths(json.loads(row[0]) for row in rows)
+
+    def stats(self):
+        """
+        Snapshot of this process's counters plus the shared record count
+
+        Returns:
+            dict: backend, created, updated, expired, errors, jobs and jobs by status
+        """
+        with self._lock:
+            stats = dict(self._counters)
+        stats["backend"] = "sqlite"
+        try:
+            rows = self._connect().execute(
+                "SELECT status, COUNT(*) FROM jobs WHERE created_at > ? GROUP BY status", (time.time() - self.ttl,)
+            ).fetchall()
+            stats["by_status"] = dict(rows)
+            stats["jobs"] = sum(count for _, count in rows)
+        except sqlite3.Error as e:
+            print(f"Job store stats failed: {e}")
+        return stats
+
+
+def create_job_store(backend=None, path=None, ttl=None):
+    """
+    Build the configured job store
+
+    Args:
+        backend (str): "sqlite" or "memory"; defaults to the JOB_STORE environment variable, then "sqlite"
+        path (str): SQLite file (defaults to JOB_STORE_PATH, then cache/jobs.sqlite3)
+        ttl (float): Record lifetime in seconds (defaults to JOB_TTL, then DEFAULT_JOB_TTL)
+
+    Returns:
+        SQLiteJobStore or MemoryJobStore
+    """
+    backend = (backend or os.getenv("JOB_STORE") or "sqlite").strip().lower()
+    ttl = float(ttl if ttl is not None else os.getenv("JOB_TTL", DEFAULT_JOB_TTL))
+    if backend == "memory":
+        return MemoryJobStore(ttl=ttl)
+    if path is None:
+        default_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "jobs.sqlite3")
+        path = os.getenv("JOB_STORE_PATH", default_path)
+    return SQLiteJobStore(path, ttl=ttl)
@@ -0,0 +1,199 @@
+"""
+Frame-level MP3 editing for the passthrough render path.
+
+An MPEG audio Layer III stream is a sequence of self-describing frames, so
+silence can be trimmed and prepended without re-encoding the speech. Only
+a short window of frames at each end is decoded, to find where speech
+starts and stops; the frames in between are copied byte for byte.
+Prepended silence is made of frames with an all-zero side info and main
+data, which every decoder renders as digital silence.
+
+Layer III frames may borrow main data from the frames before them (the
+bit reservoir, up to 511 bytes back). Trimming therefore keeps enough
+frames ahead of the first audible one that no kept frame references data
+that was cut, and decoded tail windows are primed the same way.
+"""
+
+import subprocess
+from collections import namedtuple
+
+from pydub import AudioSegment
+
+# kbps by bitrate index, for MPEG-1 and for MPEG-2/2.5 Layer III
+BITRATES = {
+    1: (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    2: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+# Hz by sample rate index, per version (2.5 is stored as 25)
+SAMPLE_RATES = {1: (44100, 48000, 32000), 2: (22050, 24000, 16000), 25: (11025, 12000, 8000)}
+
+# Furthest back a Layer III frame can point into earlier frames' main data
+MAX_RESERVOIR_BYTES = 511
+
+# Audio decoded at each end when looking for speech; doubled until speech is found
+EDGE_WINDOW_MS = 2000
+
+Frame = namedtuple("Frame", "offset length main_data sample_rate samples")
+
+
+def _header(data, offset):
+    """Decode the 4-byte frame header at offset, or None if it is not a Layer III header"""
+    if offset + 4 > len(data) or data[offset] != 0xFF or data[offset + 1] & 0xE0 != 0xE0:
+        return None
+    b1, b2, b3 = data[offset + 1], data[offset + 2], data[offset + 3]
+    version = {0b11: 1, 0b10: 2, 0b00: 25}.get((b1 >> 3) & 0b11)
+    bitrate_index, rate_index = b2 >> 4, (b2 >> 2) & 0b11
+    if version is None or (b1 >> 1) & 0b11 != 0b01 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+    bitrate = BITRATES[1 if version == 1 else 2][bitrate_index] * 1000
+    sample_rate = SAMPLE_RATES[version][rate_index]
+    samples = 1152 if version == 1 else 576
+    mono = b3 >> 6 == 0b11
+    if version == 1:
+        side_info = 17 if mono else 32
+    else:
+        side_info = 9 if mono else 17
+    return {
+        "sample_rate": sample_rate,
+        "samples": samples,
+        "length": samples // 8 * bitrate // sample_rate + ((b2 >> 1) & 1),
+        "side_bytes": 4 + (0 if b1 & 1 else 2) + side_info,  # header, CRC, side info
+    }
+
+
+def _is_info_frame(data, offset, header):
+    """Xing/Info/VBRI tag frames describe the original stream and go stale once it is edited"""
+    start = offset + header["side_bytes"]
+    return data[start:start + 4] in (b"Xing", b"Info") or data[offset + 36:offset + 40] == b"VBRI"
+
+
+def parse_frames(data):
+    """
+    Locate the audio frames of an MP3 file
+
+    A leading ID3v2 tag, a Xing/Info/VBRI tag frame and anything after the
+    last complete frame (such as an ID3v1 tag) are skipped.
+
+    Args:
+        data (bytes): MP3 file contents
+
+    Returns:
+        list: Frame tuples in stream order
+    """
+    offset = 0
+    if data[:3] == b"ID3" and len(data) >= 10:
+        size = (data[6] & 0x7F) << 21 | (data[7] & 0x7F) << 14 | (data[8] & 0x7F) << 7 | (data[9] & 0x7F)
+        offset = 10 + size + (10 if data[5] & 0x10 else 0)
+
+    frames = []
+    while offset + 4 <= len(data):
+        header = _header(data, offset)
+        if header is None or offset + header["length"] > len(data):
+            if frames:
+                break  # trailing tag or truncated frame
+            offset += 1  # resynchronize on junk before the first frame
+            continue
+        if frames or not _is_info_frame(data, offset, header):
+            frames.append(Frame(offset, header["length"], header["length"] - header["side_bytes"],
+                                header["sample_rate"], header["samples"]))
+        offset += header["length"]
+    return frames
+
+
+def silent_frame(data, frame):
+    """
+    A frame of digital silence in the same format as `frame`
+
+    The header is copied without the padding and CRC bits, and the side info
+    and main data are zeroed, which decodes to silence.
+
+    Args:
+        data (bytes): MP3 file contents holding `frame`
+        frame (Frame): Frame to copy the format of
+
+    Returns:
+        bytes: The encoded frame
+    """
+    header = bytearray(data[frame.offset:frame.offset + 4])
+    header[1] |= 0x01   # no CRC
+    header[2] &= ~0x02  # no padding byte
+    return bytes(header) + bytes(_header(bytes(header), 0)["length"] - 4)
+
+
+def _frames_for_ms(frame, ms):
+    return -(-int(ms * frame.sample_rate) // (1000 * frame.samples))  # ceiling
+
+
+def _reservoir_start(frames, index):
+    """Earliest frame to keep so that frames[index] finds all the main data it may borrow"""
+    start, borrowed = index, 0
+    while start > 0 and borrowed < MAX_RESERVOIR_BYTES:
+        start -= 1
+        borrowed += frames[start].main_data
+    return start
+
+
+def _frame_levels(data, frames, start, end):
+    """
+    dBFS of each frame in frames[start:end], decoding only those frames
+
+    The window is primed with the frames its first frame may borrow from, and
+    their levels are discarded.
+    """
+    primed = _reservoir_start(frames, start)
+    chunk = data[frames[primed].offset:frames[end - 1].offset + frames[end - 1].length]
+    command = [AudioSegment.converter, "-hide_banner", "-loglevel", "error",
+               "-f", "mp3", "-i", "pipe:0", "-f", "s16le", "-ac", "1", "pipe:1"]
+    result = subprocess.run(command, input=chunk, capture_output=True)
+    if result.returncode != 0:
+        raise Exception(f"ffmpeg decode failed: {result.stderr.decode(errors='replace').strip()}")
+    pcm = AudioSegment(data=result.stdout, sample_width=2, frame_rate=frames[0].sample_rate, channels=1)
+    samples = frames[0].samples
+    return [
+        pcm.get_sample_slice(i * samples, (i + 1) * samples).dBFS
+        for i in range(start - primed, end - primed)
+    ]
+
+
+def _edge_frame(data, frames, silence_thresh, from_end):
+    """Index of the first (or last) frame louder than silence_thresh, or None if there is none"""
+    window = _frames_for_ms(frames[0], EDGE_WINDOW_MS)
+    while True:
+        window = min(window, len(frames))
+        start, end = (len(frames) - window, len(frames)) if from_end else (0, window)
+        levels = _frame_levels(data, frames, start, end)
+        loud = [start + i for i, level in enumerate(levels) if level > silence_thresh]
+        if loud:
+            return loud[-1] if from_end else loud[0]
+        if window == len(frames):
+            return None
+        window *= 2
+
+
+def passthrough(data, lead_in_ms=300, keep_ms=100, silence_thresh=-40):
+    """
+    Trim leading/trailing silence and prepend a silent lead-in, frame by frame
+
+    Args:
+        data (bytes): MP3 file contents (constant format, as produced by edge-tts)
+        lead_in_ms (int): Silence to prepend, rounded up to whole frames
+        keep_ms (int): Silence kept around the speech at each end
+        silence_thresh (float): dBFS at or below which a frame counts as silent
+
+    Returns:
+        bytes: Edited MP3, or the input unchanged if it has no frames above silence_thresh
+    """
+    frames = parse_frames(data)
+    if not frames:
+        return data
+    first_audible = _edge_frame(data, frames, silence_thresh, from_end=False)
+    if first_audible is None:
+        return data
+    last_audible = _edge_frame(data, frames, silence_thresh, from_end=True)
+
+    keep = _frames_for_ms(frames[0], keep_ms)
+    first = min(max(first_audible - keep, 0), _reservoir_start(frames, first_audible))
+    last = min(last_audible + keep, len(frames) - 1)
+
+    lead_in = silent_frame(data, frames[first_audible]) * _frames_for_ms(frames[0], lead_in_ms)
+    return lead_in + data[frames[first].offset:frames[last].offset + frames[last].length]
@@ -0,0 +1,179 @@
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+# Loaders may return this instead of a value when an upstream revalidation
+# answered 304: the cached value is kept and its TTL restarts.
+NOT_MODIFIED = object()
+
+# Loaders may wrap a value in this to store HTTP validators (ETag/Last-Modified) with it
+Validated = namedtuple("Validated", ["value", "validators"])
+
+
+class TTLCache:
+    """
+    Bounded in-memory cache with a TTL and stale-while-revalidate.
+
+    Entries younger than `ttl` are served as hits. Entries older than `ttl`
+    but still inside the `stale_ttl` window are served as-is while a single
+    background refresh replaces them. Anything older is treated as a miss.
+    When the cache holds more than `max_entries`, the least recently used
+    entries are evicted.
+
+    Loaders receive the validators stored with the current entry (None on a
+    miss), so a refresh can be a conditional request. A loader returning
+    NOT_MODIFIED keeps the cached value and restarts its TTL.
+
+    Callers short on upstream budget can pass prefer_stale=True (or a check
+    that returns it): any cached entry, however old, is then served without
+    starting a refresh.
+    """
+
+    def __init__(self, ttl=300, stale_ttl=3600, max_entries=256):
+        """
+        Args:
+            ttl (float): Seconds an entry is considered fresh
+            stale_ttl (float): Extra seconds a stale entry may still be served while it refreshes
+            max_entries (int): Maximum number of entries kept (LRU eviction)
+        """
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (value, stored_at, validators)
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._counters = {
+            "hits": 0,
+            "misses": 0,
+            "stale": 0,
+            "refreshes": 0,
+            "refresh_errors": 0,
+            "not_modified": 0,
+            "kept_stale": 0,
+            "evictions": 0,
+        }
+
+    def get_or_load(self, key, loader, should_cache=None, prefer_stale=False):
+        """
+        Return the cached value for key, loading it with loader() when needed
+
+        Args:
+            key (hashable): Cache key (the full parameter tuple of the call)
+            loader (callable): Called with the entry's validators (or None); returns a
+                value, a Validated(value, validators) or NOT_MODIFIED
+            should_cache (callable): Optional predicate; values it rejects are returned but not stored
+            prefer_stale (bool or callable): Serve an outdated entry as-is instead of refreshing or reloading
+                it; a callable is only asked when the entry is outdated (e.g. a quota check)
+
+        Returns:
+            The cached or freshly loaded value
+        """
+        now = time.time()
+        if callable(prefer_stale):
+            with self._lock:
+                entry = self._entries.get(key)
+                outdated = entry is not None and now - entry[1] >= self.ttl
+            prefer_stale = prefer_stale() if outdated else False
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, stored_at, validators = entry
+                age = now - stored_at
+                if age < self.ttl:
+                    self._entries.move_to_end(key)
+                    self._counters["hits"] += 1
+                    return value
+                if prefer_stale:
+                    self._entries.move_to_end(key)
+                    self._counters["stale"] += 1
+                    self._counters["kept_stale"] += 1
+                    return value
+                if age < self.ttl + self.stale_ttl:
+                    self._entries.move_to_end(key)
+                    self._counters["stale"] += 1
+                    start_refresh = key not in self._refreshing
+                    if start_refresh:
+                        self._refreshing.add(key)
+                else:
+                    del self._entries[key]
+                    entry = None
+            if entry is None:
+                self._counters["misses"] += 1
+
+        if entry is not None:
+            if start_refresh:
+                threading.Thread(
+                    target=self._refresh,
+                    args=(key, loader, should_cache, validators),
+                    daemon=True,
+                ).start()
+            return value
+
+        return self._store(key, loader(None), should_cache, reload=loader)
+
+    def _store(self, key, result, should_cache, reload=None):
+        """
+        Apply a loader result to the cache and return the value it stands for
+
+        A NOT_MODIFIED result for an entry that has been evicted meanwhile (a
+        caller that shared a revalidation, say) has no value to stand for: with
+        `reload`, the value is then loaded again unconditionally.
+        """
+        if result is NOT_MODIFIED:
+            with self._lock:
+                self._counters["not_modified"] += 1
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self._entries[key] = (entry[0], time.time(), entry[2])
+                    return entry[0]
+            if reload is None:
+                return None
+            return self._store(key, reload(None), should_cache)
+
+        value, validators = result if isinstance(result, Validated) else (result, None)
+        if should_cache is None or should_cache(value):
+            self.set(key, value, validators)
+        return value
+
+    def _refresh(self, key, loader, should_cache, validators):
+        """Reload (or revalidate) a stale entry in the background"""
+        try:
+            self._store(key, loader(validators), should_cache)
+            with self._lock:
+                self._counters["refreshes"] += 1
+        except Exception as e:
+            print(f"Background refresh failed for {key}: {e}")
+            with self._lock:
+                self._counters["refresh_errors"] += 1
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def set(self, key, value, validators=None):
+        """Store a value, evicting least recently used entries past max_entries"""
+        with self._lock:
+            self._entries[key] = (value, time.time(), validators)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    def clear(self):
+        """Drop every entry (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """
+        Snapshot of the cache counters
+
+        Returns:
+            dict: hits, misses, stale, refreshes, refresh_errors, not_modified, kept_stale, evictions,
+            size and hit_rate
+        """
+        with self._lock:
+            stats = dict(self._counters)
+            stats["size"] = len(self._entries)
+        lookups = stats["hits"] + stats["misses"] + stats["stale"]
+        stats["hit_rate"] = (stats["hits"] + stats["stale"]) / lookups if lookups else 0.0
+        return stats
@@ -0,0 +1,153 @@
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+
+SECONDS_PER_DAY = 86400
+
+
+class DailyQuota:
+    """
+    GNews request budget shared by every worker through a SQLite counter.
+
+    GNews resets its quota at midnight UTC, so the budget is counted per UTC
+    day. `try_acquire` is the hard limit: once `daily_limit` calls have been
+    made, further calls are rejected without touching the network.
+
+    `is_low` is the soft signal callers use to prefer cached or stale data.
+    The budget is treated as a token bucket refilling evenly over the day
+    with `burst` tokens of headroom: spending faster than that pace, or
+    getting within `reserve` calls of the limit, counts as low.
+    """
+
+    def __init__(self, path, daily_limit=100, burst=10, reserve=5):
+        """
+        Args:
+            path (str): SQLite file location (created if missing)
+            daily_limit (int): Calls allowed per UTC day
+            burst (int): Calls allowed ahead of the even daily pace before the budget counts as low
+            reserve (int): Remaining calls at which the budget always counts as low
+        """
+        self.path = path
+        self.daily_limit = daily_limit
+        self.burst = burst
+        self.reserve = reserve
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._counters = {
+            "acquired": 0,
+            "rejected": 0,
+            "errors": 0,
+        }
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._connect().execute("""
+            CREATE TABLE IF NOT EXISTS quota (
+                day TEXT PRIMARY KEY,
+                used INTEGER NOT NULL DEFAULT 0,
+                rejected INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+
+    def _connect(self):
+        """The calling thread's connection, opened on first use"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _count(self, name):
+        with self._lock:
+            self._counters[name] += 1
+
+    @staticmethod
+    def _today():
+        return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+    def _usage(self, conn, day):
+        row = conn.execute("SELECT used, rejected FROM quota WHERE day = ?", (day,)).fetchone()
+        return row if row else (0, 0)
+
+    def try_acquire(self):
+        """
+        Spend one call from today's budget
+
+        Returns:
+            bool: True if the call may go ahead, False if the budget is spent
+        """
+        day = self._today()
+        try:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                used, _ = self._usage(conn, day)
+                allowed = used < self.daily_limit
+                column = "used" if allowed else "rejected"
+                conn.execute(
+                    f"INSERT INTO quota (day, {column}) VALUES (?, 1) "
+                    f"ON CONFLICT(day) DO UPDATE SET {column} = {column} + 1",
+                    (day,),
+                )
+                conn.execute("DELETE FROM quota WHERE day < ?", (day,))
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        except sqlite3.Error as e:
+            # Never let bookkeeping take the news feed down; GNews still enforces the real quota
+            print(f"Quota counter update failed: {e}")
+            self._count("errors")
+            return True
+        self._count("acquired" if allowed else "rejected")
+        return allowed
+
+    def remaining(self):
+        """Calls left in today's budget"""
+        try:
+            used, _ = self._usage(self._connect(), self._today())
+        except sqlite3.Error as e:
+            print(f"Quota counter read failed: {e}")
+            self._count("errors")
+            return self.daily_limit
+        return max(self.daily_limit - used, 0)
+
+    def is_low(self):
+        """
+        Whether callers should avoid spending budget on refreshes
+
+        Returns:
+            bool: True when within `reserve` calls of the limit or ahead of the daily pace
+        """
+        remaining = self.remaining()
+        if remaining <= self.reserve:
+            return True
+        now = datetime.now(timezone.utc)
+        elapsed = now.hour * 3600 + now.minute * 60 + now.second
+        allowance = self.burst + self.daily_limit * elapsed / SECONDS_PER_DAY
+        return self.daily_limit - remaining >= allowance
+
+    def stats(self):
+        """
+        Today's shared usage plus this process's counters
+
+        Returns:
+            dict: limit, used, remaining, rejected_today, low, and the acquired/rejected/errors
+            counters of this process
+        """
+        with self._lock:
+            stats = dict(self._counters)
+        try:
+            used, rejected = self._usage(self._connect(), self._today())
+        except sqlite3.Error as e:
+            print(f"Quota stats failed: {e}")
+            return stats
+        stats.update({
+            "limit": self.daily_limit,
+            "used": used,
+            "remaining": max(self.daily_limit - used, 0),
+            "rejected_today": rejected,
+            "low": self.is_low(),
+        })
+        return stats
@@ -457,7 +457,12 @@ async function listenToSummary(index, autoPlay = true) {
             })
         });
 
-        const result = await ttsRes.json();
+        let result = await ttsRes.json();
+
+        // 202: the audio is rendered in the background, poll the job until it is ready
+        if (ttsRes.status === 202 && result.status_url) {
+            result = await waitForAudioJob(result.status_url);
+        }
 
         if (result.audio_url) {
             // Cache the audio URL for faster future access
@@ -482,6 +487,54 @@ async function listenToSummary(index, autoPlay = true) {
     }
 }
 
+async function waitForAudioJob(statusUrl, timeoutMs = 180000) {
+    const deadline = Date.now() + timeoutMs;
+    if (window.EventSource) {
+        const result = await watchAudioJobEvents(statusUrl, deadline);
+        if (result) return result;
+    }
+    return pollAudioJob(statusUrl, deadline);
+}
+
+// Follows the job's Server-Sent Events stream; resolves null if the stream is unavailable (e.g. at capacity)
+function watchAudioJobEvents(statusUrl, deadline) {
+    return new Promise(resolve => {
+        const source = new EventSource(`${statusUrl}/events`);
+        let opened = false;
+        const finish = result => {
+            clearTimeout(timer);
+            source.close();
+            resolve(result);
+        };
+        const timer = setTimeout(() => finish({}), Math.max(deadline - Date.now(), 0));
+
+        source.onopen = () => { opened = true; };
+        source.addEventListener('done', event => {
+            const job = JSON.parse(event.data);
+            finish(job.status === 'completed' ? { audio_url: job.audio_url } : {});
+        });
+        source.onerror = () => {
+            // Before the first connection: fall back to polling; afterwards the browser reconnects itself
+            if (!opened) finish(null);
+        };
+    });
+}
+
+async function pollAudioJob(statusUrl, deadline) {
+    while (Date.now() < deadline) {
+        const res = await fetch(statusUrl);
+        if (!res.ok) return {};
+        const job = await res.json();
+        if (job.status === 'completed') return { audio_url: job.audio_url };
+        if (job.status === 'failed') return {};
+
+        // Poll faster once the job is running, slower while it waits in the queue
+        const delay = job.queue_position > 0 ? Math.min(Math.max(job.estimated_wait || 1, 1), 5) * 1000 : 700;
+        await new Promise(resolve => setTimeout(resolve, delay));
+    }
+    return {};
+}
+
 function playAudio(audioUrl, index, listenBtn, loadingUI, progressBar, autoPlay = true) {
     activeAudio = new Audio(audioUrl);
     currentPlayButton = listenBtn;
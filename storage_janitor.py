@@ -0,0 +1,209 @@
+import fnmatch
+import os
+import threading
+import time
+
+
+class StorageJanitor:
+    """
+    Periodic age- and size-based cleanup of the app's generated files.
+
+    Each run lists every folder once with os.scandir. Files older than
+    `max_age` are deleted. If the rest still exceed `max_bytes`, the least
+    recently modified ones are deleted until they fit. Some files are never
+    touched:
+
+    - files returned by `protected()`, such as the outputs of live jobs
+    - files younger than `min_age`, which may still be being written
+    - files matching a `keep` pattern
+
+    Folders inside a protected directory (the audio caches, which evict
+    their own files) are refused. Outputs served from the audio cache are
+    hard links to the cache entry. Deleting one frees no space and leaves
+    the cache intact. Such files count toward the age limit but not toward
+    `max_bytes` or the reclaimed bytes.
+
+    Every gunicorn worker may run its own janitor. Runs are idempotent, so
+    a file another process already deleted is simply skipped.
+    """
+
+    def __init__(self, folders, max_age=24 * 3600, max_bytes=1024 * 1024 * 1024, min_age=600,
+                 protected=None, protected_dirs=(), keep=(), name="storage-janitor"):
+        """
+        Args:
+            folders (list): Directories to clean (not recursive; missing ones are skipped)
+            max_age (float): Seconds after which a file is deleted
+            max_bytes (int): Total size budget of the files across all folders
+            min_age (float): Seconds a new file is left alone, whatever the budget
+            protected (callable): Returns the paths that must not be deleted right now
+            protected_dirs (list): Directories owned by someone else; folders inside them are refused
+            keep (list): Filename patterns (fnmatch) that are never deleted
+            name (str): Name of the janitor's thread
+        """
+        protected_dirs = [os.path.abspath(d) for d in protected_dirs]
+        self.folders = []
+        for folder in folders:
+            folder = os.path.abspath(folder)
+            if any(os.path.commonpath([folder, d]) == d for d in protected_dirs):
+                print(f"Storage janitor: not cleaning {folder}, it belongs to a cache")
+                continue
+            self.folders.append(folder)
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.min_age = min_age
+        self.protected = protected or (lambda: ())
+        self.keep = tuple(keep)
+        self.name = name
+        self.last_run = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._counters = {
+            "runs": 0,
+            "removed": 0,
+            "reclaimed_bytes": 0,
+            "errors": 0,
+        }
+
+    def _scan(self):
+        """One os.scandir pass over every folder: [(mtime, size, owned, path)], oldest first"""
+        files = []
+        for folder in self.folders:
+            try:
+                with os.scandir(folder) as it:
+                    for entry in it:
+                        if any(fnmatch.fnmatch(entry.name, pattern) for pattern in self.keep):
+                            continue
+                        try:
+                            if not entry.is_file(follow_symlinks=False):
+                                continue
+                            stat = entry.stat(follow_symlinks=False)
+                        except OSError:
+                            continue
+                        files.append((stat.st_mtime, stat.st_size, stat.st_nlink == 1, entry.path))
+            except FileNotFoundError:
+                continue
+        files.sort()
+        return files
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+            return True
+        except FileNotFoundError:
+            return False  # another worker's janitor got there first
+        except OSError as e:
+            print(f"Storage janitor could not remove {path}: {e}")
+            with self._lock:
+                self._counters["errors"] += 1
+            return False
+
+    def run_once(self):
+        """
+        Clean the folders now
+
+        Returns:
+            dict: scanned, removed, reclaimed_bytes, remaining_bytes, protected and seconds for this run
+        """
+        started = time.time()
+        try:
+            protected = {os.path.abspath(path) for path in self.protected() if path}
+        except Exception as e:
+            # Without the live job list nothing is safe to delete
+            print(f"Storage janitor skipped a run, protected files unavailable: {e}")
+            with self._lock:
+                self._counters["errors"] += 1
+            return None
+
+        files = self._scan()
+        survivors, removed, reclaimed, skipped = [], 0, 0, 0
+        total = 0
+        for mtime, size, owned, path in files:
+            age = started - mtime
+            if path in protected or age < self.min_age:
+                skipped += 1
+                if owned:
+                    total += size
+                continue
+            if age > self.max_age:
+                if self._remove(path):
+                    removed += 1
+                    reclaimed += size if owned else 0
+                continue
+            if owned:
+                survivors.append((size, path))
+                total += size
+
+        # Over budget: oldest first, among files whose deletion actually frees space
+        for size, path in survivors:
+            if total <= self.max_bytes:
+                break
+            if self._remove(path):
+                removed += 1
+                reclaimed += size
+                total -= size
+
+        report = {
+            "scanned": len(files),
+            "removed": removed,
+            "reclaimed_bytes": reclaimed,
+            "remaining_bytes": total,
+            "protected": skipped,
+            "seconds": round(time.time() - started, 3),
+        }
+        with self._lock:
+            self._counters["runs"] += 1
+            self._counters["removed"] += removed
+            self._counters["reclaimed_bytes"] += reclaimed
+            self.last_run = dict(report, finished_at=time.time())
+        if removed:
+            print(f"Storage janitor removed {removed} files, reclaimed {reclaimed / (1024 * 1024):.1f} MB")
+        return report
+
+    def _run_forever(self, interval):
+        while True:
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"Storage janitor run failed: {e}")
+                with self._lock:
+                    self._counters["errors"] += 1
+            if self._stop.wait(interval):
+                return
+
+    def start(self, interval=600):
+        """
+        Run now and then every `interval` seconds in a daemon thread
+
+        Args:
+            interval (float): Seconds between runs
+        """
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run_forever, args=(interval,), name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background thread after its current run"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def stats(self):
+        """
+        Snapshot of the janitor's totals and its last run
+
+        Returns:
+            dict: folders, limits, runs, removed, reclaimed_bytes, errors and last_run
+        """
+        with self._lock:
+            stats = dict(self._counters)
+            stats["last_run"] = dict(self.last_run) if self.last_run else None
+        stats.update({
+            "folders": self.folders,
+            "max_age": self.max_age,
+            "max_bytes": self.max_bytes,
+        })
+        return stats
@@ -0,0 +1,119 @@
+import pytest
+
+import article_cache
+from article_cache import ArticleCache, normalize_url
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(article_cache, "time", clock)
+    return clock
+
+
+def article(url, content="x" * 100):
+    return {"title": "", "content": content, "url": url, "extraction_time": "2026-01-01T00:00:00"}
+
+
+def failure(url, status_code=None, field="error"):
+    result = {"title": "Content Extraction Failed", "content": "", "url": url, field: "failed"}
+    if status_code is not None:
+        result["status_code"] = status_code
+    return result
+
+
+def test_successful_extraction_never_expires(tmp_path, clock):
+    cache = ArticleCache(str(tmp_path / "articles.sqlite3"))
+    cache.put("a", article("a"))
+    clock.now += 365 * 24 * 3600
+
+    assert cache.get("a")["content"] == "x" * 100
+    assert cache.stats()["hits"] == 1
+
+
+@pytest.mark.parametrize("result, ttl", [
+    (failure("u", status_code=404), 300),
+    (failure("u", status_code=410), 300),
+    (failure("u", field="extraction_error"), 300),
+    (failure("u"), 15),  # connection error, no status
+    (failure("u", status_code=503), 15),
+    (failure("u", status_code=429), 15),
+])
+def test_failures_expire_after_their_ttl(tmp_path, clock, result, ttl):
+    cache = ArticleCache(str(tmp_path / "articles.sqlite3"), negative_ttl=300, transient_ttl=15)
+    cache.put("u", result)
+
+    clock.now += ttl - 1
+    assert cache.get("u") is not None
+    assert cache.stats()["negative_hits"] == 1
+    clock.now += 1
+    assert cache.get("u") is None
+
+
+def test_transient_failures_are_not_stored_with_zero_ttl(tmp_path, clock):
+    cache = ArticleCache(str(tmp_path / "articles.sqlite3"), transient_ttl=0)
+    cache.put("u", failure("u", status_code=502))
+    cache.put("v", failure("v", status_code=404))
+
+    assert cache.get("u") is None
+    assert cache.get("v") is not None
+
+
+def test_truncation_is_kept(tmp_path, clock):
+    cache = ArticleCache(str(tmp_path / "articles.sqlite3"))
+    cache.put("a", dict(article("a"), truncated=True, truncation_reason="article_closed"))
+    cache.put("b", article("b"))
+
+    assert cache.get("a")["truncation_reason"] == "article_closed"
+    assert cache.get("a")["truncated"] is True
+    assert "truncated" not in cache.get("b")
+
+
+def test_least_recently_used_entries_are_evicted_down_to_low_water(tmp_path, clock):
+    cache = ArticleCache(str(tmp_path / "articles.sqlite3"), max_bytes=1000)
+    for i in range(10):
+        cache.put(str(i), article(str(i)))  # 100 bytes each: exactly at the budget
+        clock.now += 100
+    assert cache.stats()["bytes"] == 1000
+
+    cache.get("0")  # recently read, so it survives
+    cache.put("10", article("10"))
+
+    stats = cache.stats()
+    assert stats["bytes"] <= 1000 * ArticleCache.LOW_WATER
+    assert stats["evictions"] == 2
+    assert cache.get("0") is not None
+    assert cache.get("1") is None and cache.get("2") is None
+    assert cache.get("3") is not None
+
+
+def test_writes_from_another_process_are_counted_at_the_next_recount(tmp_path, clock, monkeypatch):
+    monkeypatch.setattr(ArticleCache, "RECOUNT_EVERY", 3)
+    path = str(tmp_path / "articles.sqlite3")
+    ours, theirs = ArticleCache(path, max_bytes=1000), ArticleCache(path, max_bytes=1000)
+    ours.put("first", article("first"))  # first write always counts the file
+    for i in range(9):
+        theirs.put(f"t{i}", article(f"t{i}"))
+        clock.now += 1
+    assert ours.stats()["bytes"] == 1000
+
+    ours.put("a", article("a"))
+    ours.put("b", article("b"))  # ours believes 300 bytes are stored
+    assert ours.stats()["evictions"] == 0
+    ours.put("c", article("c"))  # third write since the last count: recount and evict
+
+    assert ours.stats()["bytes"] <= 1000 * ArticleCache.LOW_WATER
+    assert ours.stats()["evictions"] > 0
+
+
+def test_normalize_url_drops_tracking_and_defaults():
+    assert normalize_url("HTTPS://Example.com:443/story?utm_source=x&b=2&a=1#top") == "https://example.com/story?a=1&b=2"
+    assert normalize_url("http://example.com:8080?fbclid=1") == "http://example.com:8080/"
@@ -0,0 +1,88 @@
+"""
+Equivalence of the NumPy effect chain (audio_dsp) with the pydub chain.
+
+The input is synthetic speech-like audio built in memory: tone bursts at
+varying levels separated by pauses of different lengths, so the depth
+filters, the compressor and silence trimming all have something to do.
+No ffmpeg or audio files are involved.
+"""
+
+import numpy as np
+import pytest
+from pydub import AudioSegment
+
+import audio_effects
+
+FRAME_RATE = 24000  # edge-tts output rate
+WINDOW_MS = 20
+FLOOR_DB = -60
+
+# Allowed differences between the two engines
+MAX_LENGTH_DIFF_MS = 60
+MAX_RMS_DIFF_DB = 1.0
+MAX_PEAK_DIFF_DB = 1.0
+MAX_MEAN_ENVELOPE_DIFF_DB = 1.0
+
+
+def synthetic_speech(seed=0):
+    """Mono 16-bit AudioSegment of 'words' (harmonic tone bursts) between pauses"""
+    rng = np.random.default_rng(seed)
+    pieces = [np.zeros(int(0.6 * FRAME_RATE))]  # leading silence
+    for _ in range(12):
+        duration = rng.uniform(0.15, 0.5)
+        t = np.arange(int(duration * FRAME_RATE)) / FRAME_RATE
+        pitch = rng.uniform(110, 220)
+        word = sum(np.sin(2 * np.pi * pitch * k * t) / k for k in range(1, 6))
+        word *= np.hanning(len(t)) * rng.uniform(0.1, 0.6)
+        pieces.append(word)
+        pieces.append(np.zeros(int(rng.choice([0.05, 0.12, 0.4]) * FRAME_RATE)))  # short and long pauses
+    pieces.append(np.zeros(int(0.8 * FRAME_RATE)))  # trailing silence
+    samples = np.concatenate(pieces)
+    samples += rng.normal(0, 1e-4, len(samples))  # noise floor well below the silence threshold
+    pcm = (np.clip(samples, -1, 1) * 32767).astype("<i2")
+    return AudioSegment(data=pcm.tobytes(), sample_width=2, frame_rate=FRAME_RATE, channels=1)
+
+
+def _samples(segment):
+    return np.array(segment.get_array_of_samples(), dtype=np.float64) / (1 << (8 * segment.sample_width - 1))
+
+
+def _db(value):
+    return 20 * np.log10(max(value, 1e-9))
+
+
+def _envelope_db(samples):
+    window = FRAME_RATE * WINDOW_MS // 1000
+    count = len(samples) // window
+    rms = np.sqrt((samples[:count * window].reshape(count, window) ** 2).mean(axis=1))
+    return np.maximum(20 * np.log10(np.maximum(rms, 1e-9)), FLOOR_DB)
+
+
+@pytest.mark.parametrize("speed, depth", [(1.0, 1), (1.2, 1), (1.0, 3)])
+def test_numpy_chain_matches_pydub_chain(speed, depth):
+    audio = synthetic_speech()
+    reference = audio_effects.pydub_chain(audio, speed, depth)
+    candidate = audio_effects.numpy_chain(audio, speed, depth)
+
+    assert candidate.frame_rate == reference.frame_rate
+    assert candidate.channels == reference.channels
+    assert abs(len(candidate) - len(reference)) <= MAX_LENGTH_DIFF_MS
+
+    a, b = _samples(reference), _samples(candidate)
+    assert abs(_db(np.sqrt((a ** 2).mean())) - _db(np.sqrt((b ** 2).mean()))) <= MAX_RMS_DIFF_DB
+    assert abs(_db(np.abs(a).max()) - _db(np.abs(b).max())) <= MAX_PEAK_DIFF_DB
+
+    env_a, env_b = _envelope_db(a), _envelope_db(b)
+    n = min(len(env_a), len(env_b))
+    audible = (env_a[:n] > FLOOR_DB) | (env_b[:n] > FLOOR_DB)
+    assert np.abs(env_a[:n] - env_b[:n])[audible].mean() <= MAX_MEAN_ENVELOPE_DIFF_DB
+
+
+def test_chains_trim_silence_and_add_lead_in():
+    audio = synthetic_speech(seed=1)
+    for chain in (audio_effects.pydub_chain, audio_effects.numpy_chain):
+        result = chain(audio)
+        lead_in = _samples(result[:audio_effects.LEAD_IN_MS])
+        assert not lead_in.any()
+        # 1.4 s of edge silence is cut down to the kept padding
+        assert len(result) < len(audio) - 1000
@@ -0,0 +1,141 @@
+import json
+
+import pytest
+
+import extraction_rules
+from extraction_rules import DomainRuleIndex, rule_domain
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(extraction_rules, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "rules.json")
+
+
+def test_rule_domain_ignores_www_and_case():
+    assert rule_domain("https://WWW.Example.com/news/1") == "example.com"
+    assert rule_domain("https://news.example.com/") == "news.example.com"
+
+
+def test_learned_rule_is_looked_up(path, clock):
+    rules = DomainRuleIndex(path, save_interval=3600)
+    assert rules.lookup("example.com") is None
+
+    rules.learn("example.com", "article.story")
+
+    assert rules.lookup("example.com") == "article.story"
+    assert rules.stats()["domains"] == 1
+
+
+def test_hits_raise_confidence_up_to_one(path, clock):
+    rules = DomainRuleIndex(path, save_interval=3600)
+    rules.learn("example.com", "article.story")
+    for _ in range(10):
+        rules.record_hit("example.com")
+
+    rules.save()
+    with open(path) as f:
+        saved = json.load(f)["example.com"]
+    assert saved["confidence"] == 1.0
+    assert saved["hits"] == 10
+
+
+def test_misses_decay_the_rule_until_it_is_dropped(path, clock):
+    rules = DomainRuleIndex(path, min_confidence=0.3, save_interval=3600)
+    rules.learn("example.com", "article.story")
+    rules.record_hit("example.com")  # 0.6
+
+    rules.record_miss("example.com")  # 0.3: still usable
+    assert rules.lookup("example.com") == "article.story"
+    rules.record_miss("example.com")  # 0.15: dropped
+
+    assert rules.lookup("example.com") is None
+    assert rules.stats()["domains"] == 0
+    rules.record_hit("example.com")  # a tombstone ignores hits and misses
+    rules.record_miss("example.com")
+    assert rules.lookup("example.com") is None
+
+
+def test_dropped_domain_can_be_learned_again(path, clock):
+    rules = DomainRuleIndex(path, save_interval=3600)
+    rules.learn("example.com", "article.story")
+    rules.record_miss("example.com")
+    assert rules.lookup("example.com") is None
+
+    rules.learn("example.com", "div#content")
+
+    assert rules.lookup("example.com") == "div#content"
+
+
+def test_relearning_the_same_selector_reinforces_it(path, clock):
+    rules = DomainRuleIndex(path, min_confidence=0.3, save_interval=3600)
+    rules.learn("example.com", "article.story")
+    rules.learn("example.com", "article.story")  # 0.75
+    rules.record_miss("example.com")  # 0.375: survives one miss a fresh rule would not
+
+    assert rules.lookup("example.com") == "article.story"
+
+
+def test_saves_are_debounced(path, clock):
+    rules = DomainRuleIndex(path, save_interval=30)
+    rules.learn("a.com", "article")
+    clock.now += 10
+    rules.learn("b.com", "main")
+    with pytest.raises(FileNotFoundError):
+        open(path)
+
+    clock.now += 30
+    rules.learn("c.com", "article")
+    with open(path) as f:
+        assert set(json.load(f)) == {"a.com", "b.com", "c.com"}
+
+
+def test_workers_merge_and_a_stale_copy_cannot_revive_a_dropped_rule(path, clock):
+    first = DomainRuleIndex(path, save_interval=3600)
+    first.learn("example.com", "article.story")
+    first.save()
+
+    second = DomainRuleIndex(path, save_interval=3600)  # loads the rule
+    clock.now += 1
+    first.record_miss("example.com")
+    first.record_miss("example.com")
+    first.save()
+
+    # The second worker still holds the old rule; its next save must not bring it back
+    clock.now += 1
+    second.learn("other.com", "main")
+    second.save()
+
+    fresh = DomainRuleIndex(path)
+    assert fresh.lookup("example.com") is None
+    assert fresh.lookup("other.com") == "main"
+    assert second.lookup("example.com") is None  # the merge also updated the second worker
+
+
+def test_tombstones_expire(path, clock):
+    rules = DomainRuleIndex(path, save_interval=3600)
+    rules.learn("example.com", "article.story")
+    rules.record_miss("example.com")
+    rules.save()
+    with open(path) as f:
+        assert json.load(f)["example.com"]["deleted"] is True
+
+    clock.now += DomainRuleIndex.TOMBSTONE_TTL + 1
+    rules.learn("other.com", "main")
+    rules.save()
+    with open(path) as f:
+        assert "example.com" not in json.load(f)
@@ -0,0 +1,120 @@
+import pytest
+
+import job_store
+from job_store import MemoryJobStore, SQLiteJobStore, create_job_store
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(job_store, "time", clock)
+    return clock
+
+
+@pytest.fixture(params=["sqlite", "memory"])
+def store(request, tmp_path, clock):
+    if request.param == "sqlite":
+        return SQLiteJobStore(str(tmp_path / "jobs.sqlite3"), ttl=3600)
+    return MemoryJobStore(ttl=3600)
+
+
+def job(clock, **fields):
+    return dict({"status": "pending", "start_time": clock.now, "output_file": None}, **fields)
+
+
+def test_create_get_update_delete(store, clock):
+    store.create("a", job(clock, voice_id="v"))
+
+    assert store.update("a", status="processing", stage="synthesizing")
+    assert store.get("a") == {"status": "processing", "start_time": 1000.0, "output_file": None,
+                              "voice_id": "v", "stage": "synthesizing"}
+    assert not store.update("missing", status="completed")
+
+    store.delete("a")
+    assert store.get("a") is None
+
+
+def test_records_are_copies(store, clock):
+    record = job(clock, stages=[["queued", 1000.0]])
+    store.create("a", record)
+    record["stages"].append(["changed", 0])
+    store.get("a")["stages"].append(["changed", 0])
+
+    assert store.get("a")["stages"] == [["queued", 1000.0]]
+
+
+def test_records_expire_after_ttl(store, clock):
+    store.create("old", job(clock))
+    clock.now += 1800
+    store.create("new", job(clock))
+    clock.now += 1800  # "old" is now exactly ttl seconds old
+
+    assert store.get("old") is None
+    assert store.get("new") is not None
+    assert set(store.get_many(["old", "new", "unknown"])) == {"new"}
+    page, total = store.list()
+    assert [job_id for job_id, _ in page] == ["new"] and total == 1
+
+
+def test_list_is_newest_first_and_paginated(store, clock):
+    for i in range(5):
+        store.create(f"job{i}", job(clock))
+        clock.now += 1
+
+    page, total = store.list(limit=2, offset=1)
+    assert [job_id for job_id, _ in page] == ["job3", "job2"]
+    assert total == 5
+
+    page, total = store.list(job_ids=["job0", "job4", "unknown"])
+    assert [job_id for job_id, _ in page] == ["job4", "job0"]
+    assert total == 2
+    assert store.list(job_ids=[]) == ([], 0)
+
+
+def test_job_outputs_cover_every_unexpired_record(store, clock):
+    store.create("old", job(clock, status="completed", output_file="static/audio/old.mp3"))
+    clock.now += 1800
+    store.create("done", job(clock, status="completed", output_file="static/audio/done.mp3"))
+    store.create("summary", job(clock, status="processing", result="static/audio/summaries/s.mp3"))
+    store.create("queued", job(clock, result={"summary": "not a path"}))
+    clock.now += 1800
+
+    assert store.job_outputs() == {"static/audio/done.mp3", "static/audio/summaries/s.mp3"}
+
+
+def test_sqlite_store_is_shared_between_processes(tmp_path, clock):
+    path = str(tmp_path / "jobs.sqlite3")
+    first, second = SQLiteJobStore(path), SQLiteJobStore(path)
+    first.create("a", job(clock))
+    second.update("a", status="completed")
+
+    assert first.get("a")["status"] == "completed"
+    assert first.stats()["by_status"] == {"completed": 1}
+
+
+def test_sqlite_store_deletes_expired_rows_on_write(tmp_path, clock):
+    store = SQLiteJobStore(str(tmp_path / "jobs.sqlite3"), ttl=60)
+    store.create("a", job(clock))
+    clock.now += SQLiteJobStore.PURGE_INTERVAL + 1
+    store.create("b", job(clock))
+
+    assert store.stats()["expired"] == 1
+    rows = store._connect().execute("SELECT job_id FROM jobs").fetchall()
+    assert rows == [("b",)]
+
+
+def test_create_job_store_backends(tmp_path, monkeypatch):
+    monkeypatch.setenv("JOB_TTL", "120")
+    memory = create_job_store("memory")
+    sqlite = create_job_store(path=str(tmp_path / "jobs.sqlite3"))
+
+    assert isinstance(memory, MemoryJobStore) and memory.ttl == 120
+    assert isinstance(sqlite, SQLiteJobStore) and sqlite.ttl == 120
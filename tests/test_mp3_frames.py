@@ -0,0 +1,118 @@
+"""
+Frame parsing and trimming of mp3_frames on synthetic streams.
+
+The frames are built in memory in edge-tts' format (MPEG-2 Layer III,
+24 kHz, 48 kbps, mono: 144-byte frames of 576 samples). Decoding is
+replaced by a table of per-frame levels, so no ffmpeg is involved.
+"""
+
+import pytest
+
+import mp3_frames
+from mp3_frames import parse_frames, passthrough, silent_frame
+
+HEADER = bytes([0xFF, 0xF3, 0x64, 0xC0])  # no CRC, no padding
+PADDED_HEADER = bytes([0xFF, 0xF3, 0x66, 0xC0])
+FRAME_BYTES = 144
+SIDE_BYTES = 13  # header + mono MPEG-2 side info
+
+
+def frame(fill, padded=False):
+    if padded:
+        return PADDED_HEADER + bytes([fill]) * (FRAME_BYTES - 3)
+    return HEADER + bytes([fill]) * (FRAME_BYTES - 4)
+
+
+def stream(count):
+    return b"".join(frame(i % 256) for i in range(count))
+
+
+def info_frame():
+    body = bytes(SIDE_BYTES - 4) + b"Info"
+    return HEADER + body + bytes(FRAME_BYTES - 4 - len(body))
+
+
+def id3v2(size):
+    return b"ID3\x04\x00\x00" + bytes([0, 0, size >> 7, size & 0x7F]) + bytes(size)
+
+
+def test_parse_frames_reads_each_frame():
+    data = frame(1) + frame(2, padded=True) + frame(3)
+
+    frames = parse_frames(data)
+
+    assert [(f.offset, f.length) for f in frames] == [(0, 144), (144, 145), (289, 144)]
+    assert frames[0].main_data == FRAME_BYTES - SIDE_BYTES
+    assert (frames[0].sample_rate, frames[0].samples) == (24000, 576)
+
+
+@pytest.mark.parametrize("suffix", [b"TAG" + bytes(125), frame(9)[:50]])
+def test_parse_frames_skips_tags_junk_and_truncated_frames(suffix):
+    prefix = id3v2(300) + b"junk"
+    data = prefix + info_frame() + stream(3) + suffix
+
+    frames = parse_frames(data)
+
+    start = len(prefix) + FRAME_BYTES
+    assert [f.offset for f in frames] == [start, start + FRAME_BYTES, start + 2 * FRAME_BYTES]
+
+
+def test_parse_frames_of_non_mp3_data():
+    assert parse_frames(b"") == []
+    assert parse_frames(b"RIFF" + bytes(500)) == []
+
+
+def test_silent_frame_matches_the_format_without_padding_or_crc():
+    data = frame(7, padded=True)
+    silence = silent_frame(data, parse_frames(data)[0])
+
+    assert silence == HEADER + bytes(FRAME_BYTES - 4)
+
+
+@pytest.fixture
+def levels(monkeypatch):
+    """Per-frame dBFS table standing in for the decoder; records the decoded windows"""
+    table, windows = [], []
+
+    def frame_levels(data, frames, start, end):
+        windows.append((start, end))
+        return table[start:end]
+
+    monkeypatch.setattr(mp3_frames, "_frame_levels", frame_levels)
+    return table, windows
+
+
+def test_passthrough_trims_to_speech_and_prepends_silence(levels):
+    table, windows = levels
+    table.extend([-90] * 100 + [-20] * 100 + [-90] * 100)  # speech in frames 100-199
+    data = stream(300)
+
+    result = passthrough(data, lead_in_ms=300, keep_ms=100, silence_thresh=-40)
+
+    # 300 ms is 12.5 frames, rounded up to 13. 100 ms is 5 frames kept on
+    # either side, and the reservoir needs the 4 frames before speech.
+    lead_in = 13 * FRAME_BYTES
+    assert result[:lead_in] == (HEADER + bytes(FRAME_BYTES - 4)) * 13
+    assert result[lead_in:] == data[95 * FRAME_BYTES:205 * FRAME_BYTES]
+    assert len(parse_frames(result)) == 13 + 110
+    # 84-frame edge windows found nothing and were doubled
+    assert windows == [(0, 84), (0, 168), (216, 300), (132, 300)]
+
+
+def test_passthrough_keeps_reservoir_frames_ahead_of_speech(levels):
+    table, _ = levels
+    table.extend([-90] * 10 + [-20] * 10)
+
+    result = passthrough(stream(20), lead_in_ms=0, keep_ms=0)
+
+    # Frame 10 may borrow 511 bytes: four 131-byte main data blocks back
+    assert result == stream(20)[6 * FRAME_BYTES:]
+
+
+def test_passthrough_leaves_silent_or_unparsable_audio_alone(levels):
+    table, _ = levels
+    table.extend([-90] * 50)
+    silent = stream(50)
+
+    assert passthrough(silent) is silent
+    assert passthrough(b"not an mp3") == b"not an mp3"
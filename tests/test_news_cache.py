@@ -0,0 +1,181 @@
+import threading
+import time
+
+import pytest
+
+import news_cache
+from news_cache import NOT_MODIFIED, TTLCache, Validated
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(news_cache, "time", clock)
+    return clock
+
+
+class Loader:
+    """Counts calls and returns the next value; blocks while `gate` is clear"""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.calls = []
+        self.gate = threading.Event()
+        self.gate.set()
+        self.done = threading.Event()
+
+    def __call__(self, validators):
+        self.calls.append(validators)
+        self.gate.wait(5)
+        try:
+            return self.results.pop(0)
+        finally:
+            self.done.set()
+
+
+def _wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        time.sleep(0.01)
+
+
+def test_fresh_entry_is_a_hit(clock):
+    cache = TTLCache(ttl=60, stale_ttl=60)
+    loader = Loader("a", "b")
+
+    assert cache.get_or_load("k", loader) == "a"
+    clock.now += 59
+    assert cache.get_or_load("k", loader) == "a"
+    assert len(loader.calls) == 1
+    assert cache.stats()["hits"] == 1
+
+
+def test_stale_entry_is_served_while_one_refresh_runs(clock):
+    cache = TTLCache(ttl=60, stale_ttl=600)
+    cache.set("k", "old")
+    clock.now += 61
+    loader = Loader("new")
+    loader.gate.clear()
+
+    # Every stale read gets the old value at once; only the first starts a refresh
+    assert cache.get_or_load("k", loader) == "old"
+    assert cache.get_or_load("k", loader) == "old"
+    loader.gate.set()
+    assert loader.done.wait(5)
+    _wait_for(lambda: cache.stats()["refreshes"] == 1)
+
+    assert loader.calls == [None]
+    assert cache.get_or_load("k", loader) == "new"
+    assert cache.stats()["stale"] == 2
+
+
+def test_entry_past_the_stale_window_is_a_miss(clock):
+    cache = TTLCache(ttl=60, stale_ttl=60)
+    cache.set("k", "old")
+    clock.now += 121
+
+    assert cache.get_or_load("k", Loader("new")) == "new"
+    assert cache.stats()["misses"] == 1
+
+
+def test_refresh_is_conditional_and_not_modified_restarts_the_ttl(clock):
+    cache = TTLCache(ttl=60, stale_ttl=600)
+    cache.get_or_load("k", Loader(Validated("v", {"etag": '"1"'})))
+    clock.now += 61
+    loader = Loader(NOT_MODIFIED)
+
+    assert cache.get_or_load("k", loader) == "v"
+    _wait_for(lambda: cache.stats()["refreshes"] == 1)
+
+    assert loader.calls == [{"etag": '"1"'}]
+    assert cache.stats()["not_modified"] == 1
+    clock.now += 59
+    assert cache.get_or_load("k", Loader("unused")) == "v"  # fresh again
+
+
+def test_failed_refresh_keeps_the_stale_value(clock):
+    cache = TTLCache(ttl=60, stale_ttl=600)
+    cache.set("k", "old")
+    clock.now += 61
+
+    def failing(validators):
+        raise RuntimeError("upstream down")
+
+    assert cache.get_or_load("k", failing) == "old"
+    _wait_for(lambda: cache.stats()["refresh_errors"] == 1)
+    assert cache.get_or_load("k", Loader("unused")) == "old"
+
+
+def test_should_cache_rejects_errors(clock):
+    cache = TTLCache(ttl=60)
+    loader = Loader({"error": "quota"}, {"articles": []})
+    should_cache = lambda result: "error" not in result
+
+    assert cache.get_or_load("k", loader, should_cache) == {"error": "quota"}
+    assert cache.get_or_load("k", loader, should_cache) == {"articles": []}
+    assert cache.get_or_load("k", loader, should_cache) == {"articles": []}
+    assert len(loader.calls) == 2
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = TTLCache(ttl=60, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get_or_load("a", Loader("unused"))  # a is now the most recently used
+    cache.set("c", 3)
+
+    assert cache.get_or_load("a", Loader("unused")) == 1
+    assert cache.get_or_load("c", Loader("unused")) == 3
+    assert cache.get_or_load("b", Loader("reloaded")) == "reloaded"
+    assert cache.stats()["evictions"] == 2
+
+
+
+def test_prefer_stale_serves_an_outdated_entry_without_refreshing(clock):
+    cache = TTLCache(ttl=60, stale_ttl=60)
+    cache.set("k", "old")
+    clock.now += 3600  # far past the stale window
+    loader = Loader("new")
+
+    assert cache.get_or_load("k", loader, prefer_stale=True) == "old"
+    assert loader.calls == []
+    assert cache.stats()["kept_stale"] == 1
+
+
+def test_prefer_stale_check_is_only_asked_for_outdated_entries(clock):
+    cache = TTLCache(ttl=60, stale_ttl=600)
+    checks = []
+
+    def quota_low():
+        checks.append(1)
+        return True
+
+    loader = Loader("v1", "v2")
+    assert cache.get_or_load("k", loader, prefer_stale=quota_low) == "v1"  # miss: nothing to prefer
+    assert cache.get_or_load("k", loader, prefer_stale=quota_low) == "v1"  # fresh hit
+    assert checks == []
+
+    clock.now += 61
+    assert cache.get_or_load("k", loader, prefer_stale=quota_low) == "v1"
+    assert checks == [1]
+    assert len(loader.calls) == 1  # budget low: no refresh started
+
+
+def test_prefer_stale_check_saying_no_refreshes_as_usual(clock):
+    cache = TTLCache(ttl=60, stale_ttl=600)
+    cache.set("k", "old")
+    clock.now += 61
+    loader = Loader("new")
+
+    assert cache.get_or_load("k", loader, prefer_stale=lambda: False) == "old"
+    _wait_for(lambda: cache.stats()["refreshes"] == 1)
+    assert cache.get_or_load("k", loader) == "new"
@@ -0,0 +1,79 @@
+from datetime import datetime, timezone
+
+import pytest
+
+import news_quota
+from news_quota import DailyQuota
+
+
+class FrozenDatetime(datetime):
+    current = datetime(2026, 10, 17, 12, 0, tzinfo=timezone.utc)
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls.current
+
+
+@pytest.fixture
+def frozen(monkeypatch):
+    monkeypatch.setattr(news_quota, "datetime", FrozenDatetime)
+    FrozenDatetime.current = datetime(2026, 10, 17, 12, 0, tzinfo=timezone.utc)
+    return FrozenDatetime
+
+
+def spend(quota, calls):
+    return [quota.try_acquire() for _ in range(calls)]
+
+
+def test_try_acquire_stops_at_the_daily_limit(tmp_path, frozen):
+    quota = DailyQuota(str(tmp_path / "quota.sqlite3"), daily_limit=3)
+
+    assert spend(quota, 5) == [True, True, True, False, False]
+    stats = quota.stats()
+    assert (stats["used"], stats["remaining"], stats["rejected_today"]) == (3, 0, 2)
+
+
+def test_budget_is_shared_through_the_file(tmp_path, frozen):
+    path = str(tmp_path / "quota.sqlite3")
+    first, second = DailyQuota(path, daily_limit=3), DailyQuota(path, daily_limit=3)
+
+    assert spend(first, 2) == [True, True]
+    assert spend(second, 2) == [True, False]
+    assert first.remaining() == 0
+
+
+def test_budget_resets_at_utc_midnight(tmp_path, frozen):
+    quota = DailyQuota(str(tmp_path / "quota.sqlite3"), daily_limit=2)
+    spend(quota, 3)
+
+    frozen.current = datetime(2026, 10, 18, 0, 0, 1, tzinfo=timezone.utc)
+    assert quota.remaining() == 2
+    assert spend(quota, 1) == [True]
+    assert quota.stats()["rejected_today"] == 0
+
+
+def test_is_low_when_ahead_of_the_daily_pace(tmp_path, frozen):
+    # At noon the pace allows burst + half the limit: 10 + 50 calls
+    quota = DailyQuota(str(tmp_path / "quota.sqlite3"), daily_limit=100, burst=10, reserve=5)
+    spend(quota, 59)
+    assert not quota.is_low()
+    spend(quota, 1)
+    assert quota.is_low()
+
+
+def test_is_low_early_in_the_day_after_the_burst(tmp_path, frozen):
+    frozen.current = datetime(2026, 10, 17, 0, 0, tzinfo=timezone.utc)
+    quota = DailyQuota(str(tmp_path / "quota.sqlite3"), daily_limit=100, burst=10, reserve=5)
+    spend(quota, 9)
+    assert not quota.is_low()
+    spend(quota, 1)
+    assert quota.is_low()
+
+
+def test_is_low_within_the_reserve_whatever_the_pace(tmp_path, frozen):
+    frozen.current = datetime(2026, 10, 17, 23, 59, tzinfo=timezone.utc)
+    quota = DailyQuota(str(tmp_path / "quota.sqlite3"), daily_limit=20, burst=100, reserve=5)
+    spend(quota, 14)
+    assert not quota.is_low()
+    spend(quota, 1)
+    assert quota.is_low()
@@ -0,0 +1,122 @@
+import time
+
+import pytest
+
+from gnews_client import read_body_bounded
+
+
+class FakeResponse:
+    """Streams a fixed list of chunks through iter_content"""
+
+    def __init__(self, chunks, content_type="text/html; charset=utf-8"):
+        self.headers = {"Content-Type": content_type}
+        self.raw = object()  # no read1, so read_body_bounded uses iter_content
+        self._chunks = [c.encode("utf-8") if isinstance(c, str) else c for c in chunks]
+
+    def iter_content(self, chunk_size):
+        return iter(self._chunks)
+
+
+def paragraphs(count, word="story"):
+    return "".join(f"<p>{word} paragraph {i}</p>" for i in range(count))
+
+
+def read(chunks, selector=None, max_bytes=10 * 1024 * 1024):
+    return read_body_bounded(FakeResponse(chunks), max_bytes, time.monotonic() + 30, selector=selector)
+
+
+MAIN = f"<article class='story'>{paragraphs(5)}</article>"
+TAIL = "<footer>" + paragraphs(4, "footer") + "</footer></body></html>"
+
+
+def test_stops_once_the_story_container_closes():
+    text, _, reason = read(["<html><body>", MAIN, TAIL])
+
+    assert reason == "article_closed"
+    assert "story paragraph 4" in text
+    assert "footer paragraph" not in text
+
+
+def test_small_teasers_do_not_add_up_to_a_story():
+    teasers = "".join(f"<article class='card'>{paragraphs(2, 'teaser')}</article>" for _ in range(3))
+    text, _, reason = read(["<html><body>", teasers, MAIN, TAIL])
+
+    assert reason == "article_closed"
+    assert "story paragraph 4" in text
+
+
+def test_learned_selector_skips_a_large_teaser():
+    teaser = f"<article class='related'>{paragraphs(3, 'teaser')}</article>"
+    text, _, reason = read(["<html><body>", teaser, MAIN, TAIL], selector="article.story")
+
+    assert reason == "article_closed"
+    assert "story paragraph 4" in text
+    assert "footer paragraph" not in text
+
+
+def test_selector_by_id_matches_nested_divs():
+    page = (
+        "<html><body><div id='story'><div class='byline'><div>by someone</div></div>"
+        + paragraphs(4) + "<div><p>more</p></div></div>"
+    )
+    text, _, reason = read([page, TAIL], selector="div#story")
+
+    assert reason == "article_closed"
+    assert "<p>more</p>" in text
+    assert "footer paragraph" not in text
+
+
+def test_selector_that_never_matches_reads_to_the_end():
+    text, _, reason = read(["<html><body>", MAIN, TAIL], selector="div#gone")
+
+    assert reason is None
+    assert text.endswith("</html>")
+
+
+@pytest.mark.parametrize("markup", [
+    "<script>var s = '<article><p>a<p>b<p>c</article>';</script>",
+    "<style>/* <article><p><p><p></article> */</style>",
+    "<!-- <article><p>a<p>b<p>c</article> -->",
+])
+def test_markup_in_scripts_and_comments_is_ignored(markup):
+    text, _, reason = read(["<html><body>", markup, "<article>", paragraphs(1), "</article>", TAIL])
+
+    assert reason is None
+
+
+def test_tags_split_across_chunks():
+    # "<p" + "re>" is a <pre>, not a paragraph; "</arti" + "cle>" still closes the container
+    chunks = ["<html><body><article><p", "re>code</pre><p", "aram></param>",
+              paragraphs(2), "<p", ">third</p></arti", "cle>", TAIL]
+    text, _, reason = read(chunks)
+
+    assert reason == "article_closed"
+    assert text.endswith("</article>")
+
+
+def test_pre_and_param_alone_do_not_count_as_paragraphs():
+    chunks = ["<html><body><article><p", "re>a</pre><p", "re>b</pre><p", "aram><p>c</p></article>", TAIL]
+    text, _, reason = read(chunks)
+
+    assert reason is None
+
+
+def test_comment_split_across_chunks():
+    chunks = ["<html><body><!", "-- <article>", paragraphs(3), "</article> -", "-> <article>", paragraphs(1),
+              "</article>", TAIL]
+    _, _, reason = read(chunks)
+
+    assert reason is None
+
+
+def test_max_bytes():
+    _, bytes_read, reason = read(["<html><body>" + "x" * 5000, "y" * 5000, "z" * 5000], max_bytes=8000)
+
+    assert reason == "max_bytes"
+    assert bytes_read >= 8000
+
+
+def test_deadline():
+    text, bytes_read, reason = read_body_bounded(FakeResponse(["<html>"]), 1024, time.monotonic() - 1)
+
+    assert (text, bytes_read, reason) == ("", 0, "deadline")
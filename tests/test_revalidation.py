@@ -0,0 +1,91 @@
+import json
+import threading
+
+import pytest
+
+from gnews_client import GNewsClient
+from news_cache import NOT_MODIFIED, TTLCache, Validated
+
+
+class FakeResponse:
+    def __init__(self, status_code, data=None, etag=None):
+        self.status_code = status_code
+        self.headers = {"ETag": etag} if etag else {}
+        self._data = data
+        self.content = json.dumps(data).encode("utf-8") if data is not None else b""
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._data
+
+
+class FakeHTTP:
+    """GNews stand-in: plain GETs answer 200 with an ETag, conditional ones block and then answer 304"""
+
+    timeout = (3.05, 10)
+
+    def __init__(self):
+        self.revalidating = threading.Event()
+        self.release = threading.Event()
+        self.requests = []
+
+    def get(self, url, params=None, headers=None, **kwargs):
+        conditional = bool(headers and headers.get("If-None-Match"))
+        self.requests.append("conditional" if conditional else "full")
+        if conditional:
+            self.revalidating.set()
+            self.release.wait(10)
+            return FakeResponse(304)
+        return FakeResponse(200, {"articles": [{"title": "Headline"}]}, etag='"v1"')
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv("GNEWS_API_KEY", "test")
+    monkeypatch.setenv("ARTICLE_CACHE_PATH", "")
+    monkeypatch.setenv("EXTRACTION_RULES_PATH", "")
+    monkeypatch.setenv("GNEWS_DAILY_QUOTA", "0")
+    http = FakeHTTP()
+    client = GNewsClient(http=http, results_cache=TTLCache(ttl=0, stale_ttl=600))
+    yield client
+    http.release.set()
+    client.batch_executor.shutdown(wait=False)
+
+
+def test_miss_during_revalidation_of_evicted_entry_gets_the_value(client):
+    http = client.http
+    first = client.get_top_headlines("world")
+    assert first == {"articles": [{"title": "Headline"}]}
+
+    # The entry is outdated (ttl=0): this call serves it and revalidates in the background
+    assert client.get_top_headlines("world") == first
+    assert http.revalidating.wait(5)
+
+    # The entry is evicted while the conditional GET is still in flight
+    client.results_cache.clear()
+    results = []
+    miss = threading.Thread(target=lambda: results.append(client.get_top_headlines("world")))
+    miss.start()
+    miss.join(0.5)
+    http.release.set()  # the revalidation answers 304
+    miss.join(5)
+
+    assert results == [first]
+    assert http.requests == ["full", "conditional", "full"]
+
+
+def test_not_modified_for_a_missing_entry_reloads():
+    cache = TTLCache(ttl=60)
+    calls = []
+
+    def loader(validators):
+        calls.append(validators)
+        # The first call shared somebody else's revalidation and only learned "304"
+        return NOT_MODIFIED if len(calls) == 1 else Validated("value", {"etag": '"v2"'})
+
+    assert cache.get_or_load("key", loader) == "value"
+    assert calls == [None, None]
+    assert cache.get_or_load("key", loader) == "value"
+    assert len(calls) == 2
@@ -0,0 +1,93 @@
+import threading
+import time
+
+import pytest
+
+from gnews_client import SingleFlight
+
+
+def run_concurrently(flight, key, fn, count):
+    """Start `count` callers of flight.do(key, fn); returns (threads, results, errors)"""
+    results, errors = [], []
+
+    def call():
+        try:
+            results.append(flight.do(key, fn))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, results, errors
+
+
+def wait_for_waiters(flight, count):
+    while flight.stats()["calls"] < count:
+        time.sleep(0.01)
+
+
+def test_concurrent_callers_share_one_execution():
+    flight = SingleFlight()
+    release = threading.Event()
+    executions = []
+
+    def fetch():
+        executions.append(1)
+        release.wait(5)
+        return {"articles": ["a"]}
+
+    threads, results, errors = run_concurrently(flight, "headlines", fetch, 5)
+    wait_for_waiters(flight, 5)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(executions) == 1
+    assert results == [{"articles": ["a"]}] * 5
+    assert errors == []
+    stats = flight.stats()
+    assert (stats["executions"], stats["coalesced"], stats["in_flight"]) == (1, 4, 0)
+
+
+def test_waiters_get_the_leaders_exception():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def fetch():
+        release.wait(5)
+        raise ValueError("upstream down")
+
+    threads, results, errors = run_concurrently(flight, "headlines", fetch, 3)
+    wait_for_waiters(flight, 3)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == []
+    assert [str(e) for e in errors] == ["upstream down"] * 3
+    assert flight.stats()["errors"] == 1
+
+
+def test_different_keys_run_separately():
+    flight = SingleFlight()
+
+    assert flight.do("a", lambda: 1) == 1
+    assert flight.do("b", lambda: 2) == 2
+    assert flight.stats()["executions"] == 2
+
+
+def test_key_is_released_after_the_call():
+    flight = SingleFlight()
+    values = iter([1, 2])
+
+    assert flight.do("k", lambda: next(values)) == 1
+    assert flight.do("k", lambda: next(values)) == 2
+
+    def fail():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        flight.do("k", fail)
+    assert flight.do("k", lambda: 3) == 3
+    assert flight.stats()["in_flight"] == 0
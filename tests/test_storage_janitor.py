@@ -0,0 +1,119 @@
+import os
+import time
+
+import pytest
+
+from storage_janitor import StorageJanitor
+
+
+@pytest.fixture
+def folder(tmp_path):
+    path = tmp_path / "audio"
+    path.mkdir()
+    return path
+
+
+def make_file(folder, name, size=100, age=0):
+    path = folder / name
+    path.write_bytes(b"x" * size)
+    mtime = time.time() - age
+    os.utime(path, (mtime, mtime))
+    return str(path)
+
+
+def names(folder):
+    return sorted(os.listdir(folder))
+
+
+def test_files_older_than_max_age_are_removed(folder):
+    make_file(folder, "old.mp3", age=7200)
+    make_file(folder, "recent.mp3", age=1200)
+    janitor = StorageJanitor([str(folder)], max_age=3600, min_age=600)
+
+    report = janitor.run_once()
+
+    assert names(folder) == ["recent.mp3"]
+    assert (report["removed"], report["reclaimed_bytes"], report["remaining_bytes"]) == (1, 100, 100)
+
+
+def test_oldest_files_are_removed_until_within_budget(folder):
+    for i, age in enumerate([5000, 4000, 3000, 2000]):
+        make_file(folder, f"{i}.mp3", age=age)
+    janitor = StorageJanitor([str(folder)], max_age=86400, max_bytes=250, min_age=600)
+
+    report = janitor.run_once()
+
+    assert names(folder) == ["2.mp3", "3.mp3"]
+    assert report["remaining_bytes"] == 200
+
+
+def test_protected_young_and_kept_files_survive(folder):
+    live = make_file(folder, "live.mp3", age=7200)
+    make_file(folder, "writing.mp3", age=10)
+    make_file(folder, ".gitkeep", age=7200)
+    make_file(folder, "done.mp3", age=7200)
+    janitor = StorageJanitor([str(folder)], max_age=3600, max_bytes=0, min_age=600,
+                             protected=lambda: [live, None], keep=[".gitkeep"])
+
+    report = janitor.run_once()
+
+    assert names(folder) == [".gitkeep", "live.mp3", "writing.mp3"]
+    assert report["protected"] == 2
+    assert report["remaining_bytes"] == 200  # protected files still use the budget
+
+
+def test_nothing_is_removed_when_protected_files_are_unavailable(folder):
+    make_file(folder, "old.mp3", age=7200)
+
+    def protected():
+        raise RuntimeError("job store unavailable")
+
+    janitor = StorageJanitor([str(folder)], max_age=3600, protected=protected)
+
+    assert janitor.run_once() is None
+    assert names(folder) == ["old.mp3"]
+    assert janitor.stats()["errors"] == 1
+
+
+def test_hard_linked_files_count_toward_age_but_not_bytes(tmp_path, folder):
+    cache = tmp_path / "cache"
+    cache.mkdir()
+    for name, age in [("old.mp3", 7200), ("shared.mp3", 1200)]:
+        entry = make_file(cache, name, size=1000, age=age)
+        os.link(entry, folder / name)
+    make_file(folder, "own.mp3", size=100, age=1800)
+    janitor = StorageJanitor([str(folder)], max_age=3600, max_bytes=100, min_age=600)
+
+    report = janitor.run_once()
+
+    # The linked output is past max_age and goes, the other fits in the budget it does not use
+    assert names(folder) == ["own.mp3", "shared.mp3"]
+    assert (report["removed"], report["reclaimed_bytes"], report["remaining_bytes"]) == (1, 0, 100)
+    assert names(cache) == ["old.mp3", "shared.mp3"]
+
+
+def test_folders_inside_protected_dirs_are_refused(tmp_path, folder):
+    cache = tmp_path / "cache"
+    (cache / "tts").mkdir(parents=True)
+    make_file(cache / "tts", "entry.mp3", age=7200)
+    make_file(folder, "old.mp3", age=7200)
+    janitor = StorageJanitor([str(folder), str(cache / "tts"), str(tmp_path / "missing")],
+                             max_age=3600, protected_dirs=[str(cache)])
+
+    janitor.run_once()
+
+    assert janitor.folders == [str(folder), str(tmp_path / "missing")]
+    assert names(cache / "tts") == ["entry.mp3"]
+    assert names(folder) == []
+
+
+def test_stats_accumulate_across_runs(folder):
+    janitor = StorageJanitor([str(folder)], max_age=3600)
+    make_file(folder, "a.mp3", age=7200)
+    janitor.run_once()
+    make_file(folder, "b.mp3", age=7200)
+    janitor.run_once()
+
+    stats = janitor.stats()
+    assert (stats["runs"], stats["removed"], stats["reclaimed_bytes"]) == (2, 2, 200)
+    assert stats["last_run"]["removed"] == 1
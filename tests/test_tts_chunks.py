@@ -0,0 +1,58 @@
+import pytest
+
+from tts import _split_long_sentence, split_into_chunks, synthesis_mode
+
+
+def test_short_text_is_one_chunk():
+    assert split_into_chunks("Hello there. How are you?", max_chars=100) == ["Hello there. How are you?"]
+
+
+def test_chunks_hold_whole_sentences():
+    text = "One two three. Four five six! Seven eight nine? Ten eleven twelve."
+
+    chunks = split_into_chunks(text, max_chars=30)
+
+    assert chunks == ["One two three. Four five six!", "Seven eight nine?", "Ten eleven twelve."]
+    assert " ".join(chunks) == text
+
+
+def test_sentence_boundaries_include_closing_quotes_and_other_scripts():
+    text = "He said \"stop.\" Then left… 你好。 再见！ Done"
+
+    assert split_into_chunks(text, max_chars=10) == ["He said", "\"stop.\"", "Then left…", "你好。 再见！", "Done"]
+
+
+def test_long_sentence_is_split_at_a_comma_then_at_spaces():
+    sentence = "alpha beta gamma, delta epsilon zeta eta theta iota kappa"
+
+    pieces = _split_long_sentence(sentence, max_chars=20)
+
+    assert pieces == ["alpha beta gamma,", "delta epsilon zeta", "eta theta iota kappa"]
+    assert all(len(piece) <= 20 for piece in pieces)
+
+
+def test_early_comma_is_ignored_and_unbroken_words_are_cut():
+    assert _split_long_sentence("a, bbbbbbbb cccccccc", max_chars=12) == ["a, bbbbbbbb", "cccccccc"]
+    assert _split_long_sentence("x" * 25, max_chars=10) == ["x" * 10, "x" * 10, "x" * 5]
+
+
+@pytest.mark.parametrize("max_chars", [20, 50, 200])
+def test_no_chunk_exceeds_the_limit_and_no_words_are_lost(max_chars):
+    text = " ".join(f"Sentence number {i} talks about item {i * 7}, briefly." for i in range(30))
+
+    chunks = split_into_chunks(text, max_chars=max_chars)
+
+    assert all(0 < len(chunk) <= max_chars for chunk in chunks)
+    assert " ".join(chunks).split() == text.split()
+
+
+def test_blank_text_has_no_chunks():
+    assert split_into_chunks("   ", max_chars=10) == []
+
+
+def test_synthesis_mode_follows_the_chunk_plan():
+    text = "One two three. Four five six."
+
+    assert synthesis_mode(text, max_chars=100) == "single"
+    assert synthesis_mode(text, max_chars=0) == "single"  # chunking disabled
+    assert synthesis_mode(text, max_chars=20) == "chunked:20"
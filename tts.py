@@ -1,121 +1,556 @@
 import os
-import time
+import re
+import uuid
+import queue
+import asyncio
 import tempfile
-import subprocess
+import threading
 from pydub import AudioSegment
-from pydub.effects import low_pass_filter, speedup, normalize, compress_dynamic_range
+from pydub.silence import detect_leading_silence
 
-async def generate_simple_tts(script_file, output_audio, voice_id, speed=1.0, depth=1):
+from audio_cache import AudioCache, audio_cache_key, synthesis_cache_key
+from audio_effects import decode, encode_mp3, get_engine, postprocess, process_passthrough
+from background_loop import BackgroundLoop
+
+DEFAULT_AUDIO_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'audio')
+DEFAULT_SYNTHESIS_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'synthesis')
+TTS_TEMP_DIR = os.path.join(tempfile.gettempdir(), "tts_generator")  # scratch renders for render_to_cache
+OUTPUT_FORMAT = "mp3-192k"
+
+# Post-processing engine: "pydub" (step by step) or "ffmpeg" (one filtergraph pass)
+AUDIO_ENGINE = get_engine()
+
+# "enhanced" runs the effects chain; "raw" keeps edge-tts' encoding and, at normal
+# speed and depth 1, only trims silence at the MP3 frame level (no decode/re-encode)
+QUALITIES = ("enhanced", "raw")
+
+# Scripts longer than this many characters are split at sentence boundaries and
+# the chunks synthesized concurrently (0 disables chunking)
+TTS_CHUNK_CHARS = int(os.getenv("TTS_CHUNK_CHARS", 1500))
+TTS_CHUNK_CONCURRENCY = int(os.getenv("TTS_CHUNK_CONCURRENCY", 4))
+CHUNK_GAP_MS = 250          # pause inserted between stitched chunks
+CHUNK_SILENCE_THRESH = -50  # dBFS below which chunk edges count as silence
+
+# Longest wait for the next streamed chunk before a stalled edge-tts call is abandoned
+STREAM_CHUNK_TIMEOUT = float(os.getenv("TTS_STREAM_CHUNK_TIMEOUT", 30))
+
+# End of a sentence: terminal punctuation, optional closing quotes/brackets, then whitespace
+SENTENCE_BOUNDARY = re.compile(r"[.!?…؟。！？]+[\"'”’»)\]]*\s+")
+
+
+def _build_audio_cache(dir_var, default_dir, size_var, default_max_bytes):
+    # Set the directory variable to an empty string to disable the cache
+    directory = os.getenv(dir_var, default_dir)
+    if not directory:
+        return None
+    return AudioCache(directory, max_bytes=int(os.getenv(size_var, default_max_bytes)))
+
+
+# Finished renders, keyed by text + voice + speed + depth
+audio_cache = _build_audio_cache("AUDIO_CACHE_DIR", DEFAULT_AUDIO_CACHE_DIR, "AUDIO_CACHE_MAX_BYTES", 500 * 1024 * 1024)
+# Raw edge-tts output, keyed by text + voice, so a speed/depth change only re-runs the effects
+synthesis_cache = _build_audio_cache(
+    "SYNTHESIS_CACHE_DIR", DEFAULT_SYNTHESIS_CACHE_DIR, "SYNTHESIS_CACHE_MAX_BYTES", 300 * 1024 * 1024
+)
+
+
+def read_script(script_file):
     """
-    Generate TTS audio from a script file using edge-tts.
-    Includes enhancements like speed adjustment, bass depth, fade, normalization,
-    dynamic compression, silence cleanup, and start padding to preserve first syllables.
+    Read a script file and tidy it for synthesis
 
     Args:
         script_file (str): Path to the input text script file
-        output_audio (str): Path to the final MP3 output
-        voice_id (str): Edge-TTS voice ID
-        speed (float): Speed factor for the voice (1.0 = normal)
-        depth (int): Depth effect level (1 = none, 2+ = more bass and filtering)
 
     Returns:
-        str: Final path to generated audio file
+        str: Script text
     """
-    print(f"Generating voice with {voice_id}, speed={speed}, depth={depth}")
-    print(f"Output will be saved to: {output_audio}")
-
-    # Read the content
     with open(script_file, 'r', encoding='utf-8') as f:
-        content = f.read().strip()
+        return prepare_script(f.read())
+
+
+def prepare_script(text):
+    """
+    Tidy script text for synthesis
+
+    Args:
+        text (str): Raw script text
+
+    Returns:
+        str: Script text
+    """
+    content = text.strip()
 
     # Fix bad sentence endings (e.g., "selon")
     for bad_end in ['selon', 'according to', 'according']:
         if content.lower().endswith(bad_end):
             content = content.rsplit(' ', 1)[0] + '.'
+    return content
 
-    # Setup temp directories
-    temp_dir = os.path.join(tempfile.gettempdir(), "tts_generator")
-    os.makedirs(temp_dir, exist_ok=True)
-    os.makedirs(os.path.dirname(output_audio), exist_ok=True)
 
+def is_passthrough(speed=1.0, depth=1, quality="enhanced"):
+    """
+    Whether a render can skip the effects chain and pass the synthesis through
+
+    Args:
+        speed (float): Speed factor for the voice
+        depth (int): Depth effect level
+        quality (str): "enhanced" or "raw"
+
+    Returns:
+        bool: True for raw quality with no speed or depth change
+    """
+    return quality == "raw" and float(speed) == 1.0 and int(depth) <= 1
+
+
+def render_cache_key(content, voice_id, speed=1.0, depth=1, quality="enhanced"):
+    """
+    Audio cache key of a finished render
+
+    Engines other than pydub produce slightly different audio, so they get their own entries.
+
+    Args:
+        content (str): Script text
+        voice_id (str): Edge-TTS voice ID
+        speed (float): Speed factor for the voice
+        depth (int): Depth effect level
+        quality (str): "enhanced" or "raw"
+
+    Returns:
+        str: Key for audio_cache
+    """
+    if is_passthrough(speed, depth, quality):
+        output_format = "mp3-passthrough"
+    elif AUDIO_ENGINE == "pydub":
+        output_format = OUTPUT_FORMAT
+    else:
+        output_format = f"{OUTPUT_FORMAT}+{AUDIO_ENGINE}"
+    return audio_cache_key(content, voice_id, speed, depth, output_format)
+
+
+def cached_tts(text, output_audio, voice_id, speed=1.0, depth=1, cache_info=None, quality="enhanced"):
+    """
+    Serve a previously rendered script from the audio cache without synthesizing
+
+    Args:
+        text (str): Script text
+        output_audio (str): Path to the final MP3 output
+        voice_id (str): Edge-TTS voice ID
+        speed (float): Speed factor for the voice
+        depth (int): Depth effect level
+        cache_info (dict): Optional; "output" is set to whether the render was cached
+        quality (str): "enhanced" or "raw"
+
+    Returns:
+        str: output_audio on a cache hit, None otherwise
+    """
+    if audio_cache is None:
+        return None
+    key = render_cache_key(prepare_script(text), voice_id, speed, depth, quality)
+    result = audio_cache.copy_to(key, output_audio)
+    if cache_info is not None:
+        cache_info["output"] = result is not None
+    return result
+
+
+def _split_long_sentence(sentence, max_chars):
+    """Break a sentence longer than max_chars at commas, then at spaces"""
+    pieces = []
+    while len(sentence) > max_chars:
+        window = sentence[:max_chars]
+        cut = max(window.rfind(", "), window.rfind("; "))
+        cut = cut + 1 if cut > max_chars // 2 else window.rfind(" ")
+        if cut <= 0:
+            cut = max_chars
+        pieces.append(sentence[:cut].strip())
+        sentence = sentence[cut:].strip()
+    if sentence:
+        pieces.append(sentence)
+    return pieces
+
+
+def split_into_chunks(text, max_chars=TTS_CHUNK_CHARS):
+    """
+    Split a script into chunks of whole sentences, each at most max_chars long
+
+    Args:
+        text (str): Script text
+        max_chars (int): Chunk size limit; sentences longer than this are split at commas or spaces
+
+    Returns:
+        list: Chunk strings in reading order
+    """
+    sentences = []
+    start = 0
+    for match in SENTENCE_BOUNDARY.finditer(text):
+        sentences.append(text[start:match.end()].strip())
+        start = match.end()
+    sentences.append(text[start:].strip())
+
+    chunks = []
+    current = ""
+    for sentence in sentences:
+        for piece in _split_long_sentence(sentence, max_chars) if sentence else []:
+            if current and len(current) + 1 + len(piece) > max_chars:
+                chunks.append(current)
+                current = piece
+            else:
+                current = f"{current} {piece}" if current else piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _trim_edges(segment):
+    """Drop leading and trailing silence so stitched chunks get uniform gaps"""
+    start = detect_leading_silence(segment, silence_threshold=CHUNK_SILENCE_THRESH)
+    end = len(segment) - detect_leading_silence(segment.reverse(), silence_threshold=CHUNK_SILENCE_THRESH)
+    return segment[start:end] if end > start else segment
+
+
+async def _synthesize_bytes(communicate):
+    """Collect the MP3 data of one edge-tts call in memory"""
+    audio = bytearray()
+    async for chunk in communicate.stream():
+        if chunk["type"] == "audio":
+            audio.extend(chunk["data"])
+    if not audio:
+        raise Exception("edge-tts returned no audio")
+    return bytes(audio)
+
+
+async def _synthesize_chunk(communicate_cls, text, voice_id, semaphore):
+    async with semaphore:
+        return await _synthesize_bytes(communicate_cls(text, voice_id))
+
+
+def _stitch(parts):
+    """Join chunk MP3s with their edge silence trimmed and CHUNK_GAP_MS between them"""
+    gap = AudioSegment.silent(duration=CHUNK_GAP_MS)
+    stitched = None
+    for part in parts:
+        segment = _trim_edges(decode(part))
+        stitched = segment if stitched is None else stitched + gap + segment
+    return encode_mp3(stitched, bitrate="96k")
+
+
+def _plan_chunks(content, max_chars):
+    return split_into_chunks(content, max_chars) if max_chars > 0 and len(content) > max_chars else [content]
+
+
+def synthesis_mode(content, max_chars=None):
+    """
+    How synthesize_audio calls edge-tts for a script, for its synthesis cache key
+
+    Args:
+        content (str): Script text
+        max_chars (int): Chunk size limit (defaults to TTS_CHUNK_CHARS)
+
+    Returns:
+        str: "single" for one call, or "chunked:<max_chars>" for stitched chunks
+    """
+    max_chars = TTS_CHUNK_CHARS if max_chars is None else max_chars
+    return "single" if len(_plan_chunks(content, max_chars)) == 1 else f"chunked:{max_chars}"
+
+
+async def synthesize_audio(content, voice_id, communicate_cls=None, max_chars=None, concurrency=None):
+    """
+    Synthesize a script with edge-tts into memory, chunking long scripts
+
+    Scripts longer than max_chars are split at sentence boundaries, the chunks
+    are synthesized concurrently (at most `concurrency` at a time), then
+    stitched in order with their edge silence trimmed and a fixed
+    CHUNK_GAP_MS pause between them. Nothing is written to disk.
+
+    Args:
+        content (str): Script text
+        voice_id (str): Edge-TTS voice ID
+        communicate_cls (type): edge_tts.Communicate or a compatible class
+        max_chars (int): Chunk size limit (defaults to TTS_CHUNK_CHARS; 0 disables chunking)
+        concurrency (int): Simultaneous synthesis calls (defaults to TTS_CHUNK_CONCURRENCY)
+
+    Returns:
+        bytes: Raw MP3 data
+    """
+    if communicate_cls is None:
+        from edge_tts import Communicate as communicate_cls
+    max_chars = TTS_CHUNK_CHARS if max_chars is None else max_chars
+    concurrency = max(1, TTS_CHUNK_CONCURRENCY if concurrency is None else concurrency)
+
+    chunks = _plan_chunks(content, max_chars)
+    if len(chunks) == 1:
+        return await _synthesize_bytes(communicate_cls(content, voice_id))
+
+    print(f"Synthesizing {len(chunks)} chunks, {concurrency} at a time")
+    semaphore = asyncio.Semaphore(concurrency)
+    tasks = [
+        asyncio.ensure_future(_synthesize_chunk(communicate_cls, chunk, voice_id, semaphore))
+        for chunk in chunks
+    ]
     try:
-        from edge_tts import Communicate
-        base_audio_path = os.path.join(temp_dir, f"base_{int(time.time())}.mp3")
+        parts = await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+    # Decoding and re-encoding block, so they run off the event loop
+    return await asyncio.to_thread(_stitch, parts)
+
+
+def _edge_rate(speed):
+    """edge-tts rate string ("+20%") for a speed factor"""
+    return f"{round((speed - 1) * 100):+d}%"
+
+
+def _submit_on_own_loop(coroutine):
+    """Default stream_tts submit: a BackgroundLoop for this one coroutine, stopped once it ends"""
+    runner = BackgroundLoop(name="tts-stream")
+    future = runner.submit(coroutine)
+    future.add_done_callback(lambda _: runner.loop.call_soon_threadsafe(runner.loop.stop))
+    return future
+
+
+def stream_tts(content, voice_id, speed=1.0, communicate_cls=None, on_complete=None, on_finish=None,
+               submit=None, chunk_timeout=STREAM_CHUNK_TIMEOUT):
+    """
+    Start synthesizing and return an iterator over the MP3 bytes as edge-tts produces them
+
+    Synthesis is scheduled on an event loop right away through Communicate.stream(),
+    so the first chunk reaches the caller after roughly one round trip instead of a
+    full render. Speed is applied by edge-tts itself; the pydub effects (depth,
+    normalization) are not, so the stream is a preview of the final render. If
+    edge-tts sends nothing for chunk_timeout seconds, or the consumer closes the
+    iterator early (a client disconnect), the synthesis is cancelled. At normal
+    speed the complete audio is stored in the synthesis cache under the "single"
+    mode, so only renders that make the same single call reuse it.
+
+    Args:
+        content (str): Script text (see prepare_script)
+        voice_id (str): Edge-TTS voice ID
+        speed (float): Speed factor for the voice
+        communicate_cls (type): edge_tts.Communicate or a compatible class
+        on_complete (callable): Called with no arguments once synthesis succeeded
+        on_finish (callable): Called once with no arguments when the stream is done with its
+                              synthesis, whatever the outcome (e.g. to release a stream slot)
+        submit (callable): Schedules a coroutine and returns a concurrent.futures.Future,
+                           e.g. BackgroundLoop.submit (default: a loop of its own)
+        chunk_timeout (float): Seconds to wait for the next chunk before giving up with TimeoutError
+
+    Returns:
+        iterator: MP3 data (bytes); raises the synthesis error, or TimeoutError if edge-tts stalls
+    """
+    if communicate_cls is None:
+        from edge_tts import Communicate as communicate_cls
+    submit = submit or _submit_on_own_loop
+    chunks = queue.Queue()
+    done = object()
+    finished = threading.Event()
+    finish_lock = threading.Lock()
+
+    def finish():
+        with finish_lock:
+            if finished.is_set():
+                return
+            finished.set()
+        if on_finish is not None:
+            on_finish()
+
+    async def produce():
+        communicate = communicate_cls(content, voice_id, rate=_edge_rate(speed))
+        stream = communicate.stream()
+        audio = bytearray()
+        while True:
+            try:
+                chunk = await asyncio.wait_for(stream.__anext__(), chunk_timeout)
+            except StopAsyncIteration:
+                break
+            except asyncio.TimeoutError:
+                raise TimeoutError(f"edge-tts sent no audio for {chunk_timeout} s") from None
+            if chunk["type"] == "audio":
+                audio.extend(chunk["data"])
+                chunks.put(chunk["data"])
+        if not audio:
+            raise Exception("edge-tts returned no audio")
+        # One unchunked call: only renders that would make the same single call may reuse it
+        if speed == 1.0 and synthesis_cache is not None:
+            key = synthesis_cache_key(content, voice_id, "single")
+            await asyncio.to_thread(synthesis_cache.put_bytes, key, bytes(audio))
+
+    def settled(future):
+        try:
+            if future.cancelled():
+                return
+            error = future.exception()
+            if error is not None:
+                print(f"❌ TTS streaming error: {error}")
+                chunks.put(error)
+                return
+            chunks.put(done)
+            if on_complete is not None:
+                on_complete()
+        finally:
+            finish()
+
+    future = submit(produce())
+    future.add_done_callback(settled)
+
+    def drain():
+        try:
+            while True:
+                try:
+                    item = chunks.get(timeout=chunk_timeout)
+                except queue.Empty:
+                    raise TimeoutError(f"edge-tts sent no audio for {chunk_timeout} s") from None
+                if item is done:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            # Stalled, failed or abandoned by the client: stop the synthesis and free the slot now
+            future.cancel()
+            finish()
+
+    return drain()
 
-        # Generate raw audio
-        communicate = Communicate(content, voice_id)
-        await communicate.save(base_audio_path)
 
-        if not os.path.exists(base_audio_path) or os.path.getsize(base_audio_path) == 0:
-            raise Exception("Base audio file generation failed")
+async def render_to_cache(content, voice_id, speed=1.0, depth=1, quality="enhanced"):
+    """
+    Render a script through the full pipeline so it lands in the audio cache
+
+    Args:
+        content (str): Script text
+        voice_id (str): Edge-TTS voice ID
+        speed (float): Speed factor for the voice
+        depth (int): Depth effect level
+        quality (str): "enhanced" or "raw"
+    """
+    os.makedirs(TTS_TEMP_DIR, exist_ok=True)
+    output_path = os.path.join(TTS_TEMP_DIR, f"render_{uuid.uuid4().hex}.mp3")
+    try:
+        await generate_tts_from_text(content, output_path, voice_id, speed, depth, quality=quality)
+    finally:
+        try:
+            os.remove(output_path)  # the cache keeps its own link to the render
+        except OSError:
+            pass
+
 
-        print(f"Base audio created: {base_audio_path} ({os.path.getsize(base_audio_path)} bytes)")
-        audio = AudioSegment.from_file(base_audio_path)
+async def _report_stage(on_stage, stage):
+    if on_stage is not None:
+        await on_stage(stage)
 
-        # Apply speed manually
-        if speed != 1.0:
-            print(f"Applying playback speed: {speed}")
-            audio = speedup(audio, playback_speed=speed)
 
-        # Apply depth effects
-        if depth > 1:
-            cutoff = 18000 - (depth * 3000)
-            print(f"Applying low-pass filter at {cutoff}Hz")
-            audio = low_pass_filter(audio, cutoff)
+async def generate_tts_from_text(text, output_audio, voice_id, speed=1.0, depth=1, cache_info=None,
+                                 quality="enhanced", on_stage=None):
+    """
+    Generate TTS audio from script text using edge-tts.
+    Includes enhancements like speed adjustment, bass depth, fade, normalization,
+    dynamic compression, silence cleanup, and start padding to preserve first syllables.
+    The raw synthesis stays in memory until the final encode, so a render writes
+    only output_audio (plus the synthesis cache entry on a synthesis miss).
+    With quality="raw" at normal speed and depth 1, the effects are skipped: the
+    edge silence is trimmed frame by frame, which takes milliseconds.
+    Disk and CPU-bound steps run in worker threads (asyncio.to_thread), so many
+    renders can share one event loop.
+    Finished renders are stored in the content-addressed audio cache, so the same
+    script, voice and settings are only synthesized once; the raw edge-tts output
+    is cached by text and voice, so changing only speed or depth skips synthesis.
+
+    Args:
+        text (str): Script text
+        output_audio (str): Path to the final MP3 output
+        voice_id (str): Edge-TTS voice ID
+        speed (float): Speed factor for the voice (1.0 = normal)
+        depth (int): Depth effect level (1 = none, 2+ = more bass and filtering)
+        cache_info (dict): Optional; filled with per-stage cache hits ("output", "synthesis")
+        quality (str): "enhanced" or "raw"
+        on_stage (callable): Optional coroutine function, awaited with each stage as it starts:
+                             "synthesizing", "post-processing", "exporting"
 
-            bass_boost = (depth - 1) * 3
-            if bass_boost > 0:
-                print(f"Boosting bass +{bass_boost}dB")
-                bass = audio.low_pass_filter(300) + bass_boost
-                audio = audio.overlay(bass)
+    Returns:
+        str: Final path to generated audio file; synthesis and post-processing errors are
+        re-raised, and the incomplete output_audio is removed
+    """
+    await _report_stage(on_stage, "synthesizing")
+    print(f"Generating voice with {voice_id}, speed={speed}, depth={depth}, quality={quality}")
+    print(f"Output will be saved to: {output_audio}")
 
-            fade = min(200, len(audio) // 20)
-            audio = audio.fade_in(fade).fade_out(fade)
+    content = prepare_script(text)
 
-        # Enhance audio quality
-        print("Normalizing volume")
-        audio = normalize(audio)
+    if cache_info is None:
+        cache_info = {}
+    cache_key = render_cache_key(content, voice_id, speed, depth, quality)
+    cache_info["output"] = (
+        audio_cache is not None and await asyncio.to_thread(audio_cache.copy_to, cache_key, output_audio) is not None
+    )
+    if cache_info["output"]:
+        print(f"✅ Served from audio cache: {output_audio}")
+        return output_audio
 
-        print("Applying dynamic range compression")
-        audio = compress_dynamic_range(audio)
+    os.makedirs(os.path.dirname(output_audio), exist_ok=True)
 
-        print("Trimming silence")
-        audio = audio.strip_silence(silence_len=200, silence_thresh=-40)
+    try:
+        from edge_tts import Communicate
 
-        # Add 300ms padding at start
-        print("Adding 300ms silence at the beginning")
-        padding_start = AudioSegment.silent(duration=300)
-        audio = padding_start + audio
+        synthesis_key = synthesis_cache_key(content, voice_id, synthesis_mode(content))
+        base_audio = (
+            await asyncio.to_thread(synthesis_cache.get_bytes, synthesis_key) if synthesis_cache is not None else None
+        )
+        cache_info["synthesis"] = base_audio is not None
+        if cache_info["synthesis"]:
+            print(f"Base audio served from synthesis cache ({len(base_audio)} bytes)")
+        else:
+            # Generate raw audio (long scripts are synthesized in concurrent chunks)
+            base_audio = await synthesize_audio(content, voice_id, communicate_cls=Communicate)
+            print(f"Base audio synthesized ({len(base_audio)} bytes)")
+            if synthesis_cache is not None:
+                await asyncio.to_thread(synthesis_cache.put_bytes, synthesis_key, base_audio)
 
-        # Export final file
-        print(f"Exporting final audio to: {output_audio}")
-        audio.export(output_audio, format="mp3", bitrate="192k")
+        await _report_stage(on_stage, "post-processing")
+        if is_passthrough(speed, depth, quality):
+            await asyncio.to_thread(process_passthrough, base_audio, output_audio)
+        else:
+            await asyncio.to_thread(postprocess, base_audio, output_audio, speed, depth, engine=AUDIO_ENGINE)
 
+        await _report_stage(on_stage, "exporting")
         if not os.path.exists(output_audio) or os.path.getsize(output_audio) == 0:
             raise Exception("Final audio file is empty")
 
         print(f"✅ Final audio created: {output_audio} ({os.path.getsize(output_audio)} bytes)")
 
-        # Clean up
-        try:
-            os.remove(base_audio_path)
-            print(f"Temp file removed: {base_audio_path}")
-        except Exception as e:
-            print(f"Warning: Temp cleanup failed: {e}")
+        if audio_cache is not None:
+            await asyncio.to_thread(audio_cache.put, cache_key, output_audio)
 
         return output_audio
 
-    except ImportError:
-        print("Installing edge-tts...")
-        subprocess.call(["pip", "install", "edge-tts"])
-        return await generate_simple_tts(script_file, output_audio, voice_id, speed, depth)
-
     except Exception as e:
         print(f"❌ TTS generation error: {e}")
+        # No silent stand-in: the error must reach the job record, which then reports "failed"
         try:
-            print(f"Creating fallback silent audio: {output_audio}")
-            AudioSegment.silent(duration=3000).export(output_audio, format="mp3")
-            return output_audio
-        except Exception as fallback_error:
-            print(f"Fallback audio failed: {fallback_error}")
-            raise e
+            os.remove(output_audio)
+        except OSError:
+            pass
+        raise
+
+
+async def generate_simple_tts(script_file, output_audio, voice_id, speed=1.0, depth=1, cache_info=None,
+                              quality="enhanced"):
+    """
+    Generate TTS audio from a script file (see generate_tts_from_text)
+
+    Args:
+        script_file (str): Path to the input text script file
+        output_audio (str): Path to the final MP3 output
+        voice_id (str): Edge-TTS voice ID
+        speed (float): Speed factor for the voice (1.0 = normal)
+        depth (int): Depth effect level (1 = none, 2+ = more bass and filtering)
+        cache_info (dict): Optional; filled with per-stage cache hits ("output", "synthesis")
+        quality (str): "enhanced" or "raw"
+
+    Returns:
+        str: Final path to generated audio file
+    """
+    return await generate_tts_from_text(read_script(script_file), output_audio, voice_id, speed, depth, cache_info,
+                                        quality)
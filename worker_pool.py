@@ -0,0 +1,145 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+
+
+class WorkerPool:
+    """
+    Fixed number of worker threads fed by a bounded FIFO queue of async jobs.
+
+    Each worker takes one queued coroutine at a time and runs it either on a
+    shared BackgroundLoop or, without one, on an event loop the worker owns
+    for its lifetime. Either way at most `workers` jobs synthesize or
+    post-process at once however many requests arrive. Once `max_queue`
+    jobs are waiting, submit() refuses new ones so the caller can push back
+    (HTTP 503) instead of piling up work. The average job duration drives
+    the queue position and wait estimates.
+    """
+
+    def __init__(self, workers=2, max_queue=20, initial_estimate=20.0, name="worker", loop=None):
+        """
+        Args:
+            workers (int): Number of worker threads (jobs running at once)
+            max_queue (int): Jobs allowed to wait for a worker
+            initial_estimate (float): Assumed job duration in seconds until jobs have completed
+            name (str): Thread name prefix
+            loop (BackgroundLoop): Shared loop to run the jobs on (default: one loop per worker)
+        """
+        self.loop = loop
+        self.workers = max(1, workers)
+        self.max_queue = max(0, max_queue)
+        self._average = float(initial_estimate)
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        self._waiting = OrderedDict()  # job_id -> coroutine factory, oldest first
+        self._running = {}             # job_id -> start time
+        self._counters = {
+            "accepted": 0,
+            "rejected": 0,
+            "completed": 0,
+            "failed": 0,
+        }
+        for i in range(self.workers):
+            threading.Thread(target=self._work, name=f"{name}-{i}", daemon=True).start()
+
+    def submit(self, job_id, coroutine_factory):
+        """
+        Queue a job
+
+        Args:
+            job_id (str): Unique job identifier
+            coroutine_factory (callable): Returns the coroutine to run; only called once a worker picks the job
+
+        Returns:
+            bool: True if queued, False if the queue is full
+        """
+        with self._lock:
+            if len(self._waiting) >= self.max_queue:
+                self._counters["rejected"] += 1
+                return False
+            self._waiting[job_id] = coroutine_factory
+            self._counters["accepted"] += 1
+            self._available.notify()
+        return True
+
+    def _work(self):
+        if self.loop is not None:
+            run = self.loop.run
+        else:
+            run = asyncio.new_event_loop().run_until_complete
+        while True:
+            with self._lock:
+                while not self._waiting:
+                    self._available.wait()
+                job_id, coroutine_factory = self._waiting.popitem(last=False)
+                self._running[job_id] = time.time()
+
+            outcome = "completed"
+            try:
+                run(coroutine_factory())
+            except Exception as e:
+                print(f"Worker job {job_id} failed: {e}")
+                outcome = "failed"
+
+            with self._lock:
+                duration = time.time() - self._running.pop(job_id)
+                self._counters[outcome] += 1
+                # Moving average, so the estimates follow the current mix of jobs
+                self._average = 0.8 * self._average + 0.2 * duration
+
+    def _wait_for(self, position):
+        """Seconds until the job at 1-based queue `position` starts (lock held)"""
+        now = time.time()
+        remaining = sum(max(self._average - (now - started), 0.0) for started in self._running.values())
+        if len(self._running) < self.workers:
+            remaining = 0.0  # a worker is idle or about to be
+        return ((position - 1) * self._average + remaining) / self.workers
+
+    def status(self, job_id):
+        """
+        Where a job stands in the pool
+
+        Args:
+            job_id (str): Job identifier
+
+        Returns:
+            dict: queue_position (1 = next, 0 = running) and estimated_wait / estimated_remaining in seconds,
+                  or None if the job is neither queued nor running
+        """
+        with self._lock:
+            if job_id in self._running:
+                elapsed = time.time() - self._running[job_id]
+                return {"queue_position": 0, "estimated_remaining": round(max(self._average - elapsed, 0.0), 1)}
+            for position, waiting_id in enumerate(self._waiting, start=1):
+                if waiting_id == job_id:
+                    wait = self._wait_for(position)
+                    return {
+                        "queue_position": position,
+                        "estimated_wait": round(wait, 1),
+                        "estimated_remaining": round(wait + self._average, 1),
+                    }
+        return None
+
+    def retry_after(self):
+        """Seconds until the queue is likely to have room again (for a Retry-After header)"""
+        with self._lock:
+            return max(1, int(round(self._wait_for(1) + self._average / self.workers)))
+
+    def stats(self):
+        """
+        Snapshot of the pool's queue depth and counters
+
+        Returns:
+            dict: workers, max_queue, queued, running, average_seconds, accepted, rejected, completed, failed
+        """
+        with self._lock:
+            stats = dict(self._counters)
+            stats.update({
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "queued": len(self._waiting),
+                "running": len(self._running),
+                "average_seconds": round(self._average, 2),
+            })
+        return stats